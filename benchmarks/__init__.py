@@ -0,0 +1,84 @@
+"""
+Benchmarks for the friendship API.
+
+Every benchmark creates a throwaway test database from the configured DATABASES
+(the same way ``./manage.py test`` does), loads synthetic data into it and drops it at the end,
+so it never touches real data. Run them from the project root, e.g.
+
+    docker-compose run --rm web python -m benchmarks.find_friends_union
+"""
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "networking.config")
+    os.environ.setdefault("DJANGO_CONFIGURATION", "Local")
+
+    import configurations
+
+    configurations.setup()
+
+
+@contextmanager
+def test_database():
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def load_edges(edges, chunk_size=10000):
+    """
+    writes (UID, UID) pairs with FriendshipManager.bulk_add_friendships in chunks,
+    returns number of created friendships
+    """
+    from django.db import connection
+
+    from friendship.models import Friendship
+
+    created = 0
+    chunk = []
+    for edge in edges:
+        chunk.append(edge)
+        if len(chunk) == chunk_size:
+            created += len(Friendship.objects.bulk_add_friendships(chunk))
+            chunk = []
+    if chunk:
+        created += len(Friendship.objects.bulk_add_friendships(chunk))
+
+    # fresh statistics, so planner sees the real table size
+    with connection.cursor() as cursor:
+        cursor.execute(f"VACUUM ANALYZE {Friendship._meta.db_table}")
+    return created
+
+
+def measure(func, repeat=50, warmup=5):
+    """
+    calls func repeat times (after warmup calls), returns list of durations in milliseconds
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{name:<40} median {statistics.median(timings):9.3f} ms"
+        f"   p95 {p95:9.3f} ms   min {timings[0]:9.3f} ms"
+    )
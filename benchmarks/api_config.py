@@ -0,0 +1,123 @@
+"""
+Production vs Api configuration (networking/config/api.py): startup time of a process
+(Django setup, URLconf and WSGI application until the first response) and latency of GET friends list
+through the whole WSGI stack (middleware, URL resolving, view, rendering), friends lists are cached
+
+    python -m benchmarks.api_config [--requests 5000] [--configurations Production Api]
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks import load_edges, report, setup, test_database
+from benchmarks.graphs import power_law_edges
+from benchmarks.http_load import database_url
+
+
+def serve(users, requests):
+    """
+    runs in child process with configuration from environment, prints measurements as JSON
+    """
+    start = time.perf_counter()
+    import configurations
+
+    configurations.setup()
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+
+    def get(path):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+        }
+        statuses = []
+        response = application(environ, lambda status, headers: statuses.append(status))
+        b"".join(response)
+        response.close()
+        if not statuses[0].startswith("200"):
+            raise RuntimeError(f"GET {path} returned {statuses[0]}")
+
+    get("/api/friendship/1")
+    startup = (time.perf_counter() - start) * 1000
+
+    # friends lists are cached, so database doesn't dominate
+    for UID in range(1, users + 1):
+        get(f"/api/friendship/{UID}")
+    timings = []
+    for i in range(requests):
+        path = f"/api/friendship/{i % users + 1}"
+        request_start = time.perf_counter()
+        get(path)
+        timings.append((time.perf_counter() - request_start) * 1000)
+
+    print(json.dumps({"startup": startup, "timings": timings}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--edges-per-node", type=int, default=5)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--starts", type=int, default=5)
+    parser.add_argument("--configurations", nargs="+", default=["Production", "Api"])
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.users, args.requests)
+        return
+
+    setup()
+
+    with test_database() as connection:
+        load_edges(power_law_edges(args.nodes, args.edges_per_node))
+
+        for configuration in args.configurations:
+            env = {
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": "networking.config",
+                "DJANGO_CONFIGURATION": configuration,
+                "DATABASE_URL": database_url(connection.settings_dict),
+            }
+            startups = []
+            timings = []
+            for _ in range(args.starts):
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "benchmarks.api_config",
+                        "--serve",
+                        "--users",
+                        str(args.users),
+                        "--requests",
+                        str(args.requests // args.starts),
+                    ],
+                    env=env,
+                    check=True,
+                    capture_output=True,
+                ).stdout
+                result = json.loads(output.splitlines()[-1])
+                startups.append(result["startup"])
+                timings.extend(result["timings"])
+
+            report(f"{configuration} startup", startups)
+            report(f"{configuration} GET /api/friendship/<uid>", timings)
+
+
+if __name__ == "__main__":
+    main()
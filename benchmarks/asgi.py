@@ -0,0 +1,93 @@
+"""
+load test of friendship API served by gunicorn sync workers (networking.wsgi)
+vs gunicorn with uvicorn workers and async views (networking.asgi),
+many concurrent keep-alive connections find friends of random users and create friendships
+
+    python -m benchmarks.asgi [--connections 1000] [--workers 2] [--duration 20]
+"""
+
+import argparse
+import json
+from functools import partial
+
+from benchmarks import load_edges, setup, test_database
+from benchmarks.graphs import power_law_edges
+from benchmarks.http_load import database_url, gunicorn, run_load
+
+
+def friendship_request(nodes, writes, rng):
+    """
+    returns GET of friends of random user or (with probability writes) POST of random friendship
+    """
+    if rng.random() < writes:
+        body = json.dumps(
+            {
+                "first_friend": rng.randint(1, nodes),
+                "second_friend": rng.randint(nodes + 1, nodes * 2),
+            }
+        ).encode()
+        return (
+            b"POST /api/friendship HTTP/1.1\r\nHost: localhost\r\n"
+            b"Content-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+            % (len(body), body)
+        )
+    return b"GET /api/friendship/%d HTTP/1.1\r\nHost: localhost\r\n\r\n" % rng.randint(
+        1, nodes
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--edges-per-node", type=int, default=5)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--db-threads", type=int, default=10)
+    parser.add_argument("--writes", type=float, default=0.1)
+    parser.add_argument("--duration", type=float, default=20)
+    args = parser.parse_args()
+
+    setup()
+
+    from friendship.models import Friendship
+
+    deployments = [
+        ("sync workers (wsgi)", "networking.wsgi:application", []),
+        (
+            "uvicorn workers (asgi)",
+            "networking.asgi:application",
+            ["-c", "python:networking.gunicorn_asgi"],
+        ),
+    ]
+    requests = partial(friendship_request, args.nodes, args.writes)
+
+    with test_database() as connection:
+        load_edges(power_law_edges(args.nodes, args.edges_per_node))
+        print(
+            f"{Friendship.objects.count()} friendships, {args.connections} connections, "
+            f"{args.workers} workers, {args.writes:.0%} writes"
+        )
+        env = {
+            "DATABASE_URL": database_url(connection.settings_dict),
+            "FRIENDSHIP_ASYNC_DB_THREADS": str(args.db_threads),
+        }
+        # connections of benchmark process aren't needed by servers
+        connection.close()
+
+        for name, app, options in deployments:
+            options = options + [
+                "--workers",
+                str(args.workers),
+                "--access-logfile",
+                "/dev/null",
+            ]
+            with gunicorn(app, options, env) as port:
+                result = run_load(port, requests, args.connections, args.duration)
+            print(
+                f"{name:<24} {result['rps']:8.0f} requests/s   p50 {result['p50']:8.1f} ms"
+                f"   p99 {result['p99']:8.1f} ms   errors {result['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
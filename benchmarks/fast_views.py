@@ -0,0 +1,85 @@
+"""
+fast views (friendship/fast_views.py) vs DRF views: time of one request without database work,
+manager methods are mocked, so only request parsing, validation and rendering are measured
+
+    python -m benchmarks.fast_views [--repeat 2000]
+"""
+
+import argparse
+import json
+from unittest import mock
+
+from benchmarks import measure, report, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.test import APIRequestFactory
+
+    from friendship import fast_views
+    from friendship.models import Friendship
+    from friendship.views import (
+        FindFriendsView,
+        FriendshipCreateView,
+        FriendshipDeleteView,
+    )
+
+    factory = APIRequestFactory()
+    body = json.dumps({"first_friend": 2, "second_friend": 1})
+    endpoints = [
+        (
+            "find friends",
+            FindFriendsView.as_view(),
+            fast_views.find_friends,
+            factory.get("/api/friendship/1"),
+            {"uid": 1},
+        ),
+        (
+            "add friendship",
+            FriendshipCreateView.as_view(),
+            fast_views.create_friendship,
+            factory.post("/api/friendship", body, content_type="application/json"),
+            {},
+        ),
+        (
+            "remove friendship",
+            FriendshipDeleteView.as_view(),
+            fast_views.delete_friendship,
+            factory.delete("/api/friendship/1/2"),
+            {"uid1": 1, "uid2": 2},
+        ),
+    ]
+
+    def request(view, request, **kwargs):
+        response = view(request, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+
+    with mock.patch.multiple(
+        Friendship.objects,
+        get_friends_list=mock.Mock(return_value=list(range(2, 100))),
+        add_friendship=mock.Mock(return_value=True),
+        bulk_remove_friendships=mock.Mock(return_value={(1, 2)}),
+        # DRF view loads friendship model before it's deleted
+        get=mock.Mock(return_value=Friendship(first_friend=1, second_friend=2)),
+    ), mock.patch.object(Friendship, "delete", new=mock.Mock(return_value=(1, {}))):
+        for name, drf_view, fast_view, http_request, kwargs in endpoints:
+            # body is cached, so the same request can be read many times
+            http_request.body
+            for label, view in (("DRF view", drf_view), ("fast view", fast_view)):
+                report(
+                    f"{name}: {label}",
+                    measure(
+                        lambda: request(view, http_request, **kwargs),
+                        repeat=args.repeat,
+                        warmup=50,
+                    ),
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+UNION vs UNION ALL in FriendshipManager.find_friends
+
+both branches of find_friends are disjoint ("Ordered Friendship" constraint),
+so UNION only adds sorting / hashing of the whole result to remove duplicates which don't exist
+
+    python -m benchmarks.find_friends_union [--degrees 100 10000 200000]
+"""
+
+import argparse
+
+from benchmarks import load_edges, measure, report, setup, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--degrees", type=int, nargs="+", default=[100, 10000, 200000])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    setup()
+    from friendship.models import Friendship
+
+    def find_friends_union(UID):
+        first = Friendship.objects.values_list("second_friend", flat=True).filter(
+            first_friend=UID
+        )
+        second = Friendship.objects.values_list("first_friend", flat=True).filter(
+            second_friend=UID
+        )
+        return first.union(second)
+
+    with test_database():
+        offset = 1
+        for degree in args.degrees:
+            # user in the middle of the UID range, half of friends in every column
+            UID = offset + degree // 2
+            load_edges(
+                (UID, friend)
+                for friend in range(offset, offset + degree + 1)
+                if friend != UID
+            )
+            offset += degree + 1
+
+            print(f"user with {degree} friends")
+            report(
+                "UNION",
+                measure(lambda: list(find_friends_union(UID)), repeat=args.repeat),
+            )
+            report(
+                "UNION ALL",
+                measure(
+                    lambda: list(Friendship.objects.find_friends(UID)),
+                    repeat=args.repeat,
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main()
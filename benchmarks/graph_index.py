@@ -0,0 +1,65 @@
+"""
+in-memory adjacency index (friendship/graph.py): build time and memory per friendship,
+then latency of multi-hop reads from database vs from the index, on a synthetic power-law graph
+
+    python -m benchmarks.graph_index [--nodes 200000] [--edges-per-node 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from benchmarks import load_edges, measure, report, setup, test_database
+from benchmarks.graphs import power_law_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--edges-per-node", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import override_settings
+
+    from friendship.graph import graph_index
+    from friendship.models import Friendship
+
+    generator = random.Random(0)
+    users = [generator.randint(1, args.nodes) for _ in range(args.repeat)]
+
+    with test_database():
+        load_edges(power_law_edges(args.nodes, args.edges_per_node))
+
+        start = time.monotonic()
+        index = Friendship.objects.build_graph_index()
+        elapsed = time.monotonic() - start
+        stats = index.stats()
+        allocated = sum(
+            sys.getsizeof(values)
+            for values in (index.nodes, index.offsets, index.neighbours)
+        )
+        print(
+            f"{stats['users']} users, {stats['friendships']} friendships, built in {elapsed:.1f} s\n"
+            f"arrays {stats['bytes'] / 2 ** 20:.1f} MiB ({stats['bytes_per_friendship']} B per friendship), "
+            f"allocated {allocated / 2 ** 20:.1f} MiB"
+        )
+        del index
+
+        def reads():
+            for UID in users:
+                Friendship.objects.suggest_friends(UID, 10, 1000)
+                Friendship.objects.find_mutual_friends(UID, UID + 1, 0, 100)
+            Friendship.objects.find_path(users[0], users[-1], 6, 100000, 60)
+
+        report("database", measure(reads, repeat=5, warmup=1))
+        with override_settings(FRIENDSHIP_GRAPH_INDEX_ENABLED=True):
+            graph_index.reset()
+            report("graph index", measure(reads, repeat=5, warmup=1))
+            graph_index.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+synthetic friendship graphs for benchmarks
+"""
+
+import random
+
+
+def power_law_edges(nodes, edges_per_node, seed=0):
+    """
+    yields (UID, UID) pairs of Barabási–Albert graph with UIDs 1..nodes,
+    every new user makes friends with edges_per_node existing users chosen proportionally
+    to their number of friends, so number of friends follows power law (few huge hubs, long tail)
+    """
+    rng = random.Random(seed)
+    # every UID appears here once per friendship, choosing from it is preferential attachment
+    endpoints = list(range(1, edges_per_node + 1))
+    for UID in range(edges_per_node + 1, nodes + 1):
+        friends = set()
+        while len(friends) < edges_per_node:
+            friends.add(rng.choice(endpoints))
+        for friend in friends:
+            yield friend, UID
+        endpoints.extend(friends)
+        endpoints.extend([UID] * edges_per_node)
+
+
+def random_edges(nodes, edges, seed=0):
+    """
+    yields (UID, UID) pairs of random graph with UIDs 1..nodes (duplicates are possible)
+    """
+    rng = random.Random(seed)
+    for _ in range(edges):
+        first, second = rng.sample(range(1, nodes + 1), 2)
+        yield first, second
+
+
+def degrees(edges):
+    """
+    returns dict UID -> number of friends
+    """
+    result = {}
+    for first, second in edges:
+        result[first] = result.get(first, 0) + 1
+        result[second] = result.get(second, 0) + 1
+    return result
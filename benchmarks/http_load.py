@@ -0,0 +1,168 @@
+"""
+HTTP load generator and server runner for benchmarks of whole deployments (gunicorn + Django)
+"""
+
+import asyncio
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import subprocess
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+
+def database_url(settings_dict):
+    """
+    returns DATABASE_URL of connection settings, servers started by benchmark use test database
+    """
+    host = quote(settings_dict["HOST"] or "", safe="")
+    port = f":{settings_dict['PORT']}" if settings_dict["PORT"] else ""
+    password = (
+        f":{quote(settings_dict['PASSWORD'], safe='')}"
+        if settings_dict["PASSWORD"]
+        else ""
+    )
+    return f"postgres://{settings_dict['USER']}{password}@{host}{port}/{settings_dict['NAME']}"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def gunicorn(app, options=(), env=None, timeout=30):
+    """
+    runs gunicorn with app on free local port, yields the port when server answers
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        ["gunicorn", *options, "--bind", f"127.0.0.1:{port}", app],
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while not _answers(port):
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"gunicorn {app} didn't start")
+            time.sleep(0.1)
+        yield port
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait()
+
+
+def _answers(port):
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+            sock.sendall(b"GET /api/friendship/1 HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            return sock.recv(12).startswith(b"HTTP/1.1")
+    except OSError:
+        return False
+
+
+def run_load(port, requests, connections, duration, processes=None):
+    """
+    keeps connections concurrent keep-alive connections busy for duration seconds,
+    requests(rng) returns raw HTTP request, returns dict with number of responses, errors,
+    requests per second and latency percentiles in milliseconds
+    """
+    processes = processes or min(connections, os.cpu_count() or 1, 8)
+    shares = [
+        connections // processes + (i < connections % processes)
+        for i in range(processes)
+    ]
+    deadline = time.time() + duration
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.starmap(
+            _run_clients,
+            [
+                (port, requests, share, deadline, seed)
+                for seed, share in enumerate(shares)
+            ],
+        )
+
+    latencies = sorted(latency for result in results for latency in result[1])
+    errors = sum(result[0] for result in results)
+
+    def percentile(p):
+        if not latencies:
+            return float("nan")
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    return {
+        "responses": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50": percentile(0.5),
+        "p99": percentile(0.99),
+    }
+
+
+def _run_clients(port, requests, connections, deadline, seed):
+    errors = [0]
+    latencies = []
+
+    async def main():
+        await asyncio.gather(
+            *(
+                _client(
+                    port,
+                    requests,
+                    random.Random(seed * connections + i),
+                    deadline,
+                    errors,
+                    latencies,
+                )
+                for i in range(connections)
+            )
+        )
+
+    asyncio.run(main())
+    return errors[0], latencies
+
+
+async def _client(port, requests, rng, deadline, errors, latencies):
+    reader = writer = None
+    while time.time() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            start = time.perf_counter()
+            writer.write(requests(rng))
+            head = await asyncio.wait_for(
+                reader.readuntil(b"\r\n\r\n"), deadline - time.time() + 1
+            )
+            headers = head.decode("latin-1").lower().split("\r\n")
+            length = next(
+                (
+                    int(h.split(":", 1)[1])
+                    for h in headers
+                    if h.startswith("content-length:")
+                ),
+                0,
+            )
+            await reader.readexactly(length)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            if time.time() < deadline:
+                errors[0] += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            continue
+
+        latencies.append((time.perf_counter() - start) * 1000)
+        if headers[0].split(" ")[1][0] != "2":
+            errors[0] += 1
+        # gunicorn sync workers close connection after every response
+        if "connection: close" in headers:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
@@ -0,0 +1,78 @@
+"""
+loading friendships from CSV: manage.py load_friendships (COPY into staging table and merge)
+vs ORM bulk_create, on a synthetic power-law graph written to CSV file
+
+    python -m benchmarks.load_friendships [--nodes 200000] [--edges-per-node 5]
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+from io import StringIO
+from itertools import islice
+
+from benchmarks import setup, test_database
+from benchmarks.graphs import power_law_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--edges-per-node", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    args = parser.parse_args()
+
+    setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    from friendship.models import Friendship
+
+    def truncate():
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {Friendship._meta.db_table}")
+
+    def bulk_create(path):
+        with open(path, newline="") as file:
+            rows = csv.reader(file)
+            while True:
+                chunk = list(islice(rows, args.chunk_size))
+                if not chunk:
+                    break
+                Friendship.objects.bulk_create(
+                    [
+                        Friendship(
+                            first_friend=min(int(first), int(second)),
+                            second_friend=max(int(first), int(second)),
+                        )
+                        for first, second in chunk
+                    ],
+                    batch_size=10000,
+                    ignore_conflicts=True,
+                )
+
+    with test_database(), tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "friendships.csv")
+        with open(path, "w", newline="") as file:
+            csv.writer(file).writerows(power_law_edges(args.nodes, args.edges_per_node))
+        print(f"{os.path.getsize(path) / 2 ** 20:.1f} MiB CSV file")
+
+        start = time.monotonic()
+        bulk_create(path)
+        print(f"{'ORM bulk_create':<40} {time.monotonic() - start:9.1f} s")
+        count = Friendship.objects.count()
+
+        truncate()
+        start = time.monotonic()
+        call_command(
+            "load_friendships", path, chunk_size=args.chunk_size, stdout=StringIO()
+        )
+        print(f"{'load_friendships':<40} {time.monotonic() - start:9.1f} s")
+        print(f"{count} friendships")
+        assert Friendship.objects.count() == count
+
+
+if __name__ == "__main__":
+    main()
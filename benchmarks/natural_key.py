@@ -0,0 +1,66 @@
+"""
+friendship table with primary key of surrogate id vs without it (manage.py drop_friendship_pk):
+index size and insert throughput, on a synthetic power-law graph
+
+    python -m benchmarks.natural_key [--nodes 200000] [--edges-per-node 5]
+"""
+
+import argparse
+import time
+from io import StringIO
+from itertools import islice
+
+from benchmarks import load_edges, setup, test_database
+from benchmarks.graphs import power_law_edges, random_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--edges-per-node", type=int, default=5)
+    parser.add_argument("--inserts", type=int, default=100000)
+    args = parser.parse_args()
+
+    setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    from friendship.models import Friendship
+
+    # every run inserts different friendships
+    inserts = random_edges(args.nodes * 10, args.inserts * 2, seed=1)
+
+    def insert(name):
+        start = time.monotonic()
+        for _ in range(args.inserts // 1000):
+            Friendship.objects.bulk_add_friendships(islice(inserts, 1000))
+        elapsed = time.monotonic() - start
+        print(
+            f"{name}: {args.inserts / elapsed:.0f} inserts/s (bulk_add_friendships, 1000 per batch)"
+        )
+
+    def sizes(name):
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM FULL ANALYZE friendship_friendship")
+            cursor.execute("""
+                SELECT pg_table_size('friendship_friendship'),
+                    pg_indexes_size('friendship_friendship')
+                """)
+            table, indexes = cursor.fetchone()
+        print(
+            f"{name}: table {table / 2 ** 20:.1f} MiB, indexes {indexes / 2 ** 20:.1f} MiB"
+        )
+
+    with test_database():
+        load_edges(power_law_edges(args.nodes, args.edges_per_node))
+        print(f"{Friendship.objects.count()} friendships")
+        sizes("with primary key")
+        insert("with primary key")
+
+        call_command("drop_friendship_pk", stdout=StringIO())
+        sizes("without primary key")
+        insert("without primary key")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+friendship table partitioned by hash of first_friend (manage.py partition_friendships) vs single table:
+insert throughput, lookup latency and REINDEX of the whole table vs one partition,
+on a synthetic power-law graph
+
+    python -m benchmarks.partitioning [--nodes 200000] [--edges-per-node 5] [--partitions 16]
+"""
+
+import argparse
+import random
+import time
+from io import StringIO
+from itertools import islice
+
+from benchmarks import load_edges, measure, report, setup, test_database
+from benchmarks.graphs import power_law_edges, random_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--edges-per-node", type=int, default=5)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--inserts", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    from friendship.models import Friendship
+
+    generator = random.Random(0)
+    users = [generator.randint(1, args.nodes) for _ in range(args.repeat)]
+    # every run inserts different friendships
+    inserts = random_edges(args.nodes * 10, args.inserts * 2, seed=1)
+
+    def benchmark(name, table):
+        start = time.monotonic()
+        for _ in range(args.inserts // 1000):
+            Friendship.objects.bulk_add_friendships(islice(inserts, 1000))
+        elapsed = time.monotonic() - start
+        print(
+            f"{name}: {args.inserts / elapsed:.0f} inserts/s (bulk_add_friendships, 1000 per batch)"
+        )
+
+        lookups = iter(users * 10)
+        report(
+            f"{name} find_friends",
+            measure(
+                lambda: list(Friendship.objects.find_friends(next(lookups))),
+                args.repeat,
+            ),
+        )
+        report(
+            f"{name} count_friends",
+            measure(
+                lambda: Friendship.objects.count_friends(next(lookups)), args.repeat
+            ),
+        )
+        with connection.cursor() as cursor:
+            start = time.monotonic()
+            cursor.execute(f"REINDEX TABLE {table}")
+            print(f"{name}: REINDEX {table} {time.monotonic() - start:.2f} s")
+
+    with test_database():
+        load_edges(power_law_edges(args.nodes, args.edges_per_node))
+        print(f"{Friendship.objects.count()} friendships")
+
+        benchmark("single table", "friendship_friendship")
+        call_command(
+            "partition_friendships", partitions=args.partitions, stdout=StringIO()
+        )
+        benchmark(f"{args.partitions} partitions", "friendship_friendship_p0")
+
+
+if __name__ == "__main__":
+    main()
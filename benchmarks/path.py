@@ -0,0 +1,82 @@
+"""
+shortest friendship path: bidirectional BFS with one query per step (FriendshipManager.find_path)
+vs naive BFS from the first user with one find_friends query per visited user,
+on a synthetic power-law graph, for random pairs of users
+
+    python -m benchmarks.path [--nodes 20000] [--edges-per-node 5] [--pairs 10]
+"""
+
+import argparse
+import random
+
+from benchmarks import load_edges, measure, report, setup, test_database
+from benchmarks.graphs import power_law_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--edges-per-node", type=int, default=5)
+    parser.add_argument("--pairs", type=int, default=10)
+    parser.add_argument("--max-depth", type=int, default=6)
+    parser.add_argument("--max-frontier", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup()
+    from friendship.models import Friendship
+
+    def find_path_naive(first_UID, second_UID):
+        parents = {first_UID: None}
+        frontier = [first_UID]
+        for _ in range(args.max_depth):
+            next_frontier = []
+            for UID in frontier:
+                for friend in Friendship.objects.find_friends(UID):
+                    if friend in parents:
+                        continue
+                    parents[friend] = UID
+                    if friend == second_UID:
+                        return Friendship.objects._path_to_root(parents, friend)[::-1]
+                    next_frontier.append(friend)
+            frontier = next_frontier
+        return None
+
+    edges = list(power_law_edges(args.nodes, args.edges_per_node))
+    generator = random.Random(0)
+    pairs = [
+        tuple(generator.sample(range(1, args.nodes + 1), 2)) for _ in range(args.pairs)
+    ]
+
+    with test_database():
+        load_edges(edges)
+        print(
+            f"{args.nodes} users, {len(edges)} friendships, {args.pairs} random pairs"
+        )
+        paths = [
+            Friendship.objects.find_path(*pair, args.max_depth, args.max_frontier, 60)
+            for pair in pairs
+        ]
+        print(f"path degrees: {sorted(len(path) - 1 for path, _ in paths if path)}")
+        report(
+            "naive BFS",
+            measure(
+                lambda: [find_path_naive(*pair) for pair in pairs], repeat=args.repeat
+            ),
+        )
+        report(
+            "find_path",
+            measure(
+                lambda: [
+                    Friendship.objects.find_path(
+                        *pair, args.max_depth, args.max_frontier, 60
+                    )
+                    for pair in pairs
+                ],
+                repeat=args.repeat,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
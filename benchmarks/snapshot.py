@@ -0,0 +1,68 @@
+"""
+binary snapshot of friendships (manage.py export_graph / import_graph): export and import time,
+file size, compared with reading the whole table through the ORM and with bulk_add_friendships,
+on a synthetic power-law graph
+
+    python -m benchmarks.snapshot [--nodes 200000] [--edges-per-node 5]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from io import StringIO
+
+from benchmarks import load_edges, setup, test_database
+from benchmarks.graphs import power_law_edges
+
+
+def timed(name, func):
+    start = time.monotonic()
+    result = func()
+    print(f"{name:<40} {time.monotonic() - start:9.1f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--edges-per-node", type=int, default=5)
+    args = parser.parse_args()
+
+    setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    from friendship.models import Friendship
+
+    def truncate():
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {Friendship._meta.db_table}")
+
+    with test_database(), tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "friendships.bin")
+        timed(
+            "load with bulk_add_friendships",
+            lambda: load_edges(power_law_edges(args.nodes, args.edges_per_node)),
+        )
+        count = Friendship.objects.count()
+        timed("read all through ORM", lambda: len(list(Friendship.objects.all())))
+        timed(
+            "export_graph",
+            lambda: call_command("export_graph", path, stdout=StringIO()),
+        )
+        print(
+            f"{count} friendships, snapshot {os.path.getsize(path) / 2 ** 20:.1f} MiB "
+            f"({os.path.getsize(path) / count:.2f} B per friendship)"
+        )
+
+        truncate()
+        timed(
+            "import_graph",
+            lambda: call_command("import_graph", path, stdout=StringIO()),
+        )
+        assert Friendship.objects.count() == count
+
+
+if __name__ == "__main__":
+    main()
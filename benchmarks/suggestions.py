@@ -0,0 +1,71 @@
+"""
+friend suggestions: one SQL query (FriendshipManager.suggest_friends) vs naive N+1 queries,
+on a synthetic power-law graph, for the biggest hub, a user with median and a user with minimal
+number of friends
+
+    python -m benchmarks.suggestions [--nodes 20000] [--edges-per-node 5]
+"""
+
+import argparse
+import statistics
+from collections import Counter
+
+from benchmarks import load_edges, measure, report, setup, test_database
+from benchmarks.graphs import degrees, power_law_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--edges-per-node", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--degree-cap", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup()
+    from friendship.models import Friendship
+
+    def suggest_friends_naive(UID):
+        friends = set(Friendship.objects.find_friends(UID))
+        candidates = Counter()
+        for friend in friends:
+            candidates.update(Friendship.objects.find_friends(friend))
+        for friend in friends | {UID}:
+            candidates.pop(friend, None)
+        return candidates.most_common(args.limit)
+
+    edges = list(power_law_edges(args.nodes, args.edges_per_node))
+    friends_count = degrees(edges)
+    by_degree = sorted(friends_count, key=friends_count.get)
+    users = {
+        "hub": by_degree[-1],
+        "median": by_degree[len(by_degree) // 2],
+        "minimal": by_degree[0],
+    }
+
+    with test_database():
+        load_edges(edges)
+        print(
+            f"{args.nodes} users, {len(edges)} friendships, "
+            f"median {statistics.median(friends_count.values())} friends"
+        )
+        for name, UID in users.items():
+            print(f"{name} user with {friends_count[UID]} friends")
+            report(
+                "naive N+1 queries",
+                measure(lambda: suggest_friends_naive(UID), repeat=args.repeat),
+            )
+            report(
+                "suggest_friends",
+                measure(
+                    lambda: Friendship.objects.suggest_friends(
+                        UID, args.limit, args.degree_cap
+                    ),
+                    repeat=args.repeat,
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+friendship URLs of ASGI deployment (FRIENDSHIP_ASYNC_VIEWS), find, create and delete of friendships
+are served by async views, other endpoints by the same views as in friendship.urls
+"""
+
+from django.urls import path
+
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+app_name = "friendship"
+
+async_urlpatterns = {
+    pattern.name: pattern
+    for pattern in [
+        path("friendship", async_views.create_friendship, name="friendship_create"),
+        path(
+            "friendship/<int:uid1>/<int:uid2>",
+            async_views.delete_friendship,
+            name="friendship_delete",
+        ),
+        path("friendship/<int:uid>", async_views.find_friends, name="find_friends"),
+    ]
+}
+
+# the same order as in friendship.urls
+urlpatterns = [
+    async_urlpatterns.get(pattern.name, pattern) for pattern in sync_urlpatterns
+]
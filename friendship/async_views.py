@@ -0,0 +1,150 @@
+"""
+async variants of FindFriendsView, FriendshipCreateView and FriendshipDeleteView for ASGI deployment,
+responses are the same as responses of the DRF views
+
+Django 3.1 ORM is synchronous, so database work runs in a dedicated pool of
+FRIENDSHIP_ASYNC_DB_THREADS threads, event loop only parses requests and writes responses,
+one worker process serves many concurrent connections with a bounded number of database connections
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework import status
+
+from .models import Friendship
+from .responses import json_response, method_not_allowed, parse_json
+from .serializers import FriendshipSerializer, FriendsPageSerializer, UserSerializer
+from .views import next_page_url
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def db_executor():
+    """
+    returns process wide thread pool of database work, it's created on first use
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.FRIENDSHIP_ASYNC_DB_THREADS,
+                    thread_name_prefix="friendship-db",
+                )
+    return _executor
+
+
+async def run_in_db_thread(func, *args):
+    """
+    runs func(*args) in database thread pool and returns its result,
+    context variables (e.g. primary_reads() of friendship.routers) are passed to the thread
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        db_executor(), contextvars.copy_context().run, _call, func, args
+    )
+
+
+def _call(func, args):
+    # request_started and request_finished signals close old connections only in thread
+    # which handles request, connections of pool threads are checked around every call
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+async def find_friends(request, uid):
+    """
+    async FindFriendsView
+    """
+    if request.method != "GET":
+        return method_not_allowed(request, "GET")
+
+    serializer = UserSerializer(data={"uid": uid})
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+    # with after or limit parameter friends are paginated
+    if "after" in request.GET or "limit" in request.GET:
+        page_serializer = FriendsPageSerializer(data=request.GET)
+        if not page_serializer.is_valid():
+            return json_response(page_serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        after = page_serializer.validated_data["after"]
+        limit = page_serializer.validated_data["limit"]
+        friends = await run_in_db_thread(
+            lambda: list(Friendship.objects.find_friends_page(uid, after, limit))
+        )
+        return json_response(
+            {"friends": friends, "next": next_page_url(request, friends, limit)},
+            status.HTTP_200_OK,
+        )
+
+    friends = await run_in_db_thread(Friendship.objects.get_friends_list, uid)
+    return json_response({"friends": friends}, status.HTTP_200_OK)
+
+
+async def create_friendship(request):
+    """
+    async FriendshipCreateView
+    """
+    if request.method != "POST":
+        return method_not_allowed(request, "POST")
+
+    data, error = parse_json(request)
+    if error is not None:
+        return error
+
+    serializer = FriendshipSerializer(data=data)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+    # existing friendship isn't an error, relation is the same as requested
+    await run_in_db_thread(
+        Friendship.objects.add_friendship,
+        serializer.validated_data["first_friend"],
+        serializer.validated_data["second_friend"],
+    )
+    return json_response(serializer.data, status.HTTP_201_CREATED)
+
+
+async def delete_friendship(request, uid1, uid2):
+    """
+    async FriendshipDeleteView, friendship is removed with one DELETE statement
+    """
+    if request.method != "DELETE":
+        return method_not_allowed(request, "DELETE")
+
+    serializer = FriendshipSerializer(
+        data={"first_friend": uid1, "second_friend": uid2}
+    )
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+    removed = await run_in_db_thread(
+        Friendship.objects.bulk_remove_friendships,
+        [
+            (
+                serializer.validated_data["first_friend"],
+                serializer.validated_data["second_friend"],
+            )
+        ],
+    )
+    # if friendship doesn't exist, return OK, do nothing
+    return HttpResponse(
+        status=status.HTTP_204_NO_CONTENT if removed else status.HTTP_200_OK
+    )
+
+
+# like DRF views, API isn't protected by CSRF tokens, django.views.decorators.csrf.csrf_exempt
+# of Django 3.1 wraps async view in sync function, so the attribute is set directly
+for view in (find_friends, create_friendship, delete_friendship):
+    view.csrf_exempt = True
@@ -0,0 +1,106 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .graph import graph_index
+
+
+class FriendsCache:
+    """
+    read-through cache of friends lists, keyed by UID
+    it uses django cache framework (FRIENDSHIP_CACHE_ALIAS in CACHES), so backend, TTL and eviction
+    are configured in settings, hits and misses are counted per process
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[settings.FRIENDSHIP_CACHE_ALIAS]
+
+    @staticmethod
+    def key(UID):
+        return f"friends:{UID}"
+
+    def get_or_set(self, UID, load):
+        """
+        returns cached friends list of the user, on miss list is loaded with load() and cached
+        """
+        friends = self.cache.get(self.key(UID))
+        if friends is not None:
+            self._count(hits=1)
+            return friends
+
+        self._count(misses=1)
+        friends = load()
+        self.cache.set(self.key(UID), friends)
+        return friends
+
+    def invalidate(self, UIDs):
+        """
+        removes cached friends lists of given users, it has to be called after every change of friendship
+        """
+        UIDs = set(UIDs)
+        if UIDs:
+            self.cache.delete_many([self.key(UID) for UID in UIDs])
+
+    @property
+    def shared(self):
+        """
+        whether cached lists are shared by processes, locmem cache lives in one process only
+        """
+        return not isinstance(self.cache, (LocMemCache, DummyCache))
+
+    def clear(self):
+        """
+        removes all cached friends lists, after bulk writes which don't invalidate lists one by one,
+        it's done only for shared cache, locmem cache of other processes can't be cleared,
+        returns whether cache was cleared
+        """
+        if not self.shared:
+            return False
+        self.cache.clear()
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _count(self, hits=0, misses=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+
+friends_cache = FriendsCache()
+
+
+def clear_after_bulk_write():
+    """
+    called after bulk writes which don't invalidate cached friends lists one by one
+    (FriendshipManager.copy_friendships), clears shared friends cache,
+    returns warnings about caches of running servers which can't be cleared from here
+    """
+    warnings = []
+    if not friends_cache.clear():
+        warnings.append(
+            "friends cache is per process (locmem), running servers serve stale friends lists "
+            "until FRIENDSHIP_CACHE_TIMEOUT, restart them to see written friendships"
+        )
+    if graph_index.enabled:
+        warnings.append(
+            "graph index of running servers is refreshed after FRIENDSHIP_GRAPH_INDEX_TTL, "
+            "restart them to see written friendships"
+        )
+    return warnings
@@ -0,0 +1,29 @@
+"""
+friendship URLs with FRIENDSHIP_FAST_VIEWS, find, create and delete of friendships are served
+by plain Django views, other endpoints by the same views as in friendship.urls
+"""
+
+from django.urls import path
+
+from . import fast_views
+from .urls import urlpatterns as drf_urlpatterns
+
+app_name = "friendship"
+
+fast_urlpatterns = {
+    pattern.name: pattern
+    for pattern in [
+        path("friendship", fast_views.create_friendship, name="friendship_create"),
+        path(
+            "friendship/<int:uid1>/<int:uid2>",
+            fast_views.delete_friendship,
+            name="friendship_delete",
+        ),
+        path("friendship/<int:uid>", fast_views.find_friends, name="find_friends"),
+    ]
+}
+
+# the same order as in friendship.urls
+urlpatterns = [
+    fast_urlpatterns.get(pattern.name, pattern) for pattern in drf_urlpatterns
+]
@@ -0,0 +1,132 @@
+"""
+FindFriendsView, FriendshipCreateView and FriendshipDeleteView as plain Django views (FRIENDSHIP_FAST_VIEWS)
+
+responses are the same as responses of DRF views, but common requests skip DRF request wrapping,
+content negotiation and serializers, plain integer UIDs are validated inline,
+anything else is validated by the same serializers as in DRF views, so errors are the same
+"""
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+
+from .models import Friendship
+from .responses import json_response, method_not_allowed, parse_json
+from .serializers import (
+    FriendshipSerializer,
+    FriendsPageSerializer,
+    UserSerializer,
+    plain_pair,
+)
+from .views import next_page_url
+
+
+@csrf_exempt
+def find_friends(request, uid):
+    """
+    FindFriendsView
+    """
+    if request.method != "GET":
+        return method_not_allowed(request, "GET")
+
+    # URL converter accepts only non-negative integers
+    if uid < 1:
+        serializer = UserSerializer(data={"uid": uid})
+        serializer.is_valid()
+        return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+    # with after or limit parameter friends are paginated
+    if "after" in request.GET or "limit" in request.GET:
+        page = plain_page(request.GET)
+        if page is None:
+            serializer = FriendsPageSerializer(data=request.GET)
+            if not serializer.is_valid():
+                return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+            page = (
+                serializer.validated_data["after"],
+                serializer.validated_data["limit"],
+            )
+
+        after, limit = page
+        friends = list(Friendship.objects.find_friends_page(uid, after, limit))
+        return json_response(
+            {"friends": friends, "next": next_page_url(request, friends, limit)},
+            status.HTTP_200_OK,
+        )
+
+    friends = Friendship.objects.get_friends_list(uid)
+    return json_response({"friends": friends}, status.HTTP_200_OK)
+
+
+@csrf_exempt
+def create_friendship(request):
+    """
+    FriendshipCreateView
+    """
+    if request.method != "POST":
+        return method_not_allowed(request, "POST")
+
+    data, error = parse_json(request)
+    if error is not None:
+        return error
+
+    pair = None
+    if isinstance(data, dict):
+        pair = plain_pair(data.get("first_friend"), data.get("second_friend"))
+    if pair is None:
+        serializer = FriendshipSerializer(data=data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        pair = (
+            serializer.validated_data["first_friend"],
+            serializer.validated_data["second_friend"],
+        )
+
+    # existing friendship isn't an error, relation is the same as requested
+    Friendship.objects.add_friendship(*pair)
+    return json_response(
+        {"first_friend": pair[0], "second_friend": pair[1]}, status.HTTP_201_CREATED
+    )
+
+
+@csrf_exempt
+def delete_friendship(request, uid1, uid2):
+    """
+    FriendshipDeleteView, friendship is removed with one DELETE statement
+    """
+    if request.method != "DELETE":
+        return method_not_allowed(request, "DELETE")
+
+    pair = plain_pair(uid1, uid2)
+    if pair is None:
+        serializer = FriendshipSerializer(
+            data={"first_friend": uid1, "second_friend": uid2}
+        )
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        pair = (
+            serializer.validated_data["first_friend"],
+            serializer.validated_data["second_friend"],
+        )
+
+    removed = Friendship.objects.bulk_remove_friendships([pair])
+    # if friendship doesn't exist, return OK, do nothing
+    return HttpResponse(
+        status=status.HTTP_204_NO_CONTENT if removed else status.HTTP_200_OK
+    )
+
+
+def plain_page(query):
+    """
+    fast path of FriendsPageSerializer, returns (after, limit) for plain numbers in range,
+    otherwise None, then parameters have to be validated by FriendsPageSerializer
+    """
+    after = query.get("after", "0")
+    limit = query.get("limit", str(settings.REST_FRAMEWORK["PAGE_SIZE"]))
+    if not after.isdecimal() or not limit.isdecimal():
+        return None
+    after, limit = int(after), int(limit)
+    if not 0 < limit <= settings.FRIENDSHIP_PAGE_MAX_SIZE:
+        return None
+    return after, limit
@@ -0,0 +1,297 @@
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from heapq import nsmallest
+
+from django.conf import settings
+from django.db import connections
+
+
+class AdjacencyIndex:
+    """
+    in-memory adjacency of all friendships in CSR (compressed sparse row) layout, every friendship
+    is stored in both directions, three flat arrays:
+        nodes       sorted UIDs of users with at least one friend
+        offsets     friends of nodes[i] are neighbours[offsets[i]:offsets[i + 1]]
+        neighbours  friends of all users, sorted for every user
+    UIDs are stored as 4 byte integers while they fit, otherwise as 8 byte integers,
+    so one friendship takes 8 (16) bytes and one user 12 (16) bytes
+
+    arrays are never changed after build, friendships created or removed later are kept
+    in small per user overlay (added, removed sets) which is applied on reads
+    """
+
+    def __init__(self, nodes, offsets, neighbours):
+        self.nodes = nodes
+        self.offsets = offsets
+        self.neighbours = neighbours
+        self.added = {}
+        self.removed = {}
+
+    @classmethod
+    def build(cls, rows):
+        """
+        builds index from (UID, friend) rows ordered by UID and friend, which contain
+        every friendship in both directions, rows can be streamed, they are read only once
+        """
+        nodes, offsets, neighbours = array("I"), array("Q"), array("I")
+        for UID, friend in rows:
+            if not nodes or nodes[-1] != UID:
+                offsets.append(len(neighbours))
+                nodes = cls._append(nodes, UID)
+            neighbours = cls._append(neighbours, friend)
+        offsets.append(len(neighbours))
+        return cls(nodes, offsets, neighbours)
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """
+        builds index from (first_friend, second_friend) pairs in any order
+        """
+        rows = set()
+        for first_friend, second_friend in pairs:
+            rows.add((first_friend, second_friend))
+            rows.add((second_friend, first_friend))
+        return cls.build(sorted(rows))
+
+    @staticmethod
+    def _append(values, value):
+        try:
+            values.append(value)
+        except OverflowError:
+            # UID doesn't fit into 4 bytes, all UIDs are converted to 8 bytes
+            values = array("Q", values)
+            values.append(value)
+        return values
+
+    def _range(self, UID):
+        i = bisect_left(self.nodes, UID)
+        if i < len(self.nodes) and self.nodes[i] == UID:
+            return self.offsets[i], self.offsets[i + 1]
+        return 0, 0
+
+    def _contains(self, UID, friend):
+        start, end = self._range(UID)
+        i = bisect_left(self.neighbours, friend, start, end)
+        return i < end and self.neighbours[i] == friend
+
+    def friends(self, UID):
+        """
+        returns sorted list of friends of the user
+        """
+        start, end = self._range(UID)
+        friends = self.neighbours[start:end].tolist()
+        if UID in self.added or UID in self.removed:
+            friends = sorted(
+                set(friends)
+                .union(self.added.get(UID, ()))
+                .difference(self.removed.get(UID, ()))
+            )
+        return friends
+
+    def friends_page(self, UID, after, limit):
+        """
+        returns up to limit friends of the user with UID bigger than after, ordered by UID
+        """
+        if UID in self.added or UID in self.removed:
+            friends = self.friends(UID)
+            start = bisect_right(friends, after)
+            return friends[start:][:limit]
+
+        start, end = self._range(UID)
+        start = bisect_right(self.neighbours, after, start, end)
+        end = min(end, start + limit)
+        return self.neighbours[start:end].tolist()
+
+    def count(self, UID):
+        """
+        returns number of friends of the user
+        """
+        start, end = self._range(UID)
+        return (
+            end - start + len(self.added.get(UID, ())) - len(self.removed.get(UID, ()))
+        )
+
+    def exists(self, first_friend, second_friend):
+        """
+        checks if users are friends
+        """
+        if second_friend in self.added.get(first_friend, ()):
+            return True
+        if second_friend in self.removed.get(first_friend, ()):
+            return False
+        return self._contains(first_friend, second_friend)
+
+    def mutual_friends(self, first_UID, second_UID, after, limit):
+        """
+        returns up to limit common friends of both users with UID bigger than after, ordered by UID
+        """
+        mutual = set(self.friends(first_UID)).intersection(self.friends(second_UID))
+        return nsmallest(limit, (friend for friend in mutual if friend > after))
+
+    def suggest_friends(self, UID, limit, degree_cap):
+        """
+        returns up to limit (UID, number of mutual friends) of friends of friends of the user,
+        ranked like FriendshipManager.suggest_friends, only degree_cap friends of the user
+        and degree_cap friends of every friend are counted
+        """
+        friends = self.friends(UID)
+        candidates = Counter()
+        for friend in friends[:degree_cap]:
+            candidates.update(self.friends(friend)[:degree_cap])
+        for friend in friends + [UID]:
+            candidates.pop(friend, None)
+        return nsmallest(
+            limit,
+            candidates.items(),
+            key=lambda candidate: (-candidate[1], candidate[0]),
+        )
+
+    def apply(self, added=(), removed=()):
+        """
+        records created and removed friendships in overlay, it's idempotent
+        """
+        for first_friend, second_friend in added:
+            self._change(first_friend, second_friend, True)
+            self._change(second_friend, first_friend, True)
+        for first_friend, second_friend in removed:
+            self._change(first_friend, second_friend, False)
+            self._change(second_friend, first_friend, False)
+
+    def _change(self, UID, friend, exists):
+        # overlay sets are replaced, never changed in place, so threads reading them are safe
+        added = self.added.get(UID, frozenset()) - {friend}
+        removed = self.removed.get(UID, frozenset()) - {friend}
+        if exists != self._contains(UID, friend):
+            if exists:
+                added |= {friend}
+            else:
+                removed |= {friend}
+        for overlay, friends in ((self.added, added), (self.removed, removed)):
+            if friends:
+                overlay[UID] = friends
+            else:
+                overlay.pop(UID, None)
+
+    def stats(self):
+        """
+        returns number of users and friendships and memory taken by arrays
+        """
+        size = sum(
+            values.itemsize * len(values)
+            for values in (self.nodes, self.offsets, self.neighbours)
+        )
+        edges = len(self.neighbours) // 2
+        return {
+            "users": len(self.nodes),
+            "friendships": edges,
+            "bytes": size,
+            "bytes_per_friendship": round(size / edges, 2) if edges else 0,
+            "overlay_users": len(self.added.keys() | self.removed.keys()),
+        }
+
+
+class GraphIndex:
+    """
+    process wide AdjacencyIndex, it's used when FRIENDSHIP_GRAPH_INDEX_ENABLED is set
+    index is built with load() in background thread when server starts (warm) or on first use,
+    requests never wait for it, get() returns None until it's built and database is queried,
+    it's rebuilt in background after FRIENDSHIP_GRAPH_INDEX_TTL seconds, old index is used meanwhile,
+    changes made by this process are applied immediately (after commit),
+    changes made by other processes are visible after rebuild
+    """
+
+    def __init__(self):
+        self._index = None
+        self._built_at = None
+        # changes committed while index is being built, they are applied to the new index
+        self._pending = None
+        self._builder = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _after_fork(self):
+        # thread building index of parent process doesn't exist in child, index itself is kept
+        self._pending = None
+        self._builder = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return settings.FRIENDSHIP_GRAPH_INDEX_ENABLED
+
+    def get(self, load):
+        """
+        returns current index or None if index is disabled or it isn't built yet
+        """
+        if not self.enabled:
+            return None
+
+        index = self._index
+        if index is None:
+            self.warm(load)
+        elif time.monotonic() - self._built_at > settings.FRIENDSHIP_GRAPH_INDEX_TTL:
+            self.warm(load)
+        return index
+
+    def warm(self, load):
+        """
+        starts building of new index with load() in background thread, unless index is disabled
+        or it's already being built, returns the thread or None
+        """
+        if not self.enabled or not self._build_lock.acquire(blocking=False):
+            return None
+        if self._index is not None:
+            # rebuild isn't started again by every request while it's running
+            self._built_at = time.monotonic()
+        self._builder = threading.Thread(
+            target=self._rebuild, args=(load,), daemon=True
+        )
+        self._builder.start()
+        return self._builder
+
+    def _rebuild(self, load):
+        try:
+            self.build(load)
+        finally:
+            self._build_lock.release()
+            # connections opened by this thread aren't used by anything else
+            connections.close_all()
+
+    def build(self, load):
+        """
+        builds new index with load() and replaces current one
+        """
+        with self._lock:
+            self._pending = []
+        index = load()
+        with self._lock:
+            for added, removed in self._pending:
+                index.apply(added, removed)
+            self._pending = None
+            self._index = index
+            self._built_at = time.monotonic()
+        return index
+
+    def changed(self, added=(), removed=()):
+        """
+        applies committed changes to current index and to index which is being built
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((added, removed))
+            if self._index is not None:
+                self._index.apply(added, removed)
+
+    def reset(self):
+        with self._lock:
+            self._index = None
+            self._built_at = None
+
+
+graph_index = GraphIndex()
+os.register_at_fork(after_in_child=graph_index._after_fork)
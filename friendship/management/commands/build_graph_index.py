@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from friendship.models import Friendship
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds in-memory adjacency index of all friendships and reports its size, "
+        "it's used to check build time and memory before enabling FRIENDSHIP_GRAPH_INDEX_ENABLED, "
+        "the index isn't shared, every server process builds its own in background when it starts"
+    )
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        index = Friendship.objects.build_graph_index()
+        elapsed = time.monotonic() - start
+
+        stats = index.stats()
+        self.stdout.write(
+            f"{stats['users']} users, {stats['friendships']} friendships, "
+            f"{stats['bytes'] / 2 ** 20:.1f} MiB ({stats['bytes_per_friendship']} B per friendship), "
+            f"built in {elapsed:.1f} s"
+        )
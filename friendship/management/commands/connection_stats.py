@@ -0,0 +1,79 @@
+import psycopg2
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports database connections, with POSTGRES_PGBOUNCER size and usage of PgBouncer pool "
+        "(SHOW DATABASES and SHOW POOLS of admin console), otherwise Postgres connections by state "
+        "and max_connections"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if settings.POSTGRES_PGBOUNCER:
+            self.pgbouncer_stats(connection)
+        else:
+            self.postgres_stats(connection)
+
+    def postgres_stats(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW max_connections")
+            max_connections = int(cursor.fetchone()[0])
+            cursor.execute(
+                "SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend'"
+            )
+            used = cursor.fetchone()[0]
+            cursor.execute("""
+                SELECT coalesce(state, 'unknown'), count(*) FROM pg_stat_activity
+                WHERE datname = current_database() AND backend_type = 'client backend'
+                GROUP BY 1 ORDER BY 1
+                """)
+            states = cursor.fetchall()
+
+        self.stdout.write(f"{used} of {max_connections} connections used")
+        by_state = ", ".join(f"{count} {state}" for state, count in states)
+        self.stdout.write(f"{connection.settings_dict['NAME']}: {by_state}")
+
+    def pgbouncer_stats(self, connection):
+        """
+        admin console accepts only simple queries without transaction, user has to be
+        in stats_users or admin_users of PgBouncer
+        """
+        params = connection.get_connection_params()
+        params["database"] = settings.POSTGRES_PGBOUNCER_ADMIN_DB
+        admin = psycopg2.connect(**params)
+        admin.autocommit = True
+        try:
+            with admin.cursor() as cursor:
+                databases = self._show(cursor, "DATABASES")
+                pools = self._show(cursor, "POOLS")
+        finally:
+            admin.close()
+
+        name = connection.settings_dict["NAME"]
+        for database in databases:
+            if database["name"] == name:
+                self.stdout.write(
+                    f"{name}: pool size {database['pool_size']}, "
+                    f"{database['current_connections']} server connections"
+                )
+        for pool in pools:
+            if pool["database"] == name:
+                self.stdout.write(
+                    f"{name} {pool['user']} ({pool['pool_mode']}): "
+                    f"clients {pool['cl_active']} active, {pool['cl_waiting']} waiting, "
+                    f"servers {pool['sv_active']} active, {pool['sv_idle']} idle, "
+                    f"{pool['sv_used']} used, max wait {pool['maxwait']} s"
+                )
+
+    @staticmethod
+    def _show(cursor, what):
+        cursor.execute(f"SHOW {what}")
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
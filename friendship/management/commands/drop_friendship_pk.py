@@ -0,0 +1,93 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+
+from friendship.models import Friendship
+
+
+class Command(BaseCommand):
+    help = (
+        "Drops primary key (and its index) of surrogate id of friendship table, "
+        '"Unique Friendship" (first_friend, second_friend) becomes the only unique index, '
+        "id column and its sequence are kept, so ids stay unique and the model doesn't change"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="only print SQL statements"
+        )
+
+    def handle(self, *args, **options):
+        db = router.db_for_write(Friendship)
+        connection = connections[db]
+        table = Friendship._meta.db_table
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            # primary key of partitioned table (id, first_friend) is dropped from partitions too
+            cursor.execute(
+                """
+                SELECT conname FROM pg_constraint
+                WHERE conrelid = %s::regclass AND contype = 'p'
+                """,
+                [quote(table)],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise CommandError(f"Table {table} has no primary key")
+
+            # "Unique Friendship" index (of table or of every partition) identifies rows
+            # for logical replication instead of primary key
+            cursor.execute(
+                """
+                SELECT indrelid::regclass::text, indexrelid::regclass::text FROM pg_index
+                JOIN pg_class ON pg_class.oid = indrelid
+                WHERE pg_class.relkind = 'r' AND (
+                    indexrelid = %(index)s::regclass
+                    OR indexrelid IN (
+                        SELECT inhrelid FROM pg_inherits WHERE inhparent = %(index)s::regclass
+                    )
+                )
+                """,
+                {"index": quote("Unique Friendship")},
+            )
+            replica_identities = cursor.fetchall()
+            indexes_size = self.indexes_size(cursor, connection, table)
+
+        statements = [f"ALTER TABLE {quote(table)} DROP CONSTRAINT {quote(row[0])}"]
+        statements += [
+            f"ALTER TABLE {relation} REPLICA IDENTITY USING INDEX {index}"
+            for relation, index in replica_identities
+        ]
+        if options["dry_run"]:
+            for statement in statements:
+                self.stdout.write(f"{statement};")
+            return
+
+        start = time.monotonic()
+        with transaction.atomic(using=db), connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+            new_indexes_size = self.indexes_size(cursor, connection, table)
+
+        self.stdout.write(
+            f"primary key dropped from {table} in {time.monotonic() - start:.1f} s, "
+            f"indexes {indexes_size / 2 ** 20:.1f} -> {new_indexes_size / 2 ** 20:.1f} MiB"
+        )
+
+    @staticmethod
+    def indexes_size(cursor, connection, table):
+        """
+        returns size of indexes of table in bytes, partitions included
+        """
+        cursor.execute(
+            """
+            SELECT sum(pg_indexes_size(relid)) FROM (
+                SELECT %(table)s::regclass AS relid
+                UNION ALL
+                SELECT inhrelid FROM pg_inherits WHERE inhparent = %(table)s::regclass
+            ) AS relations
+            """,
+            {"table": connection.ops.quote_name(table)},
+        )
+        return cursor.fetchone()[0]
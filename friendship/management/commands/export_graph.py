@@ -0,0 +1,37 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from friendship.models import Friendship
+from friendship.snapshot import write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports all friendships to compact binary snapshot file (see friendship/snapshot.py), "
+        "friendships are streamed by server-side cursor, so memory usage doesn't depend on table size"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="snapshot file")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100000,
+            help="number of friendships fetched from database at once",
+        )
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        count = write_snapshot(
+            options["path"], Friendship.objects.friendship_rows(options["chunk_size"])
+        )
+        elapsed = time.monotonic() - start
+
+        size = os.path.getsize(options["path"])
+        self.stdout.write(
+            f"exported {count} friendships to {options['path']}, "
+            f"{size / 2 ** 20:.1f} MiB ({size / max(count, 1):.2f} B per friendship), "
+            f"{elapsed:.1f} s ({count / max(elapsed, 1e-9):.0f} friendships/s)"
+        )
@@ -0,0 +1,52 @@
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from friendship.cache import clear_after_bulk_write
+from friendship.models import Friendship
+from friendship.snapshot import SnapshotError, read_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports friendships from binary snapshot file made by export_graph, "
+        "friendships are copied to database in chunks (COPY into staging table, then INSERT "
+        "ON CONFLICT DO NOTHING), existing friendships are kept"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="snapshot file")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100000,
+            help="number of friendships copied to database in one transaction",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            count, pairs = read_snapshot(options["path"])
+        except (OSError, SnapshotError) as e:
+            raise CommandError(e)
+
+        start = time.monotonic()
+        read = created = 0
+        try:
+            while True:
+                chunk = list(islice(pairs, options["chunk_size"]))
+                if not chunk:
+                    break
+                created += Friendship.objects.copy_friendships(chunk)
+                read += len(chunk)
+                self.stdout.write(f"{read} / {count} friendships", ending="\r")
+        except SnapshotError as e:
+            raise CommandError(e)
+        elapsed = time.monotonic() - start
+
+        for warning in clear_after_bulk_write():
+            self.stderr.write(self.style.WARNING(warning))
+        self.stdout.write(
+            f"imported {read} friendships from {options['path']}, {created} created, "
+            f"{elapsed:.1f} s ({read / max(elapsed, 1e-9):.0f} friendships/s)"
+        )
@@ -0,0 +1,180 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from friendship.cache import clear_after_bulk_write
+from friendship.models import Friendship
+from friendship.serializers import FriendshipSerializer, plain_pair
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads friendships from CSV file with first_friend,second_friend rows, "
+        "rows are validated like in POST /api/friendship (UIDs are swapped, self friendships rejected), "
+        "every chunk is copied to staging table and merged in one transaction, progress is saved "
+        "to checkpoint file after every chunk and loading continues from it when it's run again"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100000,
+            help="number of rows loaded in one transaction",
+        )
+        parser.add_argument(
+            "--skip-header", action="store_true", help="first row is header"
+        )
+        parser.add_argument(
+            "--rejects", help="CSV file where rejected rows with errors are appended"
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="checkpoint file, default is <path>.checkpoint, it's removed when loading is finished",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="ignore checkpoint and load file from the beginning, rejects file is truncated",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+        try:
+            size = os.path.getsize(path)
+        except OSError as e:
+            raise CommandError(e)
+
+        progress = {"offset": 0, "line": 0, "loaded": 0, "rejected": 0, "created": 0}
+        if os.path.exists(checkpoint_path) and not options["restart"]:
+            progress = self.read_checkpoint(checkpoint_path, size)
+            self.stdout.write(f"resuming after line {progress['line']}")
+
+        rejects = None
+        if options["rejects"]:
+            rejects = open(options["rejects"], "a", newline="")
+            # rejects of chunk which wasn't checkpointed are written again,
+            # all of them when file is loaded from the beginning again
+            if options["restart"]:
+                rejects.truncate(0)
+            elif progress.get("rejects_offset") is not None:
+                rejects.truncate(progress["rejects_offset"])
+        start = time.monotonic()
+        lines_at_start = progress["line"]
+        try:
+            with open(path, "rb") as file:
+                file.seek(progress["offset"])
+                if options["skip_header"] and progress["line"] == 0:
+                    progress["offset"] += len(file.readline())
+                    progress["line"] += 1
+
+                while True:
+                    lines = list(islice(file, options["chunk_size"]))
+                    if not lines:
+                        break
+
+                    pairs, rejected = self.validate_rows(lines, progress["line"] + 1)
+                    created = Friendship.objects.copy_friendships(sorted(set(pairs)))
+                    if rejects is not None:
+                        csv.writer(rejects).writerows(rejected)
+                        rejects.flush()
+
+                    progress["offset"] += sum(map(len, lines))
+                    progress["line"] += len(lines)
+                    progress["loaded"] += len(pairs)
+                    progress["rejected"] += len(rejected)
+                    progress["created"] += created
+                    progress["rejects_offset"] = (
+                        rejects.tell() if rejects is not None else None
+                    )
+                    # chunk is committed, it's loaded again only if process dies before this write,
+                    # which is harmless (ON CONFLICT DO NOTHING)
+                    self.write_checkpoint(checkpoint_path, {**progress, "size": size})
+
+                    elapsed = time.monotonic() - start
+                    self.stdout.write(
+                        f"{progress['offset'] / max(size, 1):6.1%} line {progress['line']}, "
+                        f"{(progress['line'] - lines_at_start) / max(elapsed, 1e-9):.0f} rows/s"
+                    )
+        finally:
+            if rejects is not None:
+                rejects.close()
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        for warning in clear_after_bulk_write():
+            self.stderr.write(self.style.WARNING(warning))
+
+        elapsed = time.monotonic() - start
+        self.stdout.write(
+            f"loaded {progress['loaded']} friendships from {path}, {progress['created']} created, "
+            f"{progress['loaded'] - progress['created']} existing or repeated, "
+            f"{progress['rejected']} rejected, {elapsed:.1f} s "
+            f"({(progress['line'] - lines_at_start) / max(elapsed, 1e-9):.0f} rows/s)"
+        )
+
+    @staticmethod
+    def validate_rows(lines, first_line):
+        """
+        returns list of normalized (first_friend, second_friend) pairs
+        and list of rejected rows (line, row, errors)
+        """
+        pairs = []
+        rejected = []
+        pair_serializer = FriendshipSerializer()
+        rows = csv.reader(line.decode("utf-8", errors="replace") for line in lines)
+        for line, row in enumerate(rows, first_line):
+            if not row:
+                continue
+            # fast path for plain UIDs, everything else is validated by FriendshipSerializer
+            pair = plain_row(row)
+            if pair is not None:
+                pairs.append(pair)
+                continue
+
+            if len(row) != 2:
+                rejected.append(
+                    (line, ",".join(row), json.dumps({"Error": ["Expected 2 columns"]}))
+                )
+                continue
+            try:
+                data = pair_serializer.run_validation(
+                    {"first_friend": row[0], "second_friend": row[1]}
+                )
+                pairs.append((data["first_friend"], data["second_friend"]))
+            except serializers.ValidationError as error:
+                rejected.append((line, ",".join(row), json.dumps(error.detail)))
+        return pairs, rejected
+
+    @staticmethod
+    def read_checkpoint(path, size):
+        with open(path) as file:
+            progress = json.load(file)
+        if progress.pop("size") != size:
+            raise CommandError(
+                f"Checkpoint {path} was made for another file, use --restart to ignore it"
+            )
+        return progress
+
+    @staticmethod
+    def write_checkpoint(path, progress):
+        # checkpoint is replaced atomically, so crash can't leave it half written
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(progress, file)
+        os.replace(f"{path}.tmp", path)
+
+
+def plain_row(row):
+    """
+    returns normalized pair for row with two different UIDs written as plain numbers, otherwise None
+    """
+    if len(row) != 2 or not row[0].isdecimal() or not row[1].isdecimal():
+        return None
+    return plain_pair(int(row[0]), int(row[1]))
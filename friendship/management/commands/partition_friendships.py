@@ -0,0 +1,132 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+
+from friendship.models import Friendship
+
+
+class Command(BaseCommand):
+    help = (
+        "Converts friendship table to table partitioned by hash of first_friend, "
+        "rows are copied in one transaction, table is locked (reads and writes wait) until it's finished"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--partitions", type=int, default=16, help="number of partitions"
+        )
+        parser.add_argument(
+            "--keep-old",
+            action="store_true",
+            help="keep old table renamed to <table>_unpartitioned",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="only print SQL statements"
+        )
+
+    def handle(self, *args, **options):
+        if options["partitions"] < 1:
+            raise CommandError("Number of partitions must be positive")
+
+        db = router.db_for_write(Friendship)
+        connection = connections[db]
+        table = Friendship._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+                [connection.ops.quote_name(table)],
+            )
+            if cursor.fetchone() is not None:
+                raise CommandError(f"Table {table} is already partitioned")
+
+            statements = self.partition_sql(
+                cursor, connection, table, options["partitions"], options["keep_old"]
+            )
+
+        if options["dry_run"]:
+            for statement in statements:
+                self.stdout.write(f"{statement};")
+            return
+
+        start = time.monotonic()
+        with transaction.atomic(using=db), connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+        self.stdout.write(
+            f"{table} partitioned into {options['partitions']} partitions "
+            f"in {time.monotonic() - start:.1f} s"
+        )
+
+    @staticmethod
+    def partition_sql(cursor, connection, table, partitions, keep_old):
+        """
+        returns SQL statements which replace table with partitioned one with the same columns,
+        constraints and indexes, old table is renamed, so names of its indexes are free
+        """
+        quote = connection.ops.quote_name
+        old_table = f"{table}_unpartitioned"
+
+        cursor.execute(
+            """
+            SELECT "index"."relname" FROM pg_index
+            JOIN pg_class AS "index" ON "index"."oid" = pg_index.indexrelid
+            WHERE pg_index.indrelid = %s::regclass
+            ORDER BY 1
+            """,
+            [quote(table)],
+        )
+        indexes = [name for name, in cursor.fetchall()]
+        columns = [
+            column.name
+            for column in connection.introspection.get_table_description(cursor, table)
+        ]
+
+        sequence = None
+        if "id" in columns:
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [quote(table)])
+            sequence = cursor.fetchone()[0]
+
+        statements = [
+            f"LOCK TABLE {quote(table)} IN ACCESS EXCLUSIVE MODE",
+            f"ALTER TABLE {quote(table)} RENAME TO {quote(old_table)}",
+        ]
+        # index names are unique in schema, renaming constraint's index renames constraint too
+        statements += [
+            f"ALTER INDEX {quote(index)} RENAME TO {quote(f'{index[:48]}_unpartitioned')}"
+            for index in indexes
+        ]
+        # LIKE copies columns with NOT NULL, defaults (id sequence) and CHECK constraints
+        statements.append(
+            f"CREATE TABLE {quote(table)} "
+            f"(LIKE {quote(old_table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f'PARTITION BY HASH ("first_friend")'
+        )
+        statements += [
+            f"CREATE TABLE {quote(f'{table}_p{remainder}')} PARTITION OF {quote(table)} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            for remainder in range(partitions)
+        ]
+        # rows are copied before indexes are created, building index at once is faster
+        statements.append(
+            f"INSERT INTO {quote(table)} SELECT * FROM {quote(old_table)}"
+        )
+        # unique constraints of partitioned table have to contain partition key
+        if "id" in columns:
+            statements.append(
+                f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(f'{table}_pkey')} "
+                f'PRIMARY KEY ("id", "first_friend")'
+            )
+        if sequence is not None:
+            # sequence is dropped with old table unless it's owned by the new one
+            statements.append(f'ALTER SEQUENCE {sequence} OWNED BY {quote(table)}."id"')
+        statements += [
+            f'ALTER TABLE {quote(table)} ADD CONSTRAINT "Unique Friendship" '
+            f'UNIQUE ("first_friend", "second_friend")',
+            f'CREATE INDEX "friendship_second_first_idx" '
+            f'ON {quote(table)} ("second_friend", "first_friend")',
+        ]
+        if not keep_old:
+            statements.append(f"DROP TABLE {quote(old_table)}")
+        statements.append(f"ANALYZE {quote(table)}")
+        return statements
@@ -0,0 +1,57 @@
+import asyncio
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+from .routers import primary_reads, track_writes
+
+PIN_COOKIE = "friendship_primary"
+
+
+@sync_and_async_middleware
+def replica_pinning_middleware(get_response):
+    """
+    read-your-writes with read replicas, requests after their first write of friendships and
+    requests of a client for FRIENDSHIP_REPLICA_PIN_SECONDS after its successful write read
+    from primary, the client is pinned by cookie, so it works across processes without shared state,
+    only actual writes pin, not HTTP methods (POST friendship/check and lookup only read),
+    it doesn't block async views (ASGI deployment)
+    """
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            with reads_of(request) as writes:
+                response = await get_response(request)
+            return pin(writes, response)
+
+    else:
+
+        def middleware(request):
+            with reads_of(request) as writes:
+                response = get_response(request)
+            return pin(writes, response)
+
+    return middleware
+
+
+@contextmanager
+def reads_of(request):
+    """
+    yields Writes of the request
+    """
+    pinned = PIN_COOKIE in request.COOKIES
+    with primary_reads() if pinned else nullcontext(), track_writes() as writes:
+        yield writes
+
+
+def pin(writes, response):
+    if writes.written and response.status_code < 400:
+        response.set_cookie(
+            PIN_COOKIE,
+            "1",
+            max_age=settings.FRIENDSHIP_REPLICA_PIN_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
@@ -0,0 +1,21 @@
+# Generated by Django 3.1.3 on 2026-10-18 15:17
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # index is built concurrently, so writes to a big table aren't blocked
+    atomic = False
+
+    dependencies = [
+        ('friendship', '0002_auto_20201119_1912'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='friendship',
+            index=models.Index(fields=['second_friend', 'first_friend'], name='friendship_second_first_idx'),
+        ),
+    ]
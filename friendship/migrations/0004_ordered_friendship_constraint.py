@@ -0,0 +1,55 @@
+# Generated by Django 3.1.3 on 2026-10-18 15:17
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    # every statement commits on its own, so ACCESS EXCLUSIVE lock of ADD CONSTRAINT
+    # is released before VALIDATE CONSTRAINT scans the table
+    atomic = False
+
+    dependencies = [
+        ('friendship', '0003_second_friend_index'),
+    ]
+
+    operations = [
+        # legacy rows would fail validation: self-friendships are removed and pairs
+        # with bigger UID first are moved to (smaller, bigger) in one statement,
+        # a pair which already exists in right order is just removed
+        migrations.RunSQL(
+            sql='''
+                WITH "reversed" AS (
+                    DELETE FROM "friendship_friendship" WHERE "first_friend" >= "second_friend"
+                    RETURNING "first_friend", "second_friend", "created_at"
+                )
+                INSERT INTO "friendship_friendship" ("first_friend", "second_friend", "created_at")
+                SELECT "second_friend", "first_friend", "created_at" FROM "reversed"
+                WHERE "first_friend" > "second_friend"
+                ON CONFLICT ("first_friend", "second_friend") DO NOTHING
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        # constraint is added as NOT VALID and validated separately,
+        # so existing rows are checked without blocking writes to the table
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql='ALTER TABLE "friendship_friendship" ADD CONSTRAINT "Ordered Friendship" '
+                        'CHECK ("first_friend" < "second_friend") NOT VALID',
+                    reverse_sql='ALTER TABLE "friendship_friendship" DROP CONSTRAINT "Ordered Friendship"',
+                ),
+                migrations.RunSQL(
+                    sql='ALTER TABLE "friendship_friendship" VALIDATE CONSTRAINT "Ordered Friendship"',
+                    reverse_sql=migrations.RunSQL.noop,
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='friendship',
+                    constraint=models.CheckConstraint(check=models.Q(first_friend__lt=django.db.models.expressions.F('second_friend')), name='Ordered Friendship'),
+                ),
+            ],
+        ),
+    ]
@@ -1,23 +1,662 @@
+import io
+import time
+from contextlib import nullcontext
+from itertools import islice
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+from .cache import friends_cache
+from .graph import AdjacencyIndex, graph_index
+from .routers import primary_reads, reads_latest, record_write
+
+
+class FriendshipQuerySet(models.QuerySet):
+    def delete(self):
+        """
+        removes selected friendships by both UIDs with bulk_remove_friendships ("Unique Friendship"
+        index, the id index may be dropped by drop_friendship_pk), cached friends lists and
+        graph index are updated
+        """
+        if self.query.is_sliced:
+            raise TypeError("Cannot use 'limit' or 'offset' with delete.")
+
+        db = self._db or router.db_for_write(self.model)
+        pairs = list(self.using(db).values_list("first_friend", "second_friend"))
+        removed = self.model.objects.db_manager(db).bulk_remove_friendships(pairs)
+        return len(removed), {self.model._meta.label: len(removed)}
+
+    delete.alters_data = True
+    delete.queryset_only = True
 
 
-class FriendshipManager(models.Manager):
+class FriendshipManager(models.Manager.from_queryset(FriendshipQuerySet)):
     def find_friends(self, UID):
         """
         returns a list of UIDs who are friends of the user
         to find friends, you have to search both columns,
         this code will create SQL statement
         SELECT second_friend where first_friend = UID
-        UNION
+        UNION ALL
         SELECT first_friend where second_fiend = UID
+        first_friend is always smaller than second_friend ("Ordered Friendship" constraint),
+        so both selects never return the same UID and result doesn't have to be deduplicated
         """
         first = self.values_list("second_friend", flat=True).filter(first_friend=UID)
         second = self.values_list("first_friend", flat=True).filter(second_friend=UID)
-        all_friends = first.union(second)
+        all_friends = first.union(second, all=True)
         return all_friends
 
+    def find_friends_page(self, UID, after, limit):
+        """
+        returns up to limit friends of the user with UID bigger than after, ordered by UID
+        (keyset pagination), limit and order are pushed down to both selects,
+        so every select reads at most limit rows from its index
+        (SELECT second_friend where first_friend = UID AND second_friend > after
+            ORDER BY second_friend LIMIT limit)
+        UNION ALL
+        (SELECT first_friend where second_fiend = UID AND first_friend > after
+            ORDER BY first_friend LIMIT limit)
+        ORDER BY 1 LIMIT limit
+        """
+        graph = self._graph()
+        if graph is not None:
+            return graph.friends_page(UID, after, limit)
+
+        first = (
+            self.values_list("second_friend", flat=True)
+            .filter(first_friend=UID, second_friend__gt=after)
+            .order_by("second_friend")[:limit]
+        )
+        second = (
+            self.values_list("first_friend", flat=True)
+            .filter(second_friend=UID, first_friend__gt=after)
+            .order_by("first_friend")[:limit]
+        )
+        return first.union(second, all=True).order_by("second_friend")[:limit]
+
+    def find_friends_of_many(self, UIDs, limit):
+        """
+        returns dict UID -> list of up to limit friends ordered by UID, for many users in one statement
+        every user is joined (LATERAL) with both selects of find_friends_page,
+        so limit is pushed down to both indexes for every user
+        """
+        UIDs = sorted(set(UIDs))
+        graph = self._graph()
+        if graph is not None:
+            return {UID: graph.friends_page(UID, 0, limit) for UID in UIDs}
+
+        friends = {UID: [] for UID in UIDs}
+        if not UIDs:
+            return friends
+
+        connection = connections[self.db]
+        table = self._table(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT "user"."UID", "neighbour"."friend"
+                FROM unnest(%(UIDs)s::bigint[]) AS "user" ("UID")
+                CROSS JOIN LATERAL (
+                    (
+                        SELECT "second_friend" AS "friend" FROM {table}
+                        WHERE "first_friend" = "user"."UID"
+                        ORDER BY "second_friend"
+                        LIMIT %(limit)s
+                    )
+                    UNION ALL
+                    (
+                        SELECT "first_friend" FROM {table}
+                        WHERE "second_friend" = "user"."UID"
+                        ORDER BY "first_friend"
+                        LIMIT %(limit)s
+                    )
+                    ORDER BY "friend"
+                    LIMIT %(limit)s
+                ) AS "neighbour"
+                """,
+                {"UIDs": UIDs, "limit": limit},
+            )
+            for UID, friend in cursor.fetchall():
+                friends[UID].append(friend)
+        return friends
+
+    def find_neighbours(self, UIDs, limit):
+        """
+        returns up to limit (UID, friend) pairs for all given users, one statement
+        SELECT first_friend, second_friend where first_friend = ANY(UIDs)
+        UNION ALL
+        SELECT second_friend, first_friend where second_friend = ANY(UIDs)
+        LIMIT limit
+        """
+        graph = self._graph()
+        if graph is not None:
+            neighbours = (
+                (UID, friend) for UID in UIDs for friend in graph.friends(UID)
+            )
+            return list(islice(neighbours, limit))
+
+        connection = connections[self.db]
+        table = self._table(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT "first_friend", "second_friend" FROM {table}
+                WHERE "first_friend" = ANY(%(UIDs)s::bigint[])
+                UNION ALL
+                SELECT "second_friend", "first_friend" FROM {table}
+                WHERE "second_friend" = ANY(%(UIDs)s::bigint[])
+                LIMIT %(limit)s
+                """,
+                {"UIDs": list(UIDs), "limit": limit},
+            )
+            return cursor.fetchall()
+
+    def find_path(self, first_UID, second_UID, max_depth, max_frontier, timeout):
+        """
+        returns (path, complete), path is the shortest list of UIDs from first to second user
+        connected by at most max_depth friendships or None if there is no such path,
+        bidirectional BFS, in every step the smaller frontier is expanded with one find_neighbours query
+        search is stopped (complete is False) when one step finds more than max_frontier friends
+        or search takes more than timeout seconds, so users with huge number of friends can't make
+        it run forever
+        """
+        if first_UID == second_UID:
+            return [first_UID], True
+
+        deadline = time.monotonic() + timeout
+        # for both sides: parents and distances of visited users and users to expand
+        parents = ({first_UID: None}, {second_UID: None})
+        distances = ({first_UID: 0}, {second_UID: 0})
+        frontiers = [[first_UID], [second_UID]]
+
+        for _ in range(max_depth):
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            other = 1 - side
+            if not frontiers[side]:
+                return None, True
+            if time.monotonic() > deadline:
+                return None, False
+
+            neighbours = self.find_neighbours(frontiers[side], max_frontier + 1)
+            if len(neighbours) > max_frontier:
+                return None, False
+
+            frontier = []
+            meeting = None
+            for UID, friend in neighbours:
+                if friend in parents[side]:
+                    continue
+                parents[side][friend] = UID
+                distances[side][friend] = distances[side][UID] + 1
+                frontier.append(friend)
+                # all new users have the same distance from this side,
+                # the shortest path goes through the one closest to the other side
+                if friend in parents[other]:
+                    if meeting is None or (
+                        distances[other][friend] < distances[other][meeting]
+                    ):
+                        meeting = friend
+
+            if meeting is not None:
+                path = self._path_to_root(parents[0], meeting)[::-1]
+                path.extend(self._path_to_root(parents[1], meeting)[1:])
+                return path, True
+
+            frontiers[side] = frontier
+
+        return None, True
+
+    @staticmethod
+    def _path_to_root(parents, UID):
+        path = [UID]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        return path
+
+    def find_mutual_friends(self, first_UID, second_UID, after, limit):
+        """
+        returns up to limit common friends of both users with UID bigger than after, ordered by UID,
+        intersection is computed by database in one statement, only result is sent back
+        (friends of first_UID) INTERSECT (friends of second_UID) ORDER BY 1 LIMIT limit
+        """
+        graph = self._graph()
+        if graph is not None:
+            return graph.mutual_friends(first_UID, second_UID, after, limit)
+
+        connection = connections[self.db]
+        table = self._table(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT "friend" FROM (
+                    ({self._friends_sql(table, "%(first_UID)s")})
+                    INTERSECT
+                    ({self._friends_sql(table, "%(second_UID)s")})
+                ) AS "mutual"
+                ORDER BY "friend"
+                LIMIT %(limit)s
+                """,
+                {
+                    "first_UID": first_UID,
+                    "second_UID": second_UID,
+                    "after": after,
+                    "limit": limit,
+                },
+            )
+            return [friend for friend, in cursor.fetchall()]
+
+    def suggest_friends(self, UID, limit, degree_cap):
+        """
+        returns up to limit (UID, number of mutual friends) of friends of friends of the user,
+        who aren't friends of the user yet, ranked by number of mutual friends, one statement
+        only degree_cap friends of the user are expanded and only degree_cap friends are read
+        from every column of every expanded friend, so users with huge number of friends
+        (supernodes) can't blow up the query, existing friendship of every candidate is probed
+        in "Unique Friendship" index (Ordered Friendship, smaller UID first) instead of reading
+        the whole friends list of the user
+        """
+        graph = self._graph()
+        if graph is not None:
+            return graph.suggest_friends(UID, limit, degree_cap)
+
+        connection = connections[self.db]
+        table = self._table(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH "expanded" AS (
+                    SELECT "friend" FROM (
+                        {self._friends_sql(table, "%(UID)s")}
+                    ) AS "friends"
+                    LIMIT %(degree_cap)s
+                ),
+                "candidates" AS (
+                    SELECT "neighbour"."friend" FROM "expanded"
+                    CROSS JOIN LATERAL (
+                        (
+                            SELECT "second_friend" AS "friend" FROM {table}
+                            WHERE "first_friend" = "expanded"."friend"
+                            LIMIT %(degree_cap)s
+                        )
+                        UNION ALL
+                        (
+                            SELECT "first_friend" FROM {table}
+                            WHERE "second_friend" = "expanded"."friend"
+                            LIMIT %(degree_cap)s
+                        )
+                    ) AS "neighbour"
+                ),
+                "ranked" AS (
+                    SELECT "friend", count(*) AS "mutual_friends" FROM "candidates"
+                    WHERE "friend" <> %(UID)s
+                    GROUP BY "friend"
+                )
+                SELECT "friend", "mutual_friends" FROM "ranked"
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {table}
+                    WHERE "first_friend" = LEAST(%(UID)s, "ranked"."friend")
+                        AND "second_friend" = GREATEST(%(UID)s, "ranked"."friend")
+                )
+                ORDER BY "mutual_friends" DESC, "friend"
+                LIMIT %(limit)s
+                """,
+                {"UID": UID, "after": 0, "limit": limit, "degree_cap": degree_cap},
+            )
+            return cursor.fetchall()
+
+    def existing_friendships(self, pairs):
+        """
+        checks many friendships with one statement against "Unique Friendship" index
+        SELECT ... WHERE (first_friend, second_friend) IN (SELECT FROM unnest(firsts, seconds))
+        pairs are normalized (smaller UID first),
+        returns set of pairs which exist
+        """
+        pairs = self._normalize_pairs(pairs)
+        graph = self._graph()
+        if graph is not None:
+            return {pair for pair in pairs if graph.exists(*pair)}
+        if not pairs:
+            return set()
+
+        firsts, seconds = zip(*pairs)
+        connection = connections[self.db]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT "first_friend", "second_friend" FROM {self._table(connection)}
+                WHERE ("first_friend", "second_friend") IN (
+                    SELECT * FROM unnest(%s::bigint[], %s::bigint[])
+                )
+                """,
+                [list(firsts), list(seconds)],
+            )
+            return set(cursor.fetchall())
+
+    def count_friends(self, UID):
+        """
+        returns number of friends of the user without fetching them, one statement
+        SELECT (SELECT count(*) where first_friend = UID) + (SELECT count(*) where second_friend = UID)
+        both counts are answered by index-only scans
+        """
+        graph = self._graph()
+        if graph is not None:
+            return graph.count(UID)
+
+        connection = connections[self.db]
+        table = self._table(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT
+                    (SELECT count(*) FROM {table} WHERE "first_friend" = %s)
+                    + (SELECT count(*) FROM {table} WHERE "second_friend" = %s)
+                """,
+                [UID, UID],
+            )
+            return cursor.fetchone()[0]
+
+    def get_friends_list(self, UID):
+        """
+        returns list of UIDs who are friends of the user, read through friends cache,
+        every write of friendship invalidates cached lists of both users (in all processes
+        only with shared cache backend), when graph index is enabled, list is read from it,
+        requests pinned to primary (replica_pinning_middleware) don't read cached lists
+        """
+        graph = self._graph()
+        if graph is not None:
+            return graph.friends(UID)
+
+        def load():
+            # cached list outlives replication lag, so it's read from primary
+            with primary_reads():
+                return list(self.find_friends(UID))
+
+        if reads_latest():
+            # locmem cache of this process may miss writes of other processes
+            return load()
+        return friends_cache.get_or_set(UID, load)
+
+    def add_friendship(self, first_friend, second_friend):
+        """
+        idempotent create, one statement without IntegrityError for existing friendship
+        INSERT ... VALUES ON CONFLICT (first_friend, second_friend) DO NOTHING RETURNING
+        UIDs are normalized (smaller UID first),
+        returns True if friendship was created, False if it already existed
+        """
+        first_friend, second_friend = self._normalize_pairs(
+            [(first_friend, second_friend)]
+        )[0]
+        connection = connections[self._db_for_write()]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {self._table(connection)}
+                    ("first_friend", "second_friend", "created_at")
+                VALUES (%s, %s, %s)
+                ON CONFLICT ("first_friend", "second_friend") DO NOTHING
+                RETURNING 1
+                """,
+                [first_friend, second_friend, timezone.now()],
+            )
+            created = cursor.fetchone() is not None
+
+        if created:
+            self.friendships_changed(added=[(first_friend, second_friend)])
+        return created
+
+    def bulk_add_friendships(self, pairs):
+        """
+        creates many friendships with one statement
+        INSERT ... SELECT FROM unnest(firsts, seconds) ON CONFLICT DO NOTHING RETURNING
+        pairs are normalized (smaller UID first) and deduplicated before writing,
+        returns set of pairs which were created, pairs which already exist are skipped
+        bulk_create(ignore_conflicts=True) can't be used, it doesn't tell which rows were created
+        """
+        pairs = self._normalize_pairs(pairs)
+        if not pairs:
+            return set()
+
+        firsts, seconds = zip(*pairs)
+        connection = connections[self._db_for_write()]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {self._table(connection)}
+                    ("first_friend", "second_friend", "created_at")
+                SELECT pair.first_friend, pair.second_friend, %s
+                FROM unnest(%s::bigint[], %s::bigint[]) AS pair (first_friend, second_friend)
+                ON CONFLICT ("first_friend", "second_friend") DO NOTHING
+                RETURNING "first_friend", "second_friend"
+                """,
+                [timezone.now(), list(firsts), list(seconds)],
+            )
+            created = set(cursor.fetchall())
+
+        self.friendships_changed(added=created)
+        return created
+
+    def bulk_remove_friendships(self, pairs):
+        """
+        removes many friendships with one statement
+        DELETE ... WHERE (first_friend, second_friend) IN (SELECT FROM unnest(firsts, seconds))
+        pairs are normalized (smaller UID first) and deduplicated before removing,
+        returns set of pairs which were removed
+        """
+        pairs = self._normalize_pairs(pairs)
+        if not pairs:
+            return set()
+
+        firsts, seconds = zip(*pairs)
+        connection = connections[self._db_for_write()]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {self._table(connection)}
+                WHERE ("first_friend", "second_friend") IN (
+                    SELECT * FROM unnest(%s::bigint[], %s::bigint[])
+                )
+                RETURNING "first_friend", "second_friend"
+                """,
+                [list(firsts), list(seconds)],
+            )
+            removed = set(cursor.fetchall())
+
+        self.friendships_changed(removed=removed)
+        return removed
+
+    def remove_all_friendships(self, UID):
+        """
+        removes all friendships of the user with one statement, rows aren't loaded as models
+        DELETE ... WHERE first_friend = UID OR second_friend = UID
+        returns list of UIDs who were friends of the user
+        """
+        connection = connections[self._db_for_write()]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {self._table(connection)}
+                WHERE "first_friend" = %s OR "second_friend" = %s
+                RETURNING CASE WHEN "first_friend" = %s THEN "second_friend" ELSE "first_friend" END
+                """,
+                [UID, UID, UID],
+            )
+            friends = [friend for friend, in cursor.fetchall()]
+
+        self.friendships_changed(removed=[(UID, friend) for friend in friends])
+        return friends
+
+    def friendships_changed(self, added=(), removed=()):
+        """
+        has to be called after friendships were created or removed,
+        it invalidates cached friends lists of all users from given pairs
+        and updates graph index of this process when transaction is committed
+        """
+        added, removed = list(added), list(removed)
+        friends_cache.invalidate(UID for pair in added + removed for UID in pair)
+        if graph_index.enabled and (added or removed):
+            transaction.on_commit(
+                lambda: graph_index.changed(added, removed),
+                using=self._db_for_write(),
+            )
+
+    def adjacency_rows(self, chunk_size):
+        """
+        yields (UID, friend) rows of all friendships in both directions ordered by UID and friend,
+        rows are streamed by server-side cursor in chunks of chunk_size rows
+        """
+        connection = connections[self.db]
+        table = self._table(connection)
+        return self._stream_rows(
+            connection,
+            f"""
+            SELECT "first_friend", "second_friend" FROM {table}
+            UNION ALL
+            SELECT "second_friend", "first_friend" FROM {table}
+            ORDER BY 1, 2
+            """,
+            chunk_size,
+        )
+
+    def friendship_rows(self, chunk_size):
+        """
+        yields (first_friend, second_friend) rows of all friendships ordered by both columns
+        ("Unique Friendship" index order), rows are streamed by server-side cursor in chunks
+        of chunk_size rows
+        """
+        connection = connections[self.db]
+        return self._stream_rows(
+            connection,
+            f"""
+            SELECT "first_friend", "second_friend" FROM {self._table(connection)}
+            ORDER BY "first_friend", "second_friend"
+            """,
+            chunk_size,
+        )
+
+    def friends_rows(self, UID, chunk_size):
+        """
+        yields friends of the user (find_friends), rows are streamed by server-side cursor
+        in chunks of chunk_size rows, behind PgBouncer too (QuerySet.iterator() would fetch
+        all of them at once), database is chosen when it's called
+        """
+        connection = connections[self.db]
+        rows = self._stream_rows(
+            connection,
+            self._friends_sql(self._table(connection), "%(UID)s"),
+            chunk_size,
+            {"UID": UID, "after": 0},
+        )
+        return (friend for friend, in rows)
+
+    @staticmethod
+    def _stream_rows(connection, sql, chunk_size, params=None):
+        # behind PgBouncer (DISABLE_SERVER_SIDE_CURSORS) server connection is assigned only
+        # for transaction, cursor WITH HOLD outside of transaction would be lost with it,
+        # in transaction server-side cursor lives until commit
+        in_transaction = (
+            transaction.atomic(using=connection.alias)
+            if connection.settings_dict.get("DISABLE_SERVER_SIDE_CURSORS")
+            else nullcontext()
+        )
+        with in_transaction, connection.chunked_cursor() as cursor:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def copy_friendships(self, pairs):
+        """
+        creates many friendships with COPY into temporary staging table and one statement
+        INSERT ... SELECT FROM staging ON CONFLICT DO NOTHING, in one transaction
+        pairs have to be normalized (smaller UID first), it's much faster than bulk_add_friendships
+        for big batches, but created pairs aren't returned and caches aren't invalidated,
+        returns number of created friendships
+        """
+        buffer = io.StringIO()
+        buffer.writelines(f"{first}\t{second}\n" for first, second in pairs)
+        buffer.seek(0)
+
+        db = self._db_for_write()
+        connection = connections[db]
+        with transaction.atomic(using=db), connection.cursor() as cursor:
+            # temporary table isn't WAL-logged, it's dropped at the end of transaction
+            cursor.execute("""
+                CREATE TEMPORARY TABLE IF NOT EXISTS "friendship_staging"
+                    ("first_friend" bigint, "second_friend" bigint) ON COMMIT DROP
+                """)
+            cursor.copy_expert(
+                'COPY "friendship_staging" ("first_friend", "second_friend") FROM STDIN',
+                buffer,
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {self._table(connection)}
+                    ("first_friend", "second_friend", "created_at")
+                SELECT "first_friend", "second_friend", %s FROM "friendship_staging"
+                ON CONFLICT ("first_friend", "second_friend") DO NOTHING
+                """,
+                [timezone.now()],
+            )
+            created = cursor.rowcount
+            cursor.execute('TRUNCATE "friendship_staging"')
+        return created
+
+    def build_graph_index(self):
+        """
+        returns new AdjacencyIndex of all friendships, read from primary, later changes
+        are applied to the index after commit
+        """
+        with primary_reads():
+            return AdjacencyIndex.build(
+                self.adjacency_rows(settings.FRIENDSHIP_GRAPH_INDEX_CHUNK_SIZE)
+            )
+
+    def _graph(self):
+        """
+        returns graph index of this process when it's enabled and built, otherwise None and database
+        is queried, index is built from default database, so it isn't used by managers bound to
+        another one, reads pinned to primary skip it, it may miss writes of other processes
+        """
+        if self._db is not None or reads_latest():
+            return None
+        return graph_index.get(self.build_graph_index)
+
+    @staticmethod
+    def _friends_sql(table, UID_sql):
+        """
+        SQL which selects "friend" column with friends of the user with UID bigger than %(after)s,
+        user's UID is given as SQL expression, e.g. parameter placeholder or column
+        """
+        return f"""
+            SELECT "second_friend" AS "friend" FROM {table}
+            WHERE "first_friend" = {UID_sql} AND "second_friend" > %(after)s
+            UNION ALL
+            SELECT "first_friend" FROM {table}
+            WHERE "second_friend" = {UID_sql} AND "first_friend" > %(after)s
+        """
+
+    @staticmethod
+    def _normalize_pairs(pairs):
+        """
+        returns sorted list of unique pairs, in every pair first UID is smaller than second,
+        sorting keeps lock order the same for concurrent batches
+        """
+        return sorted({(min(pair), max(pair)) for pair in pairs})
+
+    def _db_for_write(self):
+        # request which writes reads its own writes and pins the client to primary
+        record_write()
+        return self._db or router.db_for_write(self.model)
+
+    def _table(self, connection):
+        return connection.ops.quote_name(self.model._meta.db_table)
+
 
 class Friendship(models.Model):
     first_friend = models.PositiveBigIntegerField(
@@ -48,6 +687,18 @@ class Friendship(models.Model):
         constraints = [
             models.UniqueConstraint(
                 fields=["first_friend", "second_friend"], name="Unique Friendship"
+            ),
+            models.CheckConstraint(
+                check=models.Q(first_friend__lt=models.F("second_friend")),
+                name="Ordered Friendship",
+            ),
+        ]
+        # index behind "Unique Friendship" serves lookups by first_friend,
+        # this one serves the second branch of find_friends (lookups by second_friend)
+        indexes = [
+            models.Index(
+                fields=["second_friend", "first_friend"],
+                name="friendship_second_first_idx",
             )
         ]
 
@@ -77,6 +728,16 @@ class Friendship(models.Model):
         self.check_order_UIDs()
 
         super().save(*args, **kwargs)
+        Friendship.objects.friendships_changed(
+            added=[(self.first_friend, self.second_friend)]
+        )
+
+    def delete(self, using=None, keep_parents=False):
+        # by both UIDs, the id index may be dropped (drop_friendship_pk)
+        removed = Friendship.objects.db_manager(using).bulk_remove_friendships(
+            [(self.first_friend, self.second_friend)]
+        )
+        return len(removed), {self._meta.label: len(removed)}
 
     def __str__(self):
         return f"Friendship between {self.first_friend} and {self.second_friend}"
@@ -0,0 +1,59 @@
+"""
+JSON responses of views which don't use DRF (fast_views, async_views),
+they are the same as responses of DRF views rendered by rest_framework.renderers.JSONRenderer
+"""
+
+import json
+
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.utils.json import strict_constant
+
+# orjson is optional, it encodes lists of UIDs several times faster than json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# encoder is created once, not for every response
+if orjson is not None:
+    encode = orjson.dumps
+else:
+    # compact separators like rest_framework.renderers.JSONRenderer
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def json_response(data, status_code):
+    return HttpResponse(
+        encode(data), status=status_code, content_type="application/json"
+    )
+
+
+def method_not_allowed(request, allowed):
+    response = json_response(
+        {"detail": f'Method "{request.method}" not allowed.'},
+        status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
+    response["Allow"] = f"{allowed}, OPTIONS"
+    return response
+
+
+def parse_json(request):
+    """
+    returns (data, None) for JSON body or (None, error response) like rest_framework.parsers.JSONParser,
+    empty body is empty data
+    """
+    if not request.body:
+        return {}, None
+    if request.content_type != "application/json":
+        return None, json_response(
+            {"detail": f'Unsupported media type "{request.content_type}" in request.'},
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+    try:
+        # NaN and Infinity are rejected like by JSONParser with STRICT_JSON
+        return json.loads(request.body, parse_constant=strict_constant), None
+    except ValueError as error:
+        return None, json_response(
+            {"detail": f"JSON parse error - {error}"}, status.HTTP_400_BAD_REQUEST
+        )
@@ -0,0 +1,105 @@
+"""
+read replicas (DATABASE_REPLICA_URLS), friendships are read from replicas round-robin,
+writes go to default database (primary)
+
+reads go to primary too when they have to see the latest writes:
+in transaction, after a write in block of track_writes() and for FRIENDSHIP_REPLICA_PIN_SECONDS
+after requests which wrote (friendship.middleware.replica_pinning_middleware), and when result
+outlives replication lag (cached friends lists and graph index, primary_reads())
+"""
+
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_primary = ContextVar("friendship_primary_reads", default=False)
+_writes = ContextVar("friendship_writes", default=None)
+
+
+@contextmanager
+def primary_reads():
+    """
+    reads in the block go to primary
+    """
+    token = _primary.set(True)
+    try:
+        yield
+    finally:
+        _primary.reset(token)
+
+
+class Writes:
+    """
+    records whether friendships were written in block of track_writes(), it's shared by reference,
+    so writes in threads with copied context (database threads of async views) are recorded too
+    """
+
+    def __init__(self):
+        self.written = False
+
+
+@contextmanager
+def track_writes():
+    """
+    yields Writes of the block, reads in the block go to primary after its first write
+    """
+    writes = Writes()
+    token = _writes.set(writes)
+    try:
+        yield writes
+    finally:
+        _writes.reset(token)
+
+
+def record_write():
+    """
+    called by every write of friendships, it's no-op outside of track_writes()
+    """
+    writes = _writes.get()
+    if writes is not None:
+        writes.written = True
+
+
+def _written():
+    writes = _writes.get()
+    return writes is not None and writes.written
+
+
+def reads_latest():
+    """
+    whether reads have to see the latest writes, in primary_reads() or after a write
+    in track_writes(), caches of friendships (friends cache, graph index) are bypassed then
+    """
+    return _primary.get() or _written()
+
+
+class ReplicaRouter:
+    def __init__(self):
+        self.replicas = list(settings.FRIENDSHIP_REPLICAS)
+        self._next = itertools.cycle(self.replicas)
+
+    def db_for_read(self, model, **hints):
+        """
+        other apps (auth, sessions) aren't routed, they use default database
+        """
+        if not self.replicas or model._meta.app_label != "friendship":
+            return None
+        in_transaction = connections[DEFAULT_DB_ALIAS].in_atomic_block
+        if reads_latest() or in_transaction:
+            return DEFAULT_DB_ALIAS
+        return next(self._next)
+
+    def db_for_write(self, model, **hints):
+        """
+        ORM writes (e.g. Friendship.save()) are recorded here, manager writes in _db_for_write
+        """
+        if model._meta.app_label == "friendship":
+            record_write()
+        return DEFAULT_DB_ALIAS
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas are migrated by replication
+        return db not in self.replicas
@@ -1,7 +1,11 @@
+from django.conf import settings
 from rest_framework import serializers
 
 from . import models
 
+# the biggest value of PositiveBigIntegerField
+MAX_UID = 2**63 - 1
+
 
 class UserSerializer(serializers.Serializer):
     uid = serializers.IntegerField(
@@ -13,6 +17,79 @@ class UserSerializer(serializers.Serializer):
     )
 
 
+class LimitSerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_limit(self, value):
+        if value > settings.FRIENDSHIP_PAGE_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Ensure this value is less than or equal to {settings.FRIENDSHIP_PAGE_MAX_SIZE}."
+            )
+        return value
+
+    def validate(self, data):
+        data.setdefault("limit", settings.REST_FRAMEWORK["PAGE_SIZE"])
+        return data
+
+
+class FriendsPageSerializer(LimitSerializer):
+    after = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        error_messages={
+            "invalid": "Ensure UID is any non-negative integer number",
+            "min_value": "Ensure UID is any non-negative integer number",
+        },
+    )
+
+    def validate(self, data):
+        data.setdefault("after", 0)
+        return super().validate(data)
+
+
+class FriendsLookupSerializer(LimitSerializer):
+    uids = serializers.ListField(
+        child=serializers.IntegerField(
+            min_value=1,
+            # UIDs are passed to database as bigint[]
+            max_value=MAX_UID,
+            error_messages={
+                "invalid": "Ensure UID is any non-negative integer number",
+                "min_value": "Ensure UID is any non-negative integer number",
+                "max_value": "Ensure UID is any non-negative integer number",
+            },
+        ),
+        allow_empty=False,
+    )
+
+    def validate_uids(self, value):
+        if len(value) > settings.FRIENDSHIP_LOOKUP_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {settings.FRIENDSHIP_LOOKUP_MAX_SIZE} elements."
+            )
+        return value
+
+    def validate(self, data):
+        # by default every friends list is limited by max page size
+        data.setdefault("limit", settings.FRIENDSHIP_PAGE_MAX_SIZE)
+        return super().validate(data)
+
+
+class PathSerializer(serializers.Serializer):
+    max_depth = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_max_depth(self, value):
+        if value > settings.FRIENDSHIP_PATH_MAX_DEPTH:
+            raise serializers.ValidationError(
+                f"Ensure this value is less than or equal to {settings.FRIENDSHIP_PATH_MAX_DEPTH}."
+            )
+        return value
+
+    def validate(self, data):
+        data.setdefault("max_depth", settings.FRIENDSHIP_PATH_MAX_DEPTH)
+        return data
+
+
 class FriendshipSerializer(serializers.ModelSerializer):
     def validate(self, data):
         if data["first_friend"] == data["second_friend"]:
@@ -47,3 +124,42 @@ class FriendshipSerializer(serializers.ModelSerializer):
                 }
             },
         }
+
+
+def plain_pair(first_friend, second_friend):
+    """
+    fast path of FriendshipSerializer, returns normalized pair for two different integer UIDs,
+    otherwise None, then data have to be validated by FriendshipSerializer (which reports errors)
+    """
+    if type(first_friend) is not int or type(second_friend) is not int:
+        return None
+    if first_friend == second_friend:
+        return None
+    if not 0 < first_friend <= MAX_UID or not 0 < second_friend <= MAX_UID:
+        return None
+    return min(first_friend, second_friend), max(first_friend, second_friend)
+
+
+class FriendshipBulkSerializer(serializers.Serializer):
+    friendships = serializers.ListField(allow_empty=False)
+
+    def validate_friendships(self, value):
+        if len(value) > settings.FRIENDSHIP_BULK_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {settings.FRIENDSHIP_BULK_MAX_SIZE} elements."
+            )
+        return value
+
+    def validate_pairs(self):
+        """
+        validates every pair with FriendshipSerializer rules, invalid pair doesn't reject whole batch,
+        returns list of (validated data, errors) tuples in the same order as in request
+        """
+        pair_serializer = FriendshipSerializer()
+        results = []
+        for pair in self.validated_data["friendships"]:
+            try:
+                results.append((pair_serializer.run_validation(pair), None))
+            except serializers.ValidationError as error:
+                results.append((None, error.detail))
+        return results
@@ -0,0 +1,109 @@
+"""
+compact binary snapshot of all friendships
+
+    header      8 bytes magic b"FRIENDS1", 8 bytes little-endian number of friendships
+    friendships pairs sorted by first and second friend, every pair is two unsigned LEB128 varints:
+                first_friend - previous first_friend, 0 when first friend is the same
+                second_friend - previous second_friend when first friend is the same,
+                otherwise second_friend - first_friend
+
+pairs are normalized (first_friend < second_friend) and sorted, so all deltas are positive and small,
+a friendship takes usually 2 - 4 bytes, file is read through mmap, so it isn't loaded into memory
+"""
+
+import mmap
+import struct
+
+MAGIC = b"FRIENDS1"
+HEADER = struct.Struct("<8sQ")
+# encoded pairs are written to file in blocks of this size
+BLOCK_SIZE = 1 << 20
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def write_snapshot(path, pairs):
+    """
+    writes sorted, normalized (first_friend, second_friend) pairs to snapshot file,
+    returns number of written pairs
+    """
+    count = 0
+    previous_first = previous_second = 0
+    buffer = bytearray()
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, 0))
+        for first, second in pairs:
+            if first == previous_first and second > previous_second:
+                _encode(buffer, 0)
+                _encode(buffer, second - previous_second)
+            elif previous_first < first < second:
+                _encode(buffer, first - previous_first)
+                _encode(buffer, second - first)
+            else:
+                raise SnapshotError(
+                    f"Friendships have to be sorted and normalized, got ({first}, {second}) "
+                    f"after ({previous_first}, {previous_second})"
+                )
+            previous_first, previous_second = first, second
+            count += 1
+            if len(buffer) >= BLOCK_SIZE:
+                file.write(buffer)
+                buffer.clear()
+
+        file.write(buffer)
+        # number of pairs is known at the end, header is rewritten
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, count))
+    return count
+
+
+def read_snapshot(path):
+    """
+    returns (number of pairs, iterator of (first_friend, second_friend) pairs) of snapshot file
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+    if len(header) != HEADER.size or header[: len(MAGIC)] != MAGIC:
+        raise SnapshotError(f"{path} isn't friendship snapshot")
+
+    return HEADER.unpack(header)[1], _read_pairs(path)
+
+
+def _read_pairs(path):
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        count = HEADER.unpack_from(data)[1]
+        position = HEADER.size
+        first = second = 0
+        try:
+            for _ in range(count):
+                delta, position = _decode(data, position)
+                if delta:
+                    first += delta
+                    second = first
+                delta, position = _decode(data, position)
+                second += delta
+                yield first, second
+        except IndexError:
+            raise SnapshotError(f"{path} is truncated")
+
+
+def _encode(buffer, value):
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _decode(data, position):
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
@@ -207,3 +207,22 @@ class AddFriendIfExistsTest(TransactionTestCase):
 
         self.assertEqual(friendship.first_friend, friendship_data["first_friend"])
         self.assertEqual(friendship.second_friend, friendship_data["second_friend"])
+
+    def test_add_friendship_when_already_exists_in_one_query(self):
+        friendship_data = {"first_friend": 6785, "second_friend": 2332515}
+        Friendship.objects.create(**friendship_data)
+
+        factory = APIRequestFactory()
+        friendship_view = FriendshipCreateView.as_view()
+        request = factory.post(
+            reverse("friendship:friendship_create"),
+            json.dumps(friendship_data),
+            content_type="application/json",
+        )
+        with self.assertNumQueries(1):
+            response = friendship_view(request)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content), friendship_data)
+        self.assertEqual(Friendship.objects.count(), 1)
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+from networking.config import Api
+
+# runs in separate process, settings of test process can't be changed to another configuration
+SCRIPT = """
+import json, sys
+import configurations
+
+configurations.setup()
+from django.core.management import call_command
+from django.test import Client
+
+call_command("check")
+response = Client().get("/api/friendship/0")
+print(json.dumps({
+    "status": response.status_code,
+    "content": response.json(),
+    "content_type": response["content-type"],
+    "swagger": "drf_yasg" in sys.modules,
+}))
+"""
+
+
+class ApiConfigTest(SimpleTestCase):
+    def test_minimal_stack(self):
+        for app in ("django.contrib.sessions", "django.contrib.auth", "drf_yasg"):
+            self.assertNotIn(app, Api.INSTALLED_APPS)
+        for middleware in (
+            "SessionMiddleware",
+            "CsrfViewMiddleware",
+            "MessageMiddleware",
+        ):
+            self.assertFalse(any(middleware in name for name in Api.MIDDLEWARE))
+
+    def test_api_serves_friendship_api(self):
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT],
+            env={
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": "networking.config",
+                "DJANGO_CONFIGURATION": "Api",
+            },
+            check=True,
+            capture_output=True,
+        ).stdout
+
+        self.assertEqual(
+            json.loads(output.splitlines()[-1]),
+            {
+                "status": 400,
+                "content": {"uid": ["Ensure UID is any non-negative integer number"]},
+                "content_type": "application/json",
+                "swagger": False,
+            },
+        )
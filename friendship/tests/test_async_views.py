@@ -0,0 +1,150 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import mock
+from asgiref.sync import async_to_sync
+from django.db import connections
+from django.test import AsyncClient, RequestFactory, TransactionTestCase
+from django.urls import resolve, reverse
+from rest_framework import status
+
+from friendship import async_views
+from friendship.cache import friends_cache
+from friendship.models import Friendship
+
+
+class AsyncViewsTest(TransactionTestCase):
+    def setUp(self) -> None:
+        friends_cache.cache.clear()
+        self.factory = RequestFactory()
+
+        # one database thread, so its connection can be closed before test database is dropped
+        executor = ThreadPoolExecutor(max_workers=1)
+        patcher = mock.patch.object(async_views, "_executor", executor)
+        patcher.start()
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(lambda: executor.submit(connections.close_all).result())
+        self.addCleanup(patcher.stop)
+
+        Friendship.objects.bulk_add_friendships([(1, 2), (1, 3), (1, 4), (2, 3)])
+
+    def call(self, view, request, **kwargs):
+        return async_to_sync(view)(request, **kwargs)
+
+    def test_find_friends(self):
+        request = self.factory.get("/api/friendship/1")
+        response = self.call(async_views.find_friends, request, uid=1)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["content-type"], "application/json")
+        self.assertEqual(json.loads(response.content), {"friends": [2, 3, 4]})
+
+    def test_find_friends_page(self):
+        request = self.factory.get("/api/friendship/1", {"after": 2, "limit": 1})
+        response = self.call(async_views.find_friends, request, uid=1)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "friends": [3],
+                "next": "http://testserver/api/friendship/1?after=3&limit=1",
+            },
+        )
+
+    def test_find_friends_with_invalid_UID(self):
+        request = self.factory.get("/api/friendship/0")
+        response = self.call(async_views.find_friends, request, uid=0)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"uid": ["Ensure UID is any non-negative integer number"]},
+        )
+
+    def test_create_friendship(self):
+        request = self.factory.post(
+            "/api/friendship",
+            json.dumps({"first_friend": 7, "second_friend": 5}),
+            content_type="application/json",
+        )
+        response = self.call(async_views.create_friendship, request)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            json.loads(response.content), {"first_friend": 5, "second_friend": 7}
+        )
+        self.assertTrue(
+            Friendship.objects.filter(first_friend=5, second_friend=7).exists()
+        )
+
+    def test_create_friendship_with_invalid_data(self):
+        request = self.factory.post(
+            "/api/friendship",
+            json.dumps({"first_friend": 7, "second_friend": 7}),
+            content_type="application/json",
+        )
+        response = self.call(async_views.create_friendship, request)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"Error": ["Friends UIDs must be different!"]},
+        )
+
+        request = self.factory.post(
+            "/api/friendship", "{", content_type="application/json"
+        )
+        response = self.call(async_views.create_friendship, request)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(
+            json.loads(response.content)["detail"].startswith("JSON parse error")
+        )
+
+        request = self.factory.post(
+            "/api/friendship", "first_friend=1", content_type="text/plain"
+        )
+        response = self.call(async_views.create_friendship, request)
+
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_delete_friendship(self):
+        request = self.factory.delete("/api/friendship/3/1")
+        response = self.call(async_views.delete_friendship, request, uid1=3, uid2=1)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(
+            Friendship.objects.filter(first_friend=1, second_friend=3).exists()
+        )
+
+        # missing friendship isn't an error
+        response = self.call(async_views.delete_friendship, request, uid1=3, uid2=1)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_method_not_allowed(self):
+        request = self.factory.put("/api/friendship/1")
+        response = self.call(async_views.find_friends, request, uid=1)
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(response["Allow"], "GET, OPTIONS")
+
+    def test_async_urls(self):
+        match = resolve("/friendship/1/2", urlconf="friendship.async_urls")
+        self.assertIs(match.func, async_views.delete_friendship)
+
+        # other endpoints are served by the same views as in friendship.urls
+        match = resolve("/friendship/1/count", urlconf="friendship.async_urls")
+        self.assertEqual(match.url_name, "friends_count")
+        self.assertEqual(
+            reverse("find_friends", kwargs={"uid": 1}, urlconf="friendship.async_urls"),
+            "/friendship/1",
+        )
+
+    def test_csrf_exempt(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        with self.settings(ROOT_URLCONF="friendship.async_urls"):
+            response = async_to_sync(client.delete)("/friendship/1/2")
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
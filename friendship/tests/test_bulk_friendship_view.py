@@ -0,0 +1,264 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from friendship.models import Friendship
+from friendship.views import FriendshipBulkView
+
+
+class BulkAddFriendTest(TestCase):
+    def post(self, data):
+        factory = APIRequestFactory()
+        friendship_view = FriendshipBulkView.as_view()
+        request = factory.post(
+            reverse("friendship:friendship_bulk"),
+            json.dumps(data),
+            content_type="application/json",
+        )
+        response = friendship_view(request)
+        response.render()
+        return response
+
+    def test_add_many_friendships(self):
+        friendships = [
+            {"first_friend": 6785, "second_friend": 2332515},
+            {"first_friend": 67285, "second_friend": 23325115},
+        ]
+        response = self.post({"friendships": friendships})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "results": [
+                    {
+                        "first_friend": 6785,
+                        "second_friend": 2332515,
+                        "status": "created",
+                    },
+                    {
+                        "first_friend": 67285,
+                        "second_friend": 23325115,
+                        "status": "created",
+                    },
+                ]
+            },
+        )
+        self.assertEqual(response["content-type"], "application/json")
+        self.assertEqual(Friendship.objects.count(), 2)
+
+    def test_add_many_friendships_with_swapped_and_repeated_UIDs(self):
+        Friendship.objects.create(first_friend=10, second_friend=20)
+        friendships = [
+            {"first_friend": 20, "second_friend": 10},
+            {"first_friend": 40, "second_friend": 30},
+            {"first_friend": 30, "second_friend": 40},
+        ]
+        response = self.post({"friendships": friendships})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "results": [
+                    {"first_friend": 10, "second_friend": 20, "status": "existing"},
+                    {"first_friend": 30, "second_friend": 40, "status": "created"},
+                    {"first_friend": 30, "second_friend": 40, "status": "existing"},
+                ]
+            },
+        )
+        self.assertCountEqual(
+            Friendship.objects.values_list("first_friend", "second_friend"),
+            [(10, 20), (30, 40)],
+        )
+
+    def test_add_many_friendships_with_invalid_pairs(self):
+        friendships = [
+            {"first_friend": -23, "second_friend": 12},
+            {"first_friend": 12, "second_friend": 12},
+            {"first_friend": 12},
+            [12, 13],
+            {"first_friend": 12, "second_friend": 13},
+        ]
+        response = self.post({"friendships": friendships})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "results": [
+                    {
+                        "status": "invalid",
+                        "errors": {
+                            "first_friend": [
+                                "Ensure UID is any non-negative integer number"
+                            ]
+                        },
+                    },
+                    {
+                        "status": "invalid",
+                        "errors": {"Error": ["Friends UIDs must be different!"]},
+                    },
+                    {
+                        "status": "invalid",
+                        "errors": {"second_friend": ["This field is required."]},
+                    },
+                    {
+                        "status": "invalid",
+                        "errors": {
+                            "non_field_errors": [
+                                "Invalid data. Expected a dictionary, but got list."
+                            ]
+                        },
+                    },
+                    {"first_friend": 12, "second_friend": 13, "status": "created"},
+                ]
+            },
+        )
+        self.assertEqual(Friendship.objects.count(), 1)
+
+    def test_add_many_friendships_without_list(self):
+        response = self.post({"friendships": []})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"friendships": ["This list may not be empty."]},
+        )
+
+        response = self.post({"first_friend": 6785, "second_friend": 2332515})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"friendships": ["This field is required."]},
+        )
+
+    @override_settings(FRIENDSHIP_BULK_MAX_SIZE=2)
+    def test_add_too_many_friendships(self):
+        friendships = [{"first_friend": 1, "second_friend": c} for c in range(2, 5)]
+        response = self.post({"friendships": friendships})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"friendships": ["Ensure this field has no more than 2 elements."]},
+        )
+        self.assertEqual(Friendship.objects.count(), 0)
+
+
+class BulkRemoveFriendTest(TestCase):
+    def setUp(self) -> None:
+        Friendship.objects.create(first_friend=10, second_friend=20)
+        Friendship.objects.create(first_friend=10, second_friend=30)
+        Friendship.objects.create(first_friend=20, second_friend=30)
+
+    def delete(self, data):
+        factory = APIRequestFactory()
+        friendship_view = FriendshipBulkView.as_view()
+        request = factory.delete(
+            reverse("friendship:friendship_bulk"),
+            json.dumps(data),
+            content_type="application/json",
+        )
+        response = friendship_view(request)
+        response.render()
+        return response
+
+    def test_remove_many_friendships(self):
+        friendships = [
+            {"first_friend": 20, "second_friend": 10},
+            {"first_friend": 10, "second_friend": 30},
+            {"first_friend": 10, "second_friend": 20},
+            {"first_friend": 10, "second_friend": 40},
+            {"first_friend": 0, "second_friend": 40},
+        ]
+        response = self.delete({"friendships": friendships})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "results": [
+                    {"first_friend": 10, "second_friend": 20, "status": "removed"},
+                    {"first_friend": 10, "second_friend": 30, "status": "removed"},
+                    {"first_friend": 10, "second_friend": 20, "status": "missing"},
+                    {"first_friend": 10, "second_friend": 40, "status": "missing"},
+                    {
+                        "status": "invalid",
+                        "errors": {
+                            "first_friend": [
+                                "Ensure UID is any non-negative integer number"
+                            ]
+                        },
+                    },
+                ]
+            },
+        )
+        self.assertEqual(response["content-type"], "application/json")
+        self.assertCountEqual(
+            Friendship.objects.values_list("first_friend", "second_friend"),
+            [(20, 30)],
+        )
+
+    def test_remove_many_friendships_without_list(self):
+        response = self.delete({"friendships": "10,20"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"friendships": ['Expected a list of items but got type "str".']},
+        )
+        self.assertEqual(Friendship.objects.count(), 3)
+
+
+class BulkAddFriendshipsManagerTest(TestCase):
+    def test_bulk_add_friendships(self):
+        Friendship.objects.create(first_friend=1, second_friend=2)
+
+        created = Friendship.objects.bulk_add_friendships(
+            [(2, 1), (3, 1), (1, 3), (4, 5)]
+        )
+
+        self.assertEqual(created, {(1, 3), (4, 5)})
+        self.assertCountEqual(
+            Friendship.objects.values_list("first_friend", "second_friend"),
+            [(1, 2), (1, 3), (4, 5)],
+        )
+
+    def test_bulk_add_friendships_sets_created_at(self):
+        Friendship.objects.bulk_add_friendships([(1, 2)])
+
+        self.assertIsNotNone(Friendship.objects.get().created_at)
+
+    def test_bulk_add_no_friendships(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(Friendship.objects.bulk_add_friendships([]), set())
+
+
+class BulkRemoveFriendshipsManagerTest(TestCase):
+    def setUp(self) -> None:
+        for c in range(2, 6):
+            Friendship.objects.create(first_friend=1, second_friend=c)
+            Friendship.objects.create(first_friend=c, second_friend=10)
+
+    def test_bulk_remove_friendships(self):
+        with self.assertNumQueries(1):
+            removed = Friendship.objects.bulk_remove_friendships(
+                [(2, 1), (1, 2), (10, 3), (7, 8)]
+            )
+
+        self.assertEqual(removed, {(1, 2), (3, 10)})
+        self.assertEqual(Friendship.objects.count(), 6)
+
+    def test_remove_all_friendships(self):
+        with self.assertNumQueries(1):
+            friends = Friendship.objects.remove_all_friendships(10)
+
+        self.assertCountEqual(friends, [2, 3, 4, 5])
+        self.assertCountEqual(Friendship.objects.find_friends(10), [])
+        self.assertCountEqual(Friendship.objects.find_friends(1), [2, 3, 4, 5])
+        self.assertEqual(Friendship.objects.remove_all_friendships(10), [])
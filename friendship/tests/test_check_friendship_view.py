@@ -0,0 +1,70 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from friendship.models import Friendship
+from friendship.views import FriendshipCheckView
+
+
+class CheckFriendshipTest(TestCase):
+    def setUp(self) -> None:
+        Friendship.objects.create(first_friend=10, second_friend=20)
+        Friendship.objects.create(first_friend=10, second_friend=30)
+
+    def post(self, data):
+        factory = APIRequestFactory()
+        friendship_view = FriendshipCheckView.as_view()
+        request = factory.post(
+            reverse("friendship:friendship_check"),
+            json.dumps(data),
+            content_type="application/json",
+        )
+        response = friendship_view(request)
+        response.render()
+        return response
+
+    def test_check_friendships(self):
+        friendships = [
+            {"first_friend": 20, "second_friend": 10},
+            {"first_friend": 10, "second_friend": 30},
+            {"first_friend": 20, "second_friend": 30},
+            {"first_friend": 10, "second_friend": 10},
+            {"first_friend": 10, "second_friend": 20},
+        ]
+        with self.assertNumQueries(1):
+            response = self.post({"friendships": friendships})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "results": [
+                    {"first_friend": 10, "second_friend": 20, "friends": True},
+                    {"first_friend": 10, "second_friend": 30, "friends": True},
+                    {"first_friend": 20, "second_friend": 30, "friends": False},
+                    {"errors": {"Error": ["Friends UIDs must be different!"]}},
+                    {"first_friend": 10, "second_friend": 20, "friends": True},
+                ]
+            },
+        )
+        self.assertEqual(response["content-type"], "application/json")
+
+    def test_check_friendships_without_list(self):
+        response = self.post({"friendships": []})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"friendships": ["This list may not be empty."]},
+        )
+
+    def test_existing_friendships(self):
+        self.assertEqual(
+            Friendship.objects.existing_friendships([(30, 10), (20, 30), (20, 10)]),
+            {(10, 20), (10, 30)},
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(Friendship.objects.existing_friendships([]), set())
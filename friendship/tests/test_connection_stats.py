@@ -0,0 +1,103 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from friendship.models import Friendship
+
+
+class ConnectionStatsTest(TestCase):
+    def test_postgres_stats(self):
+        out = StringIO()
+        call_command("connection_stats", stdout=out)
+
+        used, databases = out.getvalue().splitlines()
+        self.assertRegex(used, r"^\d+ of \d+ connections used$")
+        self.assertRegex(databases, rf"^{connection.settings_dict['NAME']}: .*1 active")
+
+    @override_settings(POSTGRES_PGBOUNCER=True)
+    def test_pgbouncer_stats(self):
+        name = connection.settings_dict["NAME"]
+        results = {
+            "SHOW DATABASES": (
+                ["name", "pool_size", "current_connections"],
+                [("pgbouncer", 2, 0), (name, 20, 7)],
+            ),
+            "SHOW POOLS": (
+                [
+                    "database",
+                    "user",
+                    "cl_active",
+                    "cl_waiting",
+                    "sv_active",
+                    "sv_idle",
+                    "sv_used",
+                    "maxwait",
+                    "pool_mode",
+                ],
+                [
+                    ("pgbouncer", "pgbouncer", 1, 0, 0, 0, 0, 0, "statement"),
+                    (name, "postgres", 150, 3, 20, 0, 0, 1, "transaction"),
+                ],
+            ),
+        }
+        cursor = mock.MagicMock()
+
+        def execute(sql):
+            columns, rows = results[sql]
+            cursor.description = [(column,) for column in columns]
+            cursor.fetchall.return_value = rows
+
+        cursor.execute.side_effect = execute
+        admin = mock.Mock()
+        admin.cursor.return_value.__enter__ = mock.Mock(return_value=cursor)
+        admin.cursor.return_value.__exit__ = mock.Mock(return_value=False)
+
+        out = StringIO()
+        with mock.patch("psycopg2.connect", return_value=admin) as connect:
+            call_command("connection_stats", stdout=out)
+
+        self.assertEqual(connect.call_args[1]["database"], "pgbouncer")
+        self.assertTrue(admin.autocommit)
+        admin.close.assert_called_once_with()
+        self.assertEqual(
+            out.getvalue().splitlines(),
+            [
+                f"{name}: pool size 20, 7 server connections",
+                f"{name} postgres (transaction): clients 150 active, 3 waiting, "
+                f"servers 20 active, 0 idle, 0 used, max wait 1 s",
+            ],
+        )
+
+
+class PgBouncerCursorTest(TransactionTestCase):
+    """
+    behind PgBouncer friendships are streamed by server-side cursor in transaction
+    """
+
+    def test_stream_friendships(self):
+        Friendship.objects.bulk_add_friendships([(1, 2), (1, 3), (2, 3)])
+        with mock.patch.dict(
+            connection.settings_dict, {"DISABLE_SERVER_SIDE_CURSORS": True}
+        ):
+            rows = Friendship.objects.friendship_rows(chunk_size=2)
+            self.assertEqual(next(rows), (1, 2))
+            self.assertTrue(connection.in_atomic_block)
+            self.assertEqual(list(rows), [(1, 3), (2, 3)])
+
+        self.assertFalse(connection.in_atomic_block)
+
+    def test_stream_friends_of_user(self):
+        # friends export, QuerySet.iterator() would fetch all friends at once
+        Friendship.objects.bulk_add_friendships([(1, 2), (1, 3), (4, 1)])
+        with mock.patch.dict(
+            connection.settings_dict, {"DISABLE_SERVER_SIDE_CURSORS": True}
+        ):
+            friends = Friendship.objects.friends_rows(1, chunk_size=2)
+            self.assertIn(next(friends), [2, 3, 4])
+            self.assertTrue(connection.in_atomic_block)
+            self.assertEqual(len(list(friends)), 2)
+
+        self.assertFalse(connection.in_atomic_block)
@@ -0,0 +1,108 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from friendship.models import Friendship
+
+
+class DropFriendshipPkTest(TestCase):
+    def setUp(self) -> None:
+        Friendship.objects.bulk_add_friendships([(1, c) for c in range(2, 20)])
+
+    def drop(self, **options):
+        out = StringIO()
+        call_command("drop_friendship_pk", stdout=out, **options)
+        return out.getvalue()
+
+    def primary_keys(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT conname FROM pg_constraint WHERE contype = 'p'")
+            return [
+                name for name, in cursor.fetchall() if name.startswith("friendship_")
+            ]
+
+    def replica_identities(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT indrelid::regclass::text FROM pg_index
+                WHERE indisreplident ORDER BY 1
+                """)
+            return [name for name, in cursor.fetchall()]
+
+    def test_drop_friendship_pk(self):
+        out = self.drop()
+
+        self.assertIn("primary key dropped from friendship_friendship", out)
+        self.assertEqual(self.primary_keys(), [])
+        self.assertEqual(self.replica_identities(), ["friendship_friendship"])
+
+        # ids still come from the sequence
+        friendship = Friendship.objects.create(first_friend=1, second_friend=20)
+        self.assertGreater(friendship.id, 18)
+        self.assertFalse(Friendship.objects.add_friendship(1, 20))
+        self.assertEqual(
+            Friendship.objects.bulk_add_friendships([(1, 2), (2, 3)]), {(2, 3)}
+        )
+        self.assertEqual(Friendship.objects.bulk_remove_friendships([(1, 2)]), {(1, 2)})
+        self.assertCountEqual(Friendship.objects.find_friends(1), range(3, 21))
+
+        with self.assertRaisesMessage(CommandError, "has no primary key"):
+            self.drop()
+
+    def test_drop_pk_of_partitioned_table(self):
+        call_command("partition_friendships", partitions=2, stdout=StringIO())
+
+        self.drop()
+
+        self.assertEqual(self.primary_keys(), [])
+        self.assertEqual(
+            self.replica_identities(),
+            ["friendship_friendship_p0", "friendship_friendship_p1"],
+        )
+        self.assertTrue(Friendship.objects.add_friendship(20, 1))
+        self.assertEqual(Friendship.objects.count_friends(1), 19)
+
+    def test_dry_run(self):
+        out = self.drop(dry_run=True)
+
+        self.assertIn(
+            'ALTER TABLE "friendship_friendship" DROP CONSTRAINT "friendship_friendship_pkey";',
+            out,
+        )
+        self.assertEqual(self.primary_keys(), ["friendship_friendship_pkey"])
+
+    def test_model_uses_id(self):
+        self.drop()
+        friendship = Friendship.objects.get(first_friend=1, second_friend=5)
+
+        # ids are unique, so pk based ORM paths change only one friendship
+        friendship.created_at = friendship.created_at.replace(year=2000)
+        Friendship.objects.bulk_update([friendship], ["created_at"])
+        self.assertEqual(Friendship.objects.filter(created_at__year=2000).count(), 1)
+        self.assertEqual(
+            Friendship.objects.in_bulk([friendship.id]), {friendship.id: friendship}
+        )
+
+        friendship.second_friend = 30
+        friendship.save()
+        friendship.refresh_from_db()
+        self.assertEqual(friendship.second_friend, 30)
+
+        friendship.delete()
+        self.assertCountEqual(
+            Friendship.objects.find_friends(1),
+            [c for c in range(2, 20) if c != 5],
+        )
+
+    def test_queryset_delete(self):
+        stale = Friendship.objects.get_friends_list(1)
+
+        deleted = Friendship.objects.filter(
+            first_friend=1, second_friend__lt=5
+        ).delete()
+
+        self.assertEqual(deleted, (3, {"friendship.Friendship": 3}))
+        self.assertEqual(len(stale), 18)
+        self.assertCountEqual(Friendship.objects.get_friends_list(1), range(5, 20))
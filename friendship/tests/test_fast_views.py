@@ -0,0 +1,117 @@
+import json
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from friendship import fast_views
+from friendship.models import Friendship
+from friendship.views import (
+    FindFriendsView,
+    FriendshipCreateView,
+    FriendshipDeleteView,
+)
+
+
+class FastViewsTest(TestCase):
+    """
+    fast views respond the same as DRF views
+    """
+
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+        Friendship.objects.bulk_add_friendships([(1, 2), (1, 3), (1, 4), (2, 3)])
+
+    def assertSameResponse(self, drf_response, fast_response):
+        drf_response.render()
+        self.assertEqual(fast_response.status_code, drf_response.status_code)
+        if drf_response.content:
+            self.assertEqual(fast_response["content-type"], "application/json")
+            self.assertEqual(
+                json.loads(fast_response.content), json.loads(drf_response.content)
+            )
+        else:
+            self.assertEqual(fast_response.content, b"")
+
+    def test_find_friends(self):
+        queries = [
+            "",
+            "?after=2&limit=1",
+            "?after=1",
+            "?limit=3",
+            "?limit=0",
+            "?limit=",
+            "?limit=abc",
+            "?after=-1",
+            "?limit=100000",
+        ]
+        for uid in (1, 0, 5):
+            for query in queries:
+                with self.subTest(uid=uid, query=query):
+                    path = f"/api/friendship/{uid}{query}"
+                    self.assertSameResponse(
+                        FindFriendsView.as_view()(self.factory.get(path), uid=uid),
+                        fast_views.find_friends(self.factory.get(path), uid=uid),
+                    )
+
+    def test_create_friendship(self):
+        bodies = [
+            {"first_friend": 6, "second_friend": 5},
+            {"first_friend": 5, "second_friend": 6},
+            {"first_friend": "7", "second_friend": "8"},
+            {"first_friend": 5, "second_friend": 5},
+            {"first_friend": -1, "second_friend": "A"},
+            {"first_friend": 2**63, "second_friend": 1},
+            {"first_friend": True, "second_friend": 3},
+            {"first_friend": 5},
+            [1, 2],
+            {},
+        ]
+        for body in bodies:
+            with self.subTest(body=body):
+                self.assertSameResponse(
+                    FriendshipCreateView.as_view()(self.post(json.dumps(body))),
+                    fast_views.create_friendship(self.post(json.dumps(body))),
+                )
+
+        self.assertTrue(
+            Friendship.objects.filter(first_friend=7, second_friend=8).exists()
+        )
+
+        for body, content_type in (
+            ("{", "application/json"),
+            ('{"first_friend": NaN}', "application/json"),
+            ("first_friend=1", "text/plain"),
+        ):
+            with self.subTest(body=body):
+                self.assertSameResponse(
+                    FriendshipCreateView.as_view()(self.post(body, content_type)),
+                    fast_views.create_friendship(self.post(body, content_type)),
+                )
+
+    def post(self, body, content_type="application/json"):
+        return self.factory.post("/api/friendship", body, content_type=content_type)
+
+    def test_delete_friendship(self):
+        for uid1, uid2 in ((1, 5), (2, 2), (0, 1), (3, 1)):
+            with self.subTest(uid1=uid1, uid2=uid2):
+                request = self.factory.delete(f"/api/friendship/{uid1}/{uid2}")
+                drf_response = FriendshipDeleteView.as_view()(
+                    request, uid1=uid1, uid2=uid2
+                )
+                # friendship removed by DRF view is removed again by fast view
+                Friendship.objects.bulk_add_friendships([(1, 3)])
+                self.assertSameResponse(
+                    drf_response,
+                    fast_views.delete_friendship(request, uid1=uid1, uid2=uid2),
+                )
+
+        self.assertFalse(
+            Friendship.objects.filter(first_friend=1, second_friend=3).exists()
+        )
+
+    def test_method_not_allowed(self):
+        request = self.factory.put("/api/friendship/1/2")
+        self.assertSameResponse(
+            FriendshipDeleteView.as_view()(request, uid1=1, uid2=2),
+            fast_views.delete_friendship(request, uid1=1, uid2=2),
+        )
@@ -1,7 +1,7 @@
 import json
 
-from django.db import IntegrityError
-from django.test import TransactionTestCase
+from django.db import IntegrityError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
 from django.urls.exceptions import NoReverseMatch
 from rest_framework import status
@@ -83,3 +83,98 @@ class FindFriendsTest(TransactionTestCase):
         factory = APIRequestFactory()
         with self.assertRaises(NoReverseMatch):
             request = factory.get(reverse("friendship:find_friends", args=(-15,)))
+
+
+class FindFriendsQueryPlanTest(TestCase):
+    def setUp(self) -> None:
+        for c in range(2555, 2705, 10):
+            Friendship.objects.create(first_friend=15, second_friend=c)
+            Friendship.objects.create(first_friend=10, second_friend=c)
+
+    def explain(self, queryset):
+        # table is tiny, without this planner always prefers sequential scan,
+        # with it sequential scan is chosen only if no index matches the query
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def test_find_friends_uses_indexes_on_both_branches(self):
+        plan = self.explain(Friendship.objects.find_friends(2555))
+
+        self.assertNotIn("Seq Scan", plan)
+        self.assertIn("Unique Friendship", plan)
+        self.assertIn("friendship_second_first_idx", plan)
+
+
+class FindFriendsPageTest(TestCase):
+    def setUp(self) -> None:
+        # friends of 2600 are in both columns
+        for c in range(2555, 2705, 10):
+            Friendship.objects.create(first_friend=2600, second_friend=c)
+
+    def get(self, uid, query):
+        factory = APIRequestFactory()
+        friendship_view = FindFriendsView.as_view()
+        request = factory.get(
+            reverse("friendship:find_friends", args=(uid,)), query, format="json"
+        )
+        response = friendship_view(request, uid=uid)
+        response.render()
+        return response
+
+    def test_find_friends_pages(self):
+        response = self.get(2600, {"limit": 6})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = json.loads(response.content)
+        self.assertEqual(content["friends"], [2555, 2565, 2575, 2585, 2595, 2605])
+        self.assertEqual(
+            content["next"],
+            "http://testserver/api/friendship/2600?after=2605&limit=6",
+        )
+        self.assertEqual(response["content-type"], "application/json")
+
+        response = self.get(2600, {"limit": 6, "after": 2605})
+
+        content = json.loads(response.content)
+        self.assertEqual(content["friends"], [2615, 2625, 2635, 2645, 2655, 2665])
+
+        response = self.get(2600, {"limit": 6, "after": 2665})
+
+        self.assertEqual(
+            json.loads(response.content),
+            {"friends": [2675, 2685, 2695], "next": None},
+        )
+
+    @override_settings(REST_FRAMEWORK={"PAGE_SIZE": 2})
+    def test_find_friends_page_with_default_limit(self):
+        response = self.get(2600, {"after": 2600})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)["friends"], [2605, 2615])
+
+    def test_find_friends_page_reads_only_limit_rows_per_branch(self):
+        with self.assertNumQueries(1) as queries:
+            self.get(2600, {"limit": 3})
+
+        self.assertEqual(queries.captured_queries[0]["sql"].count("LIMIT 3"), 3)
+
+    def test_find_friends_page_with_invalid_parameters(self):
+        response = self.get(2600, {"limit": 0, "after": -1})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "after": ["Ensure UID is any non-negative integer number"],
+                "limit": ["Ensure this value is greater than or equal to 1."],
+            },
+        )
+
+        response = self.get(2600, {"limit": 1001})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"limit": ["Ensure this value is less than or equal to 1000."]},
+        )
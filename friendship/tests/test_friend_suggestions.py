@@ -0,0 +1,106 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from friendship.models import Friendship
+from friendship.views import FriendSuggestionsView
+
+
+class FriendSuggestionsTest(TestCase):
+    def setUp(self) -> None:
+        # friends of 1 are 2, 3 and 4
+        # 5 is friend of 2, 3 and 4, 6 is friend of 2 and 3, 7 is friend of 4,
+        # 3 is friend of 2, but 3 is already friend of 1
+        Friendship.objects.bulk_add_friendships(
+            [(1, 2), (1, 3), (1, 4), (2, 5), (3, 5), (4, 5), (2, 6), (3, 6), (4, 7)]
+        )
+        Friendship.objects.bulk_add_friendships([(2, 3), (7, 8)])
+
+    def get(self, uid, query=None):
+        factory = APIRequestFactory()
+        friendship_view = FriendSuggestionsView.as_view()
+        request = factory.get(
+            reverse("friendship:friend_suggestions", args=(uid,)), query
+        )
+        response = friendship_view(request, uid=uid)
+        response.render()
+        return response
+
+    def test_suggest_friends(self):
+        response = self.get(1)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "suggestions": [
+                    {"uid": 5, "mutual_friends": 3},
+                    {"uid": 6, "mutual_friends": 2},
+                    {"uid": 7, "mutual_friends": 1},
+                ]
+            },
+        )
+        self.assertEqual(response["content-type"], "application/json")
+
+    def test_suggest_friends_with_limit(self):
+        response = self.get(1, {"limit": 2})
+
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "suggestions": [
+                    {"uid": 5, "mutual_friends": 3},
+                    {"uid": 6, "mutual_friends": 2},
+                ]
+            },
+        )
+
+    def test_suggest_friends_for_user_without_friends(self):
+        response = self.get(252154152)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {"suggestions": []})
+
+    def test_suggest_friends_with_invalid_parameters(self):
+        response = self.get(1, {"limit": 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"limit": ["Ensure this value is greater than or equal to 1."]},
+        )
+
+        factory = APIRequestFactory()
+        friendship_view = FriendSuggestionsView.as_view()
+        request = factory.get("api/friendship/-1/suggestions")
+        response = friendship_view(request, uid=-1)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"uid": ["Ensure UID is any non-negative integer number"]},
+        )
+
+    def test_suggest_friends_in_one_query(self):
+        with self.assertNumQueries(1):
+            suggestions = Friendship.objects.suggest_friends(7, 10, 1000)
+
+        self.assertEqual(suggestions, [(1, 1), (5, 1)])
+
+    def test_suggest_friends_with_degree_cap(self):
+        # 200 is supernode, only degree_cap of its friends are read
+        Friendship.objects.bulk_add_friendships(
+            [(100, 200)] + [(200, c) for c in range(300, 310)]
+        )
+
+        self.assertEqual(len(Friendship.objects.suggest_friends(100, 100, 1000)), 10)
+
+        suggestions = Friendship.objects.suggest_friends(100, 100, 3)
+        self.assertEqual(len(suggestions), 3)
+        for friend, mutual_friends in suggestions:
+            self.assertIn(friend, range(300, 310))
+            self.assertEqual(mutual_friends, 1)
@@ -0,0 +1,114 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from friendship.cache import friends_cache
+from friendship.models import Friendship
+from friendship.routers import primary_reads, track_writes
+from friendship.views import FindFriendsView, FriendshipDeleteView
+
+
+class FriendsCacheTest(TestCase):
+    def setUp(self) -> None:
+        friends_cache.cache.clear()
+        friends_cache.reset_stats()
+        for c in range(20, 25):
+            Friendship.objects.create(first_friend=15, second_friend=c)
+
+    def test_get_friends_list_reads_through_cache(self):
+        with self.assertNumQueries(1):
+            self.assertCountEqual(
+                Friendship.objects.get_friends_list(15), [20, 21, 22, 23, 24]
+            )
+        with self.assertNumQueries(0):
+            self.assertCountEqual(
+                Friendship.objects.get_friends_list(15), [20, 21, 22, 23, 24]
+            )
+
+        self.assertEqual(friends_cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_user_without_friends_is_cached(self):
+        self.assertEqual(Friendship.objects.get_friends_list(252154152), [])
+        with self.assertNumQueries(0):
+            self.assertEqual(Friendship.objects.get_friends_list(252154152), [])
+
+    def test_save_invalidates_both_users(self):
+        Friendship.objects.get_friends_list(15)
+        Friendship.objects.get_friends_list(30)
+        Friendship.objects.get_friends_list(20)
+
+        Friendship.objects.create(first_friend=30, second_friend=15)
+
+        self.assertIn(30, Friendship.objects.get_friends_list(15))
+        self.assertEqual(Friendship.objects.get_friends_list(30), [15])
+        with self.assertNumQueries(0):
+            Friendship.objects.get_friends_list(20)
+
+    def test_delete_invalidates_both_users(self):
+        Friendship.objects.get_friends_list(15)
+        Friendship.objects.get_friends_list(20)
+
+        Friendship.objects.get(first_friend=15, second_friend=20).delete()
+
+        self.assertNotIn(20, Friendship.objects.get_friends_list(15))
+        self.assertEqual(Friendship.objects.get_friends_list(20), [])
+
+    def test_manager_writes_invalidate_users(self):
+        Friendship.objects.get_friends_list(15)
+        Friendship.objects.get_friends_list(40)
+
+        Friendship.objects.add_friendship(40, 15)
+        self.assertIn(40, Friendship.objects.get_friends_list(15))
+        self.assertEqual(Friendship.objects.get_friends_list(40), [15])
+
+        Friendship.objects.bulk_remove_friendships([(15, 40)])
+        self.assertNotIn(40, Friendship.objects.get_friends_list(15))
+        self.assertEqual(Friendship.objects.get_friends_list(40), [])
+
+        Friendship.objects.bulk_add_friendships([(15, 40)])
+        self.assertIn(40, Friendship.objects.get_friends_list(15))
+        self.assertEqual(Friendship.objects.get_friends_list(40), [15])
+
+        Friendship.objects.remove_all_friendships(15)
+        self.assertEqual(Friendship.objects.get_friends_list(15), [])
+        self.assertEqual(Friendship.objects.get_friends_list(40), [])
+        self.assertEqual(Friendship.objects.get_friends_list(20), [])
+
+    def test_views_invalidate_users(self):
+        factory = APIRequestFactory()
+        request = factory.get(reverse("friendship:find_friends", args=(15,)))
+        response = FindFriendsView.as_view()(request, uid=15)
+        response.render()
+        self.assertCountEqual(
+            json.loads(response.content)["friends"], [20, 21, 22, 23, 24]
+        )
+
+        request = factory.delete(
+            reverse("friendship:friendship_delete", args=(20, 15)),
+            content_type="application/json",
+        )
+        response = FriendshipDeleteView.as_view()(request, uid1=20, uid2=15)
+        response.render()
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        request = factory.get(reverse("friendship:find_friends", args=(15,)))
+        response = FindFriendsView.as_view()(request, uid=15)
+        response.render()
+        self.assertCountEqual(json.loads(response.content)["friends"], [21, 22, 23, 24])
+
+    def test_pinned_reads_bypass_cache(self):
+        # cached list of this process may miss writes of other processes
+        friends_cache.cache.set(friends_cache.key(15), [20])
+
+        with primary_reads(), self.assertNumQueries(1):
+            self.assertCountEqual(
+                Friendship.objects.get_friends_list(15), [20, 21, 22, 23, 24]
+            )
+        with track_writes() as writes:
+            writes.written = True
+            self.assertEqual(len(Friendship.objects.get_friends_list(15)), 5)
+
+        self.assertEqual(Friendship.objects.get_friends_list(15), [20])
@@ -0,0 +1,58 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from friendship.models import Friendship
+from friendship.views import FriendsCountView
+
+
+class FriendsCountTest(TestCase):
+    def setUp(self) -> None:
+        # friends of 2600 are in both columns
+        for c in range(2555, 2705, 10):
+            Friendship.objects.create(first_friend=2600, second_friend=c)
+
+    def get(self, uid):
+        factory = APIRequestFactory()
+        friendship_view = FriendsCountView.as_view()
+        request = factory.get(reverse("friendship:friends_count", args=(uid,)))
+        response = friendship_view(request, uid=uid)
+        response.render()
+        return response
+
+    def test_count_friends(self):
+        response = self.get(2600)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {"count": 15})
+        self.assertEqual(response["content-type"], "application/json")
+
+        response = self.get(2555)
+
+        self.assertEqual(json.loads(response.content), {"count": 1})
+
+    def test_count_friends_for_non_existing_UID(self):
+        response = self.get(252154152)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {"count": 0})
+
+    def test_count_friends_with_negative_UID_hard_code(self):
+        factory = APIRequestFactory()
+        friendship_view = FriendsCountView.as_view()
+        request = factory.get("api/friendship/-15/count")
+        response = friendship_view(request, uid=-15)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"uid": ["Ensure UID is any non-negative integer number"]},
+        )
+
+    def test_count_friends_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(Friendship.objects.count_friends(2600), 15)
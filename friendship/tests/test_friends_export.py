@@ -0,0 +1,62 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from friendship.models import Friendship
+from friendship.views import FriendsExportView, stream_friends
+
+
+class FriendsExportTest(TestCase):
+    def setUp(self) -> None:
+        for c in range(2555, 2705, 10):
+            Friendship.objects.create(first_friend=2600, second_friend=c)
+
+    def get(self, uid):
+        factory = APIRequestFactory()
+        friendship_view = FriendsExportView.as_view()
+        request = factory.get(reverse("friendship:friends_export", args=(uid,)))
+        return friendship_view(request, uid=uid)
+
+    @override_settings(FRIENDSHIP_EXPORT_CHUNK_SIZE=4)
+    def test_export_friends(self):
+        response = self.get(2600)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["content-type"], "application/json")
+
+        content = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(list(content), ["friends"])
+        self.assertCountEqual(
+            content["friends"], [c for c in range(2555, 2705, 10) if c != 2600]
+        )
+
+    def test_export_friends_for_non_existing_UID(self):
+        response = self.get(252154152)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(b"".join(response.streaming_content)), {"friends": []}
+        )
+
+    def test_export_friends_with_negative_UID_hard_code(self):
+        factory = APIRequestFactory()
+        friendship_view = FriendsExportView.as_view()
+        request = factory.get("api/friendship/-15/export")
+        response = friendship_view(request, uid=-15)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"uid": ["Ensure UID is any non-negative integer number"]},
+        )
+
+    def test_stream_friends_in_chunks(self):
+        parts = list(stream_friends(iter(range(1, 8)), 3))
+
+        self.assertEqual(parts, ['{"friends": [', "1, 2, 3", ", 4, 5, 6", ", 7", "]}"])
+        self.assertEqual(json.loads("".join(parts)), {"friends": list(range(1, 8))})
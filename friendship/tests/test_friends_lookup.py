@@ -0,0 +1,90 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from friendship.models import Friendship
+from friendship.views import FriendsLookupView
+
+
+class FriendsLookupTest(TestCase):
+    def setUp(self) -> None:
+        # friends of 2600 are in both columns
+        for c in range(2555, 2705, 10):
+            Friendship.objects.create(first_friend=2600, second_friend=c)
+        Friendship.objects.create(first_friend=10, second_friend=2555)
+
+    def post(self, data):
+        factory = APIRequestFactory()
+        friendship_view = FriendsLookupView.as_view()
+        request = factory.post(
+            reverse("friendship:friends_lookup"),
+            json.dumps(data),
+            content_type="application/json",
+        )
+        response = friendship_view(request)
+        response.render()
+        return response
+
+    def test_lookup_friends(self):
+        with self.assertNumQueries(1):
+            response = self.post({"uids": [2600, 2555, 10, 252154152, 10]})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "friends": {
+                    "10": [2555],
+                    "2555": [10, 2600],
+                    "2600": [c for c in range(2555, 2705, 10) if c != 2600],
+                    "252154152": [],
+                }
+            },
+        )
+        self.assertEqual(response["content-type"], "application/json")
+
+    def test_lookup_friends_with_limit(self):
+        response = self.post({"uids": [2600, 2555], "limit": 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {"friends": {"2555": [10, 2600], "2600": [2555, 2565, 2575]}},
+        )
+
+    def test_lookup_friends_with_invalid_UIDs(self):
+        response = self.post({"uids": [2600, -1, "a"], "limit": 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "uids": {
+                    "1": ["Ensure UID is any non-negative integer number"],
+                    "2": ["Ensure UID is any non-negative integer number"],
+                },
+                "limit": ["Ensure this value is greater than or equal to 1."],
+            },
+        )
+
+    def test_lookup_friends_with_too_big_UID(self):
+        response = self.post({"uids": [2600, 2**63 - 1, 2**70]})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"uids": {"2": ["Ensure UID is any non-negative integer number"]}},
+        )
+
+    @override_settings(FRIENDSHIP_LOOKUP_MAX_SIZE=2)
+    def test_lookup_friends_of_too_many_UIDs(self):
+        response = self.post({"uids": [1, 2, 3]})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"uids": ["Ensure this field has no more than 2 elements."]},
+        )
@@ -132,9 +132,31 @@ class FriendManagerTest(TransactionTestCase):
         self.assertFalse(Friendship.objects.find_friends(1240))
 
     def test_find_friends(self):
+        # friendship of 15 with itself is rejected by "Ordered Friendship" constraint
         self.assertCountEqual(
-            [x for x in range(10, 20)], Friendship.objects.find_friends(15)
+            [x for x in range(10, 20) if x != 15], Friendship.objects.find_friends(15)
         )
         self.assertCountEqual(
             [x for x in range(5, 17, 2)], Friendship.objects.find_friends(10)
         )
+
+    def test_should_not_create_friendship_with_the_same_ids_in_db(self):
+        with self.assertRaises(IntegrityError):
+            Friendship.objects.create(first_friend=1240, second_friend=1240)
+
+    def test_should_not_store_friendship_with_unordered_ids_in_db(self):
+        with self.assertRaises(IntegrityError):
+            Friendship.objects.bulk_create(
+                [Friendship(first_friend=1250, second_friend=1240)]
+            )
+
+    def test_add_friendship(self):
+        self.assertTrue(Friendship.objects.add_friendship(1240, 1250))
+        self.assertCountEqual([1250], Friendship.objects.find_friends(1240))
+
+    def test_add_friendship_if_friendship_exist(self):
+        self.assertFalse(Friendship.objects.add_friendship(15, 10))
+        self.assertFalse(Friendship.objects.add_friendship(19, 15))
+        self.assertEqual(
+            Friendship.objects.filter(first_friend=10, second_friend=15).count(), 1
+        )
@@ -0,0 +1,113 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from friendship.models import Friendship
+from friendship.views import FriendshipPathView
+
+
+class FriendshipPathTest(TestCase):
+    def setUp(self) -> None:
+        # chain 1 - 2 - 3 - 4 - 5 - 6 - 7 with shortcut 3 - 10 - 6, 3 has many friends,
+        # 20 - 21 aren't connected with the chain
+        Friendship.objects.bulk_add_friendships(
+            [(1, 2), (2, 3), (3, 4), (4, 5), (5, 6), (6, 7), (3, 10), (10, 6)]
+        )
+        Friendship.objects.bulk_add_friendships([(3, c) for c in range(100, 120)])
+        Friendship.objects.bulk_add_friendships([(20, 21)])
+
+    def get(self, uid1, uid2, query=None):
+        factory = APIRequestFactory()
+        friendship_view = FriendshipPathView.as_view()
+        request = factory.get(
+            reverse("friendship:friendship_path", args=(uid1, uid2)), query
+        )
+        response = friendship_view(request, uid1=uid1, uid2=uid2)
+        response.render()
+        return response
+
+    def test_find_path(self):
+        response = self.get(1, 7)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {"path": [1, 2, 3, 10, 6, 7], "degrees": 5, "complete": True},
+        )
+        self.assertEqual(response["content-type"], "application/json")
+
+        response = self.get(7, 2)
+
+        self.assertEqual(
+            json.loads(response.content),
+            {"path": [7, 6, 10, 3, 2], "degrees": 4, "complete": True},
+        )
+
+    def test_find_path_between_friends(self):
+        response = self.get(5, 4)
+
+        self.assertEqual(
+            json.loads(response.content),
+            {"path": [5, 4], "degrees": 1, "complete": True},
+        )
+
+    def test_find_path_longer_than_max_depth(self):
+        response = self.get(1, 7, {"max_depth": 4})
+
+        self.assertEqual(
+            json.loads(response.content),
+            {"path": None, "degrees": None, "complete": True},
+        )
+
+    def test_find_path_between_not_connected_users(self):
+        response = self.get(1, 21)
+
+        self.assertEqual(
+            json.loads(response.content),
+            {"path": None, "degrees": None, "complete": True},
+        )
+
+    @override_settings(FRIENDSHIP_PATH_MAX_FRONTIER=10)
+    def test_find_path_stopped_by_frontier_limit(self):
+        response = self.get(1, 7)
+
+        self.assertEqual(
+            json.loads(response.content),
+            {"path": None, "degrees": None, "complete": False},
+        )
+
+    @override_settings(FRIENDSHIP_PATH_TIMEOUT=-1)
+    def test_find_path_stopped_by_timeout(self):
+        response = self.get(1, 7)
+
+        self.assertEqual(
+            json.loads(response.content),
+            {"path": None, "degrees": None, "complete": False},
+        )
+
+    def test_find_path_with_one_query_per_expanded_frontier(self):
+        with self.assertNumQueries(4):
+            path, complete = Friendship.objects.find_path(1, 5, 6, 1000, 10)
+
+        self.assertEqual(path, [1, 2, 3, 4, 5])
+        self.assertTrue(complete)
+
+    def test_find_path_with_invalid_parameters(self):
+        response = self.get(1, 1)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"Error": ["Friends UIDs must be different!"]},
+        )
+
+        response = self.get(1, 7, {"max_depth": 7})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"max_depth": ["Ensure this value is less than or equal to 6."]},
+        )
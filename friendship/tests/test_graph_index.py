@@ -0,0 +1,215 @@
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from friendship.cache import friends_cache
+from friendship.graph import AdjacencyIndex, graph_index
+from friendship.models import Friendship
+from friendship.routers import primary_reads
+
+
+class AdjacencyIndexTest(TestCase):
+    def setUp(self) -> None:
+        self.index = AdjacencyIndex.from_pairs(
+            [(1, 2), (3, 1), (1, 4), (2, 3), (2, 5), (4, 5), (5, 6), (2, 1)]
+        )
+
+    def test_friends(self):
+        self.assertEqual(self.index.friends(1), [2, 3, 4])
+        self.assertEqual(self.index.friends(5), [2, 4, 6])
+        self.assertEqual(self.index.friends(7), [])
+        self.assertEqual(self.index.friends_page(2, 1, 2), [3, 5])
+        self.assertEqual(self.index.count(2), 3)
+        self.assertTrue(self.index.exists(3, 2))
+        self.assertFalse(self.index.exists(1, 5))
+
+    def test_mutual_friends_and_suggestions(self):
+        self.assertEqual(self.index.mutual_friends(1, 5, 0, 10), [2, 4])
+        self.assertEqual(self.index.mutual_friends(1, 5, 2, 10), [4])
+        self.assertEqual(self.index.suggest_friends(1, 10, 1000), [(5, 2)])
+        self.assertEqual(self.index.suggest_friends(6, 10, 1000), [(2, 1), (4, 1)])
+
+    def test_overlay(self):
+        self.index.apply(added=[(1, 5), (7, 1)], removed=[(2, 1)])
+        self.index.apply(added=[(1, 5)], removed=[(1, 2), (8, 9)])
+
+        self.assertEqual(self.index.friends(1), [3, 4, 5, 7])
+        self.assertEqual(self.index.friends(7), [1])
+        self.assertEqual(self.index.friends(2), [3, 5])
+        self.assertEqual(self.index.friends_page(1, 3, 2), [4, 5])
+        self.assertEqual(self.index.count(1), 4)
+        self.assertEqual(self.index.count(2), 2)
+        self.assertFalse(self.index.exists(1, 2))
+        self.assertTrue(self.index.exists(5, 1))
+
+        # reverting changes clears overlay
+        self.index.apply(added=[(1, 2)], removed=[(1, 5), (1, 7)])
+
+        self.assertEqual(self.index.friends(1), [2, 3, 4])
+        self.assertEqual(self.index.stats()["overlay_users"], 0)
+
+    def test_stats(self):
+        self.assertEqual(
+            self.index.stats(),
+            {
+                "users": 6,
+                "friendships": 7,
+                # 4 bytes for every UID in nodes and neighbours, 8 bytes for every offset
+                "bytes": 6 * 4 + 7 * 8 + 14 * 4,
+                "bytes_per_friendship": round((6 * 4 + 7 * 8 + 14 * 4) / 7, 2),
+                "overlay_users": 0,
+            },
+        )
+
+    def test_big_UIDs(self):
+        index = AdjacencyIndex.from_pairs([(1, 2**40), (2, 2**40)])
+
+        self.assertEqual(index.neighbours.itemsize, 8)
+        self.assertEqual(index.nodes.itemsize, 8)
+        self.assertEqual(index.friends(2**40), [1, 2])
+        self.assertEqual(index.friends(1), [2**40])
+
+
+@override_settings(FRIENDSHIP_GRAPH_INDEX_ENABLED=True)
+class GraphIndexReadPathsTest(TestCase):
+    def setUp(self) -> None:
+        graph_index.reset()
+        self.addCleanup(graph_index.reset)
+        Friendship.objects.bulk_add_friendships([(1, c) for c in range(2, 12)])
+        Friendship.objects.bulk_add_friendships([(c, c + 1) for c in range(2, 20)])
+        Friendship.objects.bulk_add_friendships([(20, c) for c in range(21, 30)])
+        # data of the test transaction isn't visible to background thread
+        graph_index.build(Friendship.objects.build_graph_index)
+
+    def test_read_paths_match_database(self):
+        with self.settings(FRIENDSHIP_GRAPH_INDEX_ENABLED=False):
+            expected = self.read_all()
+
+        self.assertEqual(self.read_all(), expected)
+
+    def test_index_is_built_once(self):
+        Friendship.objects.get_friends_list(1)
+
+        with self.assertNumQueries(0):
+            self.read_all()
+
+    def test_manager_for_other_database_reads_database(self):
+        with self.assertNumQueries(1):
+            Friendship.objects.db_manager("default").count_friends(1)
+
+    def test_pinned_reads_skip_index(self):
+        with primary_reads(), self.assertNumQueries(1):
+            self.assertEqual(Friendship.objects.count_friends(20), 10)
+
+    def read_all(self):
+        manager = Friendship.objects
+        return [
+            sorted(manager.get_friends_list(1)),
+            list(manager.find_friends_page(1, 4, 3)),
+            manager.find_friends_of_many([1, 20, 100], 5),
+            sorted(manager.find_neighbours([1, 20], 100)),
+            manager.find_path(29, 12, 6, 1000, 10),
+            manager.find_mutual_friends(1, 5, 0, 10),
+            manager.suggest_friends(1, 5, 1000),
+            manager.existing_friendships([(2, 1), (1, 20), (21, 20)]),
+            manager.count_friends(20),
+        ]
+
+
+@override_settings(FRIENDSHIP_GRAPH_INDEX_ENABLED=True)
+class GraphIndexChangesTest(TransactionTestCase):
+    def setUp(self) -> None:
+        graph_index.reset()
+        self.addCleanup(graph_index.reset)
+        Friendship.objects.bulk_add_friendships([(1, 2), (1, 3)])
+        graph_index.build(Friendship.objects.build_graph_index)
+
+    def test_writes_update_index_after_commit(self):
+        Friendship.objects.add_friendship(4, 1)
+        Friendship.objects.bulk_remove_friendships([(1, 2)])
+        Friendship.objects.create(first_friend=5, second_friend=4)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Friendship.objects.get_friends_list(1), [3, 4])
+            self.assertEqual(Friendship.objects.get_friends_list(4), [1, 5])
+            self.assertEqual(Friendship.objects.get_friends_list(2), [])
+
+        Friendship.objects.remove_all_friendships(4)
+        Friendship.objects.get(first_friend=1, second_friend=3).delete()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Friendship.objects.get_friends_list(1), [])
+            self.assertEqual(Friendship.objects.get_friends_list(5), [])
+
+    def test_rolled_back_writes_dont_change_index(self):
+        try:
+            with transaction.atomic():
+                Friendship.objects.add_friendship(1, 4)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        self.assertEqual(Friendship.objects.get_friends_list(1), [2, 3])
+
+
+@override_settings(FRIENDSHIP_GRAPH_INDEX_ENABLED=True)
+class GraphIndexBackgroundBuildTest(TransactionTestCase):
+    def setUp(self) -> None:
+        graph_index.reset()
+        friends_cache.cache.clear()
+        self.addCleanup(graph_index.reset)
+        Friendship.objects.bulk_add_friendships([(1, 2), (1, 3)])
+
+    def test_database_is_read_until_index_is_built(self):
+        built = threading.Event()
+        build_graph_index = Friendship.objects.build_graph_index
+
+        def load():
+            built.wait(5)
+            return build_graph_index()
+
+        with mock.patch.object(Friendship.objects, "build_graph_index", new=load):
+            with self.assertNumQueries(1):
+                self.assertEqual(Friendship.objects.get_friends_list(1), [2, 3])
+            builder = graph_index._builder
+            # build is started only once
+            Friendship.objects.add_friendship(1, 4)
+            self.assertEqual(Friendship.objects.get_friends_list(1), [2, 3, 4])
+            self.assertIs(graph_index._builder, builder)
+
+            built.set()
+            builder.join()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Friendship.objects.get_friends_list(1), [2, 3, 4])
+
+    def test_warm(self):
+        graph_index.warm(Friendship.objects.build_graph_index).join()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Friendship.objects.count_friends(1), 2)
+
+    def test_rebuild_after_ttl(self):
+        graph_index.warm(Friendship.objects.build_graph_index).join()
+        # changes of other processes aren't applied to the index
+        Friendship.objects.bulk_create([Friendship(first_friend=1, second_friend=4)])
+
+        with self.settings(FRIENDSHIP_GRAPH_INDEX_TTL=0):
+            self.assertEqual(Friendship.objects.get_friends_list(1), [2, 3])
+            graph_index._builder.join()
+
+        self.assertEqual(Friendship.objects.get_friends_list(1), [2, 3, 4])
+
+
+class BuildGraphIndexCommandTest(TestCase):
+    def test_build_graph_index(self):
+        Friendship.objects.bulk_add_friendships([(1, 2), (1, 3), (2, 3)])
+        out = StringIO()
+
+        call_command("build_graph_index", stdout=out)
+
+        self.assertIn("3 users, 3 friendships", out.getvalue())
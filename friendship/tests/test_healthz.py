@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+
+from friendship.cache import friends_cache
+
+
+class HealthzTest(TestCase):
+    def setUp(self) -> None:
+        friends_cache.cache.clear()
+        friends_cache.reset_stats()
+        self.addCleanup(friends_cache.reset_stats)
+
+    def test_healthz(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/healthz")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"status": "ok", "friends_cache": {"hits": 0, "misses": 0}},
+        )
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    @override_settings(HEALTHZ_DATABASE=False)
+    def test_healthz_without_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get("/healthz")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_friends_cache_stats(self):
+        self.client.get("/api/friendship/1")
+        self.client.get("/api/friendship/1")
+
+        response = self.client.get("/healthz")
+
+        self.assertEqual(response.json()["friends_cache"], {"hits": 1, "misses": 1})
+
+    def test_database_unavailable(self):
+        with mock.patch(
+            "django.db.backends.utils.CursorWrapper.execute",
+            side_effect=OperationalError("connection refused"),
+        ):
+            response = self.client.get("/healthz")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"status": "database unavailable"})
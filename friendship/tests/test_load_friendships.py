@@ -0,0 +1,181 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+
+import mock
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from friendship.cache import FriendsCache, friends_cache
+from friendship.management.commands.load_friendships import Command
+from friendship.models import Friendship
+
+
+class LoadFriendshipsTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "friendships.csv")
+        self.rejects = os.path.join(directory.name, "rejects.csv")
+
+    def write(self, rows):
+        with open(self.path, "w", newline="") as file:
+            csv.writer(file).writerows(rows)
+
+    def load(self, **options):
+        out = StringIO()
+        call_command(
+            "load_friendships", self.path, stdout=out, stderr=StringIO(), **options
+        )
+        return out.getvalue()
+
+    def friendships(self):
+        return list(
+            Friendship.objects.order_by("first_friend", "second_friend").values_list(
+                "first_friend", "second_friend"
+            )
+        )
+
+    def test_load_friendships(self):
+        Friendship.objects.create(first_friend=1, second_friend=2)
+        self.write(
+            [
+                ["first_friend", "second_friend"],
+                [1, 2],
+                [3, 1],
+                [1, 3],
+                [" 4 ", "5.0"],
+                [7, 7],
+                [-1, 8],
+                ["abc", 8],
+                [1, 2, 3],
+                [],
+                [2**63, 1],
+                [2**63 - 1, 1],
+            ]
+        )
+
+        out = self.load(skip_header=True, rejects=self.rejects, chunk_size=4)
+
+        self.assertIn("loaded 5 friendships from", out)
+        self.assertIn("3 created, 2 existing or repeated, 5 rejected", out)
+        self.assertEqual(self.friendships(), [(1, 2), (1, 3), (1, 2**63 - 1), (4, 5)])
+        self.assertFalse(os.path.exists(f"{self.path}.checkpoint"))
+
+        with open(self.rejects, newline="") as file:
+            rejects = list(csv.reader(file))
+        self.assertEqual(
+            rejects,
+            [
+                ["6", "7,7", '{"Error": ["Friends UIDs must be different!"]}'],
+                [
+                    "7",
+                    "-1,8",
+                    '{"first_friend": ["Ensure UID is any non-negative integer number"]}',
+                ],
+                [
+                    "8",
+                    "abc,8",
+                    '{"first_friend": ["Ensure UID is any non-negative integer number"]}',
+                ],
+                ["9", "1,2,3", '{"Error": ["Expected 2 columns"]}'],
+                [
+                    "11",
+                    f"{2 ** 63},1",
+                    '{"first_friend": ["Ensure this value is less than or equal to 9223372036854775807."]}',
+                ],
+            ],
+        )
+
+    def test_resume_loading(self):
+        self.write([[1, c] for c in range(2, 12)])
+        copy_friendships = Friendship.objects.copy_friendships
+
+        def crash_on_third_chunk(pairs):
+            if pairs[0] == (1, 6):
+                raise RuntimeError("connection lost")
+            return copy_friendships(pairs)
+
+        with mock.patch.object(
+            Friendship.objects, "copy_friendships", side_effect=crash_on_third_chunk
+        ):
+            with self.assertRaises(RuntimeError):
+                self.load(chunk_size=2)
+
+        self.assertEqual(self.friendships(), [(1, c) for c in range(2, 6)])
+        self.assertTrue(os.path.exists(f"{self.path}.checkpoint"))
+
+        out = self.load(chunk_size=2)
+
+        self.assertIn("resuming after line 4", out)
+        # totals include chunks loaded before crash
+        self.assertIn("loaded 10 friendships", out)
+        self.assertIn("10 created", out)
+        self.assertEqual(self.friendships(), [(1, c) for c in range(2, 12)])
+        self.assertFalse(os.path.exists(f"{self.path}.checkpoint"))
+
+    def test_resume_after_rejects_were_written(self):
+        self.write([[1, 2], [3, 3], [1, 4], [5, 5], [1, 6], [7, 7]])
+        write_checkpoint = Command.write_checkpoint
+        checkpoints = []
+
+        def crash_on_second_checkpoint(path, progress):
+            checkpoints.append(progress)
+            if len(checkpoints) == 2:
+                raise RuntimeError("killed")
+            write_checkpoint(path, progress)
+
+        with mock.patch.object(
+            Command, "write_checkpoint", side_effect=crash_on_second_checkpoint
+        ):
+            with self.assertRaises(RuntimeError):
+                self.load(chunk_size=2, rejects=self.rejects)
+
+        self.load(chunk_size=2, rejects=self.rejects)
+
+        with open(self.rejects, newline="") as file:
+            self.assertEqual(
+                [row[:2] for row in csv.reader(file)],
+                [["2", "3,3"], ["4", "5,5"], ["6", "7,7"]],
+            )
+
+    def test_restart_truncates_rejects(self):
+        self.write([[1, 2], [3, 3]])
+        self.load(rejects=self.rejects)
+
+        self.load(rejects=self.rejects, restart=True)
+
+        with open(self.rejects, newline="") as file:
+            self.assertEqual([row[:2] for row in csv.reader(file)], [["2", "3,3"]])
+
+    def test_cache_of_servers(self):
+        self.write([[1, 2]])
+        friends_cache.get_or_set(1, lambda: [])
+        err = StringIO()
+
+        call_command("load_friendships", self.path, stdout=StringIO(), stderr=err)
+
+        # locmem cache of other processes can't be cleared
+        self.assertIn("restart them", err.getvalue())
+        with mock.patch.object(FriendsCache, "shared", new=True):
+            call_command("load_friendships", self.path, stdout=StringIO(), stderr=err)
+        self.assertEqual(friends_cache.get_or_set(1, lambda: [2]), [2])
+
+    def test_checkpoint_of_other_file(self):
+        self.write([[1, 2], [1, 3]])
+        with open(f"{self.path}.checkpoint", "w") as file:
+            file.write(
+                '{"offset": 4, "line": 1, "loaded": 1, "rejected": 0, "created": 1, "size": 100}'
+            )
+
+        with self.assertRaisesMessage(CommandError, "was made for another file"):
+            self.load()
+
+        self.load(restart=True)
+
+        self.assertEqual(self.friendships(), [(1, 2), (1, 3)])
+
+    def test_load_missing_file(self):
+        with self.assertRaises(CommandError):
+            self.load()
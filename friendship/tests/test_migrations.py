@@ -0,0 +1,36 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class OrderedFriendshipMigrationTest(TransactionTestCase):
+    """
+    0004 normalizes legacy rows before "Ordered Friendship" constraint is validated
+    """
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(target)
+
+    def tearDown(self):
+        self.migrate(
+            MigrationExecutor(connection).loader.graph.leaf_nodes("friendship")
+        )
+
+    def test_legacy_rows(self):
+        self.migrate([("friendship", "0003_second_friend_index")])
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO "friendship_friendship" ("first_friend", "second_friend", "created_at")
+                VALUES (1, 2, now()), (2, 1, now()), (5, 3, now()), (4, 4, now())
+                """)
+
+        self.migrate([("friendship", "0004_ordered_friendship_constraint")])
+
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT "first_friend", "second_friend" FROM "friendship_friendship"
+                ORDER BY 1, 2
+                """)
+            self.assertEqual(cursor.fetchall(), [(1, 2), (3, 5)])
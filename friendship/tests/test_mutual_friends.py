@@ -0,0 +1,115 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from friendship.models import Friendship
+from friendship.views import MutualFriendsView
+
+
+class MutualFriendsTest(TestCase):
+    def setUp(self) -> None:
+        # common friends are in both columns, 100 and 200 are friends too
+        for c in range(50, 300, 10):
+            if c != 100:
+                Friendship.objects.create(first_friend=100, second_friend=c)
+        for c in range(50, 300, 20):
+            Friendship.objects.create(first_friend=c, second_friend=200)
+        Friendship.objects.create(first_friend=200, second_friend=1000)
+
+    def get(self, uid1, uid2, query=None):
+        factory = APIRequestFactory()
+        friendship_view = MutualFriendsView.as_view()
+        request = factory.get(
+            reverse("friendship:mutual_friends", args=(uid1, uid2)), query
+        )
+        response = friendship_view(request, uid1=uid1, uid2=uid2)
+        response.render()
+        return response
+
+    def test_find_mutual_friends(self):
+        response = self.get(200, 100, {"limit": 100})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "friends": [
+                    50,
+                    70,
+                    90,
+                    110,
+                    130,
+                    150,
+                    170,
+                    190,
+                    210,
+                    230,
+                    250,
+                    270,
+                    290,
+                ],
+                "next": None,
+            },
+        )
+        self.assertEqual(response["content-type"], "application/json")
+
+    def test_find_mutual_friends_pages(self):
+        response = self.get(100, 200, {"limit": 5})
+
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "friends": [50, 70, 90, 110, 130],
+                "next": "http://testserver/api/friendship/100/200/mutual?after=130&limit=5",
+            },
+        )
+
+        response = self.get(100, 200, {"limit": 5, "after": 250})
+
+        self.assertEqual(
+            json.loads(response.content), {"friends": [270, 290], "next": None}
+        )
+
+    def test_find_mutual_friends_without_common_friends(self):
+        response = self.get(100, 5000)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {"friends": [], "next": None})
+
+    def test_find_mutual_friends_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                Friendship.objects.find_mutual_friends(100, 200, 0, 3), [50, 70, 90]
+            )
+
+    def test_find_mutual_friends_with_invalid_UIDs(self):
+        response = self.get(100, 100)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"Error": ["Friends UIDs must be different!"]},
+        )
+
+        factory = APIRequestFactory()
+        friendship_view = MutualFriendsView.as_view()
+        request = factory.get("api/friendship/-100/200/mutual")
+        response = friendship_view(request, uid1=-100, uid2=200)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"first_friend": ["Ensure UID is any non-negative integer number"]},
+        )
+
+    def test_find_mutual_friends_with_invalid_page(self):
+        response = self.get(100, 200, {"limit": "a"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content), {"limit": ["A valid integer is required."]}
+        )
@@ -0,0 +1,90 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+
+from friendship.models import Friendship
+
+
+class PartitionFriendshipsTest(TestCase):
+    def setUp(self) -> None:
+        Friendship.objects.bulk_add_friendships([(1, c) for c in range(2, 40)])
+        Friendship.objects.bulk_add_friendships([(c, 100) for c in range(40, 60)])
+
+    def partition(self, **options):
+        out = StringIO()
+        call_command("partition_friendships", stdout=out, **options)
+        return out.getvalue()
+
+    def partitions(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT inhrelid::regclass::text FROM pg_inherits
+                WHERE inhparent = 'friendship_friendship'::regclass ORDER BY 1
+                """)
+            return [name for name, in cursor.fetchall()]
+
+    def test_partition_friendships(self):
+        out = self.partition(partitions=4)
+
+        self.assertIn("friendship_friendship partitioned into 4 partitions", out)
+        self.assertEqual(
+            self.partitions(),
+            [f"friendship_friendship_p{remainder}" for remainder in range(4)],
+        )
+        self.assertEqual(Friendship.objects.count(), 58)
+        self.assertCountEqual(Friendship.objects.find_friends(1), range(2, 40))
+        self.assertCountEqual(Friendship.objects.find_friends(100), range(40, 60))
+
+        # ids continue from the same sequence, "Unique Friendship" is kept
+        Friendship.objects.create(first_friend=200, second_friend=201)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id FROM friendship_friendship WHERE first_friend = 200"
+            )
+            self.assertGreater(cursor.fetchone()[0], 58)
+        self.assertFalse(Friendship.objects.add_friendship(2, 1))
+        self.assertTrue(Friendship.objects.add_friendship(3, 2))
+        self.assertEqual(
+            Friendship.objects.bulk_add_friendships([(1, 2), (1, 40)]), {(1, 40)}
+        )
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            Friendship.objects.bulk_create(
+                [Friendship(first_friend=1, second_friend=2)]
+            )
+        # "Ordered Friendship" is kept
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            Friendship.objects.bulk_create(
+                [Friendship(first_friend=5, second_friend=4)]
+            )
+
+    def test_first_friend_branch_reads_one_partition(self):
+        self.partition(partitions=4)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "EXPLAIN SELECT second_friend FROM friendship_friendship WHERE first_friend = 1"
+            )
+            plan = "\n".join(line for line, in cursor.fetchall())
+
+        self.assertEqual(plan.count("friendship_friendship_p"), 1, plan)
+
+    def test_keep_old_table(self):
+        self.partition(partitions=2, keep_old=True)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM friendship_friendship_unpartitioned")
+            self.assertEqual(cursor.fetchone()[0], 58)
+
+    def test_dry_run(self):
+        out = self.partition(partitions=2, dry_run=True)
+
+        self.assertIn('PARTITION BY HASH ("first_friend")', out)
+        self.assertEqual(self.partitions(), [])
+
+    def test_partition_partitioned_table(self):
+        self.partition(partitions=2)
+
+        with self.assertRaisesMessage(CommandError, "is already partitioned"):
+            self.partition(partitions=2)
@@ -9,7 +9,7 @@ from rest_framework import status
 from rest_framework.test import APIRequestFactory
 
 from friendship.models import Friendship
-from friendship.views import FriendshipDeleteView
+from friendship.views import FriendshipDeleteView, FriendshipRemoveAllView
 
 
 class RemoveFriendTest(TestCase):
@@ -151,10 +151,9 @@ class RemoveFriendTest(TestCase):
         self.assertEqual(response["content-type"], "application/json")
 
     @mock.patch("friendship.models.Friendship.objects")
-    def test_remove_friendship_if_db_return_many_objects(self, mock_friendships):
-        # should not happened because first_friend and second_friend have unique constraint
-        mock_friendships.get.side_effect = Friendship.MultipleObjectsReturned()
-        mock_friendships.filter.return_value.delete.return_value = 1
+    def test_remove_friendship_without_existence_check(self, mock_friendships):
+        # existence check would read a replica, which can lag behind the primary
+        mock_friendships.bulk_remove_friendships.return_value = {(126785, 32523325151)}
 
         friendship_data = {"first_friend": 126785, "second_friend": 32523325151}
         factory = APIRequestFactory()
@@ -176,5 +175,60 @@ class RemoveFriendTest(TestCase):
         )
         response.render()
 
-        self.assertTrue(mock_friendships.filter.return_value.delete.called)
+        mock_friendships.bulk_remove_friendships.assert_called_once_with(
+            [(126785, 32523325151)]
+        )
+        self.assertFalse(mock_friendships.get.called)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class RemoveAllFriendsTest(TestCase):
+    def setUp(self) -> None:
+        for c in range(2555, 2705, 10):
+            Friendship.objects.create(first_friend=15, second_friend=c)
+        Friendship.objects.create(first_friend=10, second_friend=15)
+        Friendship.objects.create(first_friend=10, second_friend=2555)
+
+    def test_remove_all_friendships(self):
+        factory = APIRequestFactory()
+        friendship_view = FriendshipRemoveAllView.as_view()
+        request = factory.delete(
+            reverse("friendship:friendship_remove_all", args=(15,)),
+            content_type="application/json",
+        )
+        response = friendship_view(request, uid=15)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertCountEqual(Friendship.objects.find_friends(15), [])
+        self.assertCountEqual(Friendship.objects.find_friends(10), [2555])
+
+    def test_remove_all_friendships_of_user_without_friends(self):
+        factory = APIRequestFactory()
+        friendship_view = FriendshipRemoveAllView.as_view()
+        request = factory.delete(
+            reverse("friendship:friendship_remove_all", args=(252154152,)),
+            content_type="application/json",
+        )
+        response = friendship_view(request, uid=252154152)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Friendship.objects.count(), 17)
+
+    def test_remove_all_friendships_with_negative_UID_hard_code(self):
+        factory = APIRequestFactory()
+        friendship_view = FriendshipRemoveAllView.as_view()
+        request = factory.delete(
+            "api/friendship/-15/all",
+            content_type="application/json",
+        )
+        response = friendship_view(request, uid=-15)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"uid": ["Ensure UID is any non-negative integer number"]},
+        )
+        self.assertEqual(Friendship.objects.count(), 17)
@@ -0,0 +1,236 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from friendship import routers
+from friendship.async_views import run_in_db_thread
+from friendship.middleware import PIN_COOKIE, replica_pinning_middleware
+from friendship.models import Friendship
+from friendship.routers import ReplicaRouter, primary_reads, record_write, track_writes
+
+
+@override_settings(FRIENDSHIP_REPLICAS=["replica1", "replica2"])
+class ReplicaRouterTest(SimpleTestCase):
+    def test_reads_round_robin(self):
+        replica_router = ReplicaRouter()
+
+        self.assertEqual(
+            [replica_router.db_for_read(Friendship) for _ in range(4)],
+            ["replica1", "replica2", "replica1", "replica2"],
+        )
+        self.assertEqual(replica_router.db_for_write(Friendship), "default")
+
+    def test_primary_reads(self):
+        replica_router = ReplicaRouter()
+
+        with primary_reads():
+            self.assertEqual(replica_router.db_for_read(Friendship), "default")
+        self.assertEqual(replica_router.db_for_read(Friendship), "replica1")
+
+    def test_other_apps(self):
+        self.assertIsNone(ReplicaRouter().db_for_read(User))
+
+    def test_migrate(self):
+        replica_router = ReplicaRouter()
+
+        self.assertTrue(replica_router.allow_migrate("default", "friendship"))
+        self.assertFalse(replica_router.allow_migrate("replica1", "friendship"))
+
+    def test_reads_after_write(self):
+        replica_router = ReplicaRouter()
+
+        with track_writes() as writes:
+            self.assertEqual(replica_router.db_for_read(Friendship), "replica1")
+            replica_router.db_for_write(Friendship)
+            self.assertTrue(writes.written)
+            self.assertEqual(replica_router.db_for_read(Friendship), "default")
+        self.assertEqual(replica_router.db_for_read(Friendship), "replica2")
+
+    @override_settings(FRIENDSHIP_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertIsNone(ReplicaRouter().db_for_read(Friendship))
+
+
+@override_settings(FRIENDSHIP_REPLICAS=["replica1"])
+class ReplicaRouterTransactionTest(TestCase):
+    def test_reads_in_transaction(self):
+        # TestCase runs every test in transaction
+        self.assertEqual(ReplicaRouter().db_for_read(Friendship), "default")
+
+    def test_cached_friends_list_from_primary(self):
+        reads = []
+
+        class RecordingRouter:
+            def db_for_read(self, model, **hints):
+                reads.append(routers._primary.get())
+
+        Friendship.objects.bulk_add_friendships([(1, 2)])
+        with mock.patch.object(router, "routers", [RecordingRouter()]):
+            self.assertEqual(Friendship.objects.get_friends_list(1), [2])
+            list(Friendship.objects.find_friends(1))
+
+        self.assertEqual(reads, [True, False])
+
+
+@override_settings(FRIENDSHIP_REPLICAS=["replica1"], FRIENDSHIP_REPLICA_PIN_SECONDS=10)
+class ReplicaPinningMiddlewareTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+
+    def reads(self, request, status=200, write=False):
+        """
+        returns databases of reads before and after write of the view and response
+        """
+        reads = []
+
+        def view(request):
+            reads.append(ReplicaRouter().db_for_read(Friendship))
+            if write:
+                record_write()
+                reads.append(ReplicaRouter().db_for_read(Friendship))
+            return HttpResponse(status=status)
+
+        response = replica_pinning_middleware(view)(request)
+        return reads, response
+
+    def test_read(self):
+        reads, response = self.reads(self.factory.get("/api/friendship/1"))
+
+        self.assertEqual(reads, ["replica1"])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_read_only_post(self):
+        reads, response = self.reads(self.factory.post("/api/friendship/check"))
+
+        self.assertEqual(reads, ["replica1"])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_write_pins_client(self):
+        reads, response = self.reads(
+            self.factory.post("/api/friendship"), 201, write=True
+        )
+
+        self.assertEqual(reads, ["replica1", "default"])
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 10)
+
+        request = self.factory.get("/api/friendship/1")
+        request.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+        reads, response = self.reads(request)
+
+        self.assertEqual(reads, ["default"])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_failed_write(self):
+        reads, response = self.reads(
+            self.factory.delete("/api/friendship/0/1"), 400, write=True
+        )
+
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_async(self):
+        reads = []
+
+        async def view(request):
+            reads.append(ReplicaRouter().db_for_read(Friendship))
+            # write in database thread is seen by the request
+            await run_in_db_thread(record_write)
+            reads.append(ReplicaRouter().db_for_read(Friendship))
+            return HttpResponse(status=201)
+
+        response = async_to_sync(replica_pinning_middleware(view))(
+            self.factory.post("/api/friendship")
+        )
+
+        self.assertEqual(reads, ["replica1", "default"])
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+
+@override_settings(
+    FRIENDSHIP_REPLICAS=["replica1"],
+    MIDDLEWARE=[
+        *settings.MIDDLEWARE,
+        "friendship.middleware.replica_pinning_middleware",
+    ],
+)
+class ReplicaPinningViewsTest(TestCase):
+    """
+    only requests which write friendships pin the client, not every POST
+    """
+
+    def setUp(self) -> None:
+        Friendship.objects.bulk_add_friendships([(1, 2), (1, 3)])
+
+    def request(self, method, path, data=None, **extra):
+        """
+        returns response and list of reads of the request (True for reads from primary),
+        streamed response is consumed
+        """
+        reads = []
+
+        class RecordingRouter:
+            def db_for_read(self, model, **hints):
+                reads.append(routers._primary.get() or routers._written())
+
+        with mock.patch.object(router, "routers", [RecordingRouter()]):
+            response = getattr(self.client, method)(
+                path, data, content_type="application/json", **extra
+            )
+            if response.streaming:
+                response.streamed = b"".join(response.streaming_content)
+        return response, reads
+
+    def post(self, name, data):
+        """
+        returns response and whether reads of the request went to primary
+        """
+        response, reads = self.request("post", reverse(f"friendship:{name}"), data)
+        return response, any(reads)
+
+    def test_check(self):
+        response, primary = self.post(
+            "friendship_check",
+            {"friendships": [{"first_friend": 1, "second_friend": 2}]},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(primary)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_lookup(self):
+        response, primary = self.post("friends_lookup", {"uids": [1, 2]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(primary)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_create(self):
+        response, _ = self.post(
+            "friendship_create", {"first_friend": 4, "second_friend": 1}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_delete_without_read(self):
+        # existence check on a lagging replica could miss just created friendship
+        response, reads = self.request("delete", "/api/friendship/2/1")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(reads, [])
+        self.assertFalse(Friendship.objects.filter(second_friend=2).exists())
+
+    def test_export_of_pinned_client(self):
+        self.client.cookies[PIN_COOKIE] = "1"
+
+        response, reads = self.request("get", "/api/friendship/1/export")
+
+        self.assertEqual(json.loads(response.streamed), {"friends": [2, 3]})
+        # response is streamed after the middleware, database is chosen by the view
+        self.assertEqual(reads, [True])
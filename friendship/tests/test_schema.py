@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+from networking import schema
+
+
+class SchemaTest(SimpleTestCase):
+    def setUp(self) -> None:
+        schema.schema.cache_clear()
+        schema.document.cache_clear()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_schema_is_generated_once(self):
+        with mock.patch.object(
+            OpenAPISchemaGenerator,
+            "get_schema",
+            autospec=True,
+            side_effect=OpenAPISchemaGenerator.get_schema,
+        ) as get_schema:
+            for path in ("/", "/swagger.json", "/swagger.yaml", "/redoc/", "/"):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200, path)
+
+        self.assertEqual(get_schema.call_count, 1)
+
+    def test_document(self):
+        response = self.client.get("/swagger.json")
+
+        self.assertEqual(response["content-type"], "application/json")
+        self.assertIn("/friendship/{uid}", response.json()["paths"])
+        self.assertEqual(response["Cache-Control"], "public, no-cache")
+
+        etag = response["ETag"]
+        response = self.client.get("/swagger.json", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.get("/swagger.yaml", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        response = self.client.post("/swagger.json")
+
+        self.assertEqual(response.status_code, 405)
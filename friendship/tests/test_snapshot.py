@@ -0,0 +1,119 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from friendship.cache import FriendsCache, friends_cache
+from friendship.models import Friendship
+from friendship.snapshot import HEADER, SnapshotError, read_snapshot, write_snapshot
+
+
+class SnapshotTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "friendships.bin")
+
+    def test_write_and_read_snapshot(self):
+        pairs = [(1, 2), (1, 300), (1, 2**40), (5, 6), (200, 100000)]
+
+        self.assertEqual(write_snapshot(self.path, pairs), 5)
+        count, read_pairs = read_snapshot(self.path)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(list(read_pairs), pairs)
+        # deltas are encoded as varints of 1 + 1, 1 + 2, 1 + 6, 1 + 1, 2 + 3 bytes
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 19)
+
+    def test_write_empty_snapshot(self):
+        self.assertEqual(write_snapshot(self.path, []), 0)
+        count, read_pairs = read_snapshot(self.path)
+
+        self.assertEqual(count, 0)
+        self.assertEqual(list(read_pairs), [])
+
+    def test_write_not_sorted_or_not_normalized_pairs(self):
+        for pairs in ([(1, 3), (1, 2)], [(2, 3), (1, 4)], [(3, 2)], [(1, 1)]):
+            with self.assertRaises(SnapshotError):
+                write_snapshot(self.path, pairs)
+
+    def test_read_invalid_snapshot(self):
+        with open(self.path, "wb") as file:
+            file.write(b"first_friend,second_friend\n1,2\n")
+
+        with self.assertRaisesMessage(SnapshotError, "isn't friendship snapshot"):
+            read_snapshot(self.path)
+
+        write_snapshot(self.path, [(1, 2), (3, 4)])
+        with open(self.path, "r+b") as file:
+            file.truncate(HEADER.size + 2)
+
+        with self.assertRaisesMessage(SnapshotError, "is truncated"):
+            list(read_snapshot(self.path)[1])
+
+
+class ExportImportGraphTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "friendships.bin")
+        Friendship.objects.bulk_add_friendships(
+            [(1, c) for c in range(2, 30)] + [(40, 2**40), (30, 31)]
+        )
+
+    def test_export_and_import_graph(self):
+        out = StringIO()
+        call_command("export_graph", self.path, chunk_size=7, stdout=out)
+
+        self.assertIn("exported 30 friendships", out.getvalue())
+
+        expected = list(
+            Friendship.objects.order_by("first_friend", "second_friend").values_list(
+                "first_friend", "second_friend"
+            )
+        )
+        Friendship.objects.filter(first_friend=1, second_friend__gt=10).delete()
+        call_command(
+            "import_graph", self.path, chunk_size=7, stdout=out, stderr=StringIO()
+        )
+
+        self.assertIn("imported 30 friendships", out.getvalue())
+        self.assertIn("19 created", out.getvalue())
+        self.assertEqual(
+            list(
+                Friendship.objects.order_by(
+                    "first_friend", "second_friend"
+                ).values_list("first_friend", "second_friend")
+            ),
+            expected,
+        )
+
+    @override_settings(FRIENDSHIP_GRAPH_INDEX_ENABLED=True)
+    def test_import_warns_about_caches_of_servers(self):
+        call_command("export_graph", self.path, stdout=StringIO())
+        friends_cache.get_or_set(1, lambda: [])
+        err = StringIO()
+
+        call_command("import_graph", self.path, stdout=StringIO(), stderr=err)
+
+        self.assertIn("friends cache is per process", err.getvalue())
+        self.assertIn("graph index of running servers", err.getvalue())
+        self.assertEqual(friends_cache.get_or_set(1, lambda: None), [])
+
+        with mock.patch.object(FriendsCache, "shared", new=True):
+            call_command("import_graph", self.path, stdout=StringIO(), stderr=err)
+
+        self.assertIsNone(friends_cache.get_or_set(1, lambda: None))
+
+    def test_import_invalid_file(self):
+        with self.assertRaises(CommandError):
+            call_command("import_graph", self.path, stdout=StringIO())
+
+    def test_copy_friendships(self):
+        self.assertEqual(Friendship.objects.copy_friendships([(1, 2), (2, 3)]), 1)
+        self.assertEqual(Friendship.objects.copy_friendships([(2, 3), (3, 4)]), 1)
+        self.assertEqual(Friendship.objects.copy_friendships([]), 0)
+        self.assertEqual(Friendship.objects.count(), 32)
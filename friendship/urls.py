@@ -1,15 +1,61 @@
 from django.urls import path
 
-from .views import FindFriendsView, FriendshipCreateView, FriendshipDeleteView
+from .views import (
+    FindFriendsView,
+    FriendsCountView,
+    FriendsExportView,
+    FriendshipBulkView,
+    FriendshipCheckView,
+    FriendshipCreateView,
+    FriendshipDeleteView,
+    FriendshipPathView,
+    FriendshipRemoveAllView,
+    FriendsLookupView,
+    FriendSuggestionsView,
+    MutualFriendsView,
+)
 
 app_name = "friendship"
 
 urlpatterns = [
     path("friendship", FriendshipCreateView.as_view(), name="friendship_create"),
+    path("friendship/bulk", FriendshipBulkView.as_view(), name="friendship_bulk"),
+    path("friendship/check", FriendshipCheckView.as_view(), name="friendship_check"),
+    path("friendship/lookup", FriendsLookupView.as_view(), name="friends_lookup"),
     path(
         "friendship/<int:uid1>/<int:uid2>",
         FriendshipDeleteView.as_view(),
         name="friendship_delete",
     ),
+    path(
+        "friendship/<int:uid1>/<int:uid2>/mutual",
+        MutualFriendsView.as_view(),
+        name="mutual_friends",
+    ),
+    path(
+        "friendship/<int:uid1>/<int:uid2>/path",
+        FriendshipPathView.as_view(),
+        name="friendship_path",
+    ),
     path("friendship/<int:uid>", FindFriendsView.as_view(), name="find_friends"),
+    path(
+        "friendship/<int:uid>/count",
+        FriendsCountView.as_view(),
+        name="friends_count",
+    ),
+    path(
+        "friendship/<int:uid>/export",
+        FriendsExportView.as_view(),
+        name="friends_export",
+    ),
+    path(
+        "friendship/<int:uid>/suggestions",
+        FriendSuggestionsView.as_view(),
+        name="friend_suggestions",
+    ),
+    path(
+        "friendship/<int:uid>/all",
+        FriendshipRemoveAllView.as_view(),
+        name="friendship_remove_all",
+    ),
 ]
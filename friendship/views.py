@@ -1,10 +1,23 @@
-from django.db.utils import IntegrityError
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
 from .models import Friendship
-from .serializers import FriendshipSerializer, UserSerializer
+from .serializers import (
+    FriendshipBulkSerializer,
+    FriendshipSerializer,
+    FriendsLookupSerializer,
+    FriendsPageSerializer,
+    LimitSerializer,
+    PathSerializer,
+    UserSerializer,
+)
 
 
 class FriendshipCreateView(APIView):
@@ -16,21 +29,108 @@ class FriendshipCreateView(APIView):
         serializer = FriendshipSerializer(data=request.data)
 
         if serializer.is_valid():
+            # existing friendship isn't an error, relation is the same as requested
+            Friendship.objects.add_friendship(
+                serializer.validated_data["first_friend"],
+                serializer.validated_data["second_friend"],
+            )
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FriendshipBulkView(APIView):
+    """
+    creates or removes many friendship relations with one database statement
+    """
+
+    def post(self, request, format=None):
+        serializer = FriendshipBulkSerializer(data=request.data)
+
+        if serializer.is_valid():
+            pairs = serializer.validate_pairs()
+            created = Friendship.objects.bulk_add_friendships(
+                (data["first_friend"], data["second_friend"])
+                for data, errors in pairs
+                if not errors
+            )
+
+            # every pair gets its own status, results are in the same order as in request
+            results = []
+            for data, errors in pairs:
+                if errors:
+                    results.append({"status": "invalid", "errors": errors})
+                    continue
 
-            # try to save relation
-            try:
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-
-            except IntegrityError as cm_error:
-                """
-                Check if friendship already exists, if exists, django will return integrity error,
-                but integrity error doesn't have any additional data so I check if 'Unique Friendship' is in error message
-                This isn't great solution. It is possible to check if object already exists in validation,
-                but database also have to check uniques before writing, so integrity error still can show up.
-                """
-                if "Unique Friendship" in str(cm_error):
-                    return Response(serializer.data, status=status.HTTP_201_CREATED)
+                pair = (data["first_friend"], data["second_friend"])
+                if pair in created:
+                    # pair repeated in request is created only once
+                    created.discard(pair)
+                    results.append({**data, "status": "created"})
+                else:
+                    results.append({**data, "status": "existing"})
+
+            return Response({"results": results}, status=status.HTTP_200_OK)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def delete(self, request, format=None):
+        serializer = FriendshipBulkSerializer(data=request.data)
+
+        if serializer.is_valid():
+            pairs = serializer.validate_pairs()
+            removed = Friendship.objects.bulk_remove_friendships(
+                (data["first_friend"], data["second_friend"])
+                for data, errors in pairs
+                if not errors
+            )
+
+            results = []
+            for data, errors in pairs:
+                if errors:
+                    results.append({"status": "invalid", "errors": errors})
+                    continue
+
+                pair = (data["first_friend"], data["second_friend"])
+                if pair in removed:
+                    # pair repeated in request is removed only once
+                    removed.discard(pair)
+                    results.append({**data, "status": "removed"})
+                else:
+                    results.append({**data, "status": "missing"})
+
+            return Response({"results": results}, status=status.HTTP_200_OK)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FriendshipCheckView(APIView):
+    """
+    checks if many pairs of UIDs are friends with one database query
+    """
+
+    def post(self, request, format=None):
+        serializer = FriendshipBulkSerializer(data=request.data)
+
+        if serializer.is_valid():
+            pairs = serializer.validate_pairs()
+            existing = Friendship.objects.existing_friendships(
+                (data["first_friend"], data["second_friend"])
+                for data, errors in pairs
+                if not errors
+            )
+
+            # results are in the same order as in request
+            results = []
+            for data, errors in pairs:
+                if errors:
+                    results.append({"errors": errors})
+                    continue
+
+                pair = (data["first_friend"], data["second_friend"])
+                results.append({**data, "friends": pair in existing})
+
+            return Response({"results": results}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -49,28 +149,38 @@ class FriendshipDeleteView(APIView):
         # check if data (UIDs) are valid
         if serializer.is_valid():
 
-            # find object in DB
-            try:
-                friendship = Friendship.objects.get(
-                    first_friend=serializer.data["first_friend"],
-                    second_friend=serializer.data["second_friend"],
-                )
+            # one DELETE on primary, no existence check which could read a lagging replica
+            removed = Friendship.objects.bulk_remove_friendships(
+                [
+                    (
+                        serializer.validated_data["first_friend"],
+                        serializer.validated_data["second_friend"],
+                    )
+                ]
+            )
+            # if friendship doesn't exist, return OK, do nothing
+            return Response(
+                status=status.HTTP_204_NO_CONTENT if removed else status.HTTP_200_OK
+            )
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-            except Friendship.DoesNotExist:
-                # if object not exists, return OK, do nothing
-                return Response(status=status.HTTP_200_OK)
 
-            except Friendship.MultipleObjectsReturned:
-                # if multiple objects exist, remove all (not should happened)
-                Friendship.objects.filter(
-                    first_friend=serializer.data["first_friend"],
-                    second_friend=serializer.data["second_friend"],
-                ).delete()
+class FriendshipRemoveAllView(APIView):
+    """Remove all friendships of given UID"""
 
+    def delete(self, request, uid, format=None):
+        serializer = UserSerializer(data={"uid": uid})
+
+        # check if data (UIDs) are valid
+        if serializer.is_valid():
+            friends = Friendship.objects.remove_all_friendships(uid)
+
+            if friends:
                 return Response(status=status.HTTP_204_NO_CONTENT)
 
-            friendship.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
+            # if user has no friends, return OK, do nothing
+            return Response(status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -83,8 +193,208 @@ class FindFriendsView(APIView):
 
         # check if data (UIDs) are valid
         if serializer.is_valid():
-            friends = Friendship.objects.find_friends(uid)
+            # with after or limit parameter friends are paginated
+            if "after" in request.query_params or "limit" in request.query_params:
+                return self.get_page(request, uid)
+
+            friends = Friendship.objects.get_friends_list(uid)
+
+            return Response({"friends": friends}, status=status.HTTP_200_OK)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def get_page(self, request, uid):
+        """
+        returns page of friends ordered by UID
+        """
+        serializer = FriendsPageSerializer(data=request.query_params)
+
+        if serializer.is_valid():
+            limit = serializer.validated_data["limit"]
+            friends = list(
+                Friendship.objects.find_friends_page(
+                    uid, serializer.validated_data["after"], limit
+                )
+            )
+
+            return page_response(request, friends, limit)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FriendsLookupView(APIView):
+    """Find friends of many UIDs with one database query"""
+
+    def post(self, request, format=None):
+        serializer = FriendsLookupSerializer(data=request.data)
+
+        if serializer.is_valid():
+            friends = Friendship.objects.find_friends_of_many(
+                serializer.validated_data["uids"], serializer.validated_data["limit"]
+            )
+
+            return Response({"friends": friends}, status=status.HTTP_200_OK)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class MutualFriendsView(APIView):
+    """Find common friends of two UIDs"""
+
+    def get(self, request, uid1, uid2, format=None):
+        data = {"first_friend": uid1, "second_friend": uid2}
+        serializer = FriendshipSerializer(data=data)
+
+        # check if data (UIDs) are valid
+        if serializer.is_valid():
+            page_serializer = FriendsPageSerializer(data=request.query_params)
+
+            if page_serializer.is_valid():
+                limit = page_serializer.validated_data["limit"]
+                friends = Friendship.objects.find_mutual_friends(
+                    uid1, uid2, page_serializer.validated_data["after"], limit
+                )
+
+                return page_response(request, friends, limit)
+
+            return Response(page_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FriendshipPathView(APIView):
+    """Find the shortest path of friendships between two UIDs"""
+
+    def get(self, request, uid1, uid2, format=None):
+        data = {"first_friend": uid1, "second_friend": uid2}
+        serializer = FriendshipSerializer(data=data)
+
+        # check if data (UIDs) are valid
+        if serializer.is_valid():
+            path_serializer = PathSerializer(data=request.query_params)
+
+            if path_serializer.is_valid():
+                path, complete = Friendship.objects.find_path(
+                    uid1,
+                    uid2,
+                    path_serializer.validated_data["max_depth"],
+                    settings.FRIENDSHIP_PATH_MAX_FRONTIER,
+                    settings.FRIENDSHIP_PATH_TIMEOUT,
+                )
+
+                # complete is False when search was stopped by limits, path may exist
+                return Response(
+                    {
+                        "path": path,
+                        "degrees": len(path) - 1 if path else None,
+                        "complete": complete,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+
+            return Response(path_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FriendSuggestionsView(APIView):
+    """Suggest friends of friends for given UID, ranked by number of mutual friends"""
+
+    def get(self, request, uid, format=None):
+        serializer = UserSerializer(data={"uid": uid})
+
+        # check if data (UIDs) are valid
+        if serializer.is_valid():
+            limit_serializer = LimitSerializer(data=request.query_params)
+
+            if limit_serializer.is_valid():
+                suggestions = Friendship.objects.suggest_friends(
+                    uid,
+                    limit_serializer.validated_data["limit"],
+                    settings.FRIENDSHIP_SUGGESTIONS_DEGREE_CAP,
+                )
 
-            return Response({"friends": list(friends)}, status=status.HTTP_200_OK)
+                return Response(
+                    {
+                        "suggestions": [
+                            {"uid": friend, "mutual_friends": mutual_friends}
+                            for friend, mutual_friends in suggestions
+                        ]
+                    },
+                    status=status.HTTP_200_OK,
+                )
+
+            return Response(limit_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+def page_response(request, friends, limit):
+    """
+    returns page of friends ordered by UID, next page starts after the last UID of this page
+    """
+    return Response(
+        {"friends": friends, "next": next_page_url(request, friends, limit)},
+        status=status.HTTP_200_OK,
+    )
+
+
+def next_page_url(request, friends, limit):
+    """
+    returns URL of the next page or None if this page is the last one
+    """
+    if len(friends) < limit:
+        return None
+    return replace_query_param(request.build_absolute_uri(), "after", friends[-1])
+
+
+class FriendsCountView(APIView):
+    """Count friends of given UID"""
+
+    def get(self, request, uid, format=None):
+        serializer = UserSerializer(data={"uid": uid})
+
+        # check if data (UIDs) are valid
+        if serializer.is_valid():
+            count = Friendship.objects.count_friends(uid)
+
+            return Response({"count": count}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FriendsExportView(APIView):
+    """Export all friends of given UID as streamed JSON"""
+
+    def get(self, request, uid, format=None):
+        serializer = UserSerializer(data={"uid": uid})
+
+        # check if data (UIDs) are valid
+        if serializer.is_valid():
+            # server-side cursor, rows are fetched from database in chunks while response is sent,
+            # database is chosen now, response is consumed after replica_pinning_middleware
+            friends = Friendship.objects.friends_rows(
+                uid, settings.FRIENDSHIP_EXPORT_CHUNK_SIZE
+            )
+            return StreamingHttpResponse(
+                stream_friends(friends, settings.FRIENDSHIP_EXPORT_CHUNK_SIZE),
+                content_type="application/json",
+            )
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+def stream_friends(friends, chunk_size):
+    """
+    yields {"friends": [...]} JSON in parts, one part for every chunk_size of friends,
+    so memory doesn't depend on number of friends
+    """
+    yield '{"friends": ['
+    separator = ""
+    while True:
+        chunk = list(islice(friends, chunk_size))
+        if not chunk:
+            break
+        yield separator + json.dumps(chunk)[1:-1]
+        separator = ", "
+    yield "]}"
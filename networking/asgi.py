@@ -0,0 +1,27 @@
+"""
+ASGI config for networking project.
+It exposes the ASGI callable as a module-level variable named ``application``.
+Friendship endpoints are served by async views (FRIENDSHIP_ASYNC_VIEWS) by default.
+For more information on this file, see
+https://docs.djangoproject.com/en/3.1/howto/deployment/asgi/
+"""
+
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "networking.config")
+os.environ.setdefault("DJANGO_CONFIGURATION", "Production")
+os.environ.setdefault("FRIENDSHIP_ASYNC_VIEWS", "yes")
+
+import configurations  # noqa
+
+configurations.setup()
+
+from django.core.asgi import get_asgi_application  # noqa
+
+application = get_asgi_application()
+
+# graph index is built in background, so the first requests don't wait for it
+from friendship.graph import graph_index  # noqa
+from friendship.models import Friendship  # noqa
+
+graph_index.warm(Friendship.objects.build_graph_index)
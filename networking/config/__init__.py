@@ -1,2 +1,3 @@
+from .api import Api  # noqa
 from .local import Local  # noqa
 from .production import Production  # noqa
@@ -0,0 +1,37 @@
+import os
+
+from .common import Common
+from .production import Production
+
+
+class Api(Common):
+    """
+    API-only deployment, friendship API is stateless JSON, so sessions, CSRF, messages,
+    clickjacking protection, auth, static files and Swagger / redoc aren't loaded
+    """
+
+    INSTALLED_APPS = ("friendship",)
+    MIDDLEWARE = (
+        "django.middleware.security.SecurityMiddleware",
+        "django.middleware.common.CommonMiddleware",
+    )
+    if Common.FRIENDSHIP_REPLICAS:
+        MIDDLEWARE += ("friendship.middleware.replica_pinning_middleware",)
+    SECRET_KEY = os.getenv("DJANGO_SECRET_KEY")
+    ALLOWED_HOSTS = ["*"]
+    # databases of Production (PgBouncer)
+    POSTGRES_PGBOUNCER = Production.POSTGRES_PGBOUNCER
+    DATABASES = Production.DATABASES
+    # no HTML is rendered
+    TEMPLATES = []
+    AUTH_PASSWORD_VALIDATORS = []
+    SWAGGER_ENABLED = False
+
+    # requests aren't authenticated, request.user is None (django.contrib.auth isn't installed)
+    REST_FRAMEWORK = {
+        **Common.REST_FRAMEWORK,
+        "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+        "DEFAULT_AUTHENTICATION_CLASSES": [],
+        "DEFAULT_PERMISSION_CLASSES": [],
+        "UNAUTHENTICATED_USER": None,
+    }
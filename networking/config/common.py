@@ -48,6 +48,62 @@ class Common(Configuration):
             conn_max_age=int(os.getenv("POSTGRES_CONN_MAX_AGE", 600)),
         )
     }
+    # read replicas, comma separated DATABASE_REPLICA_URLS are databases "replica1", "replica2", ...,
+    # friendship.routers.ReplicaRouter reads friendships from them round-robin, writes go to default,
+    # a client reads from default for FRIENDSHIP_REPLICA_PIN_SECONDS after its write
+    DATABASES.update(
+        (
+            f"replica{number}",
+            {
+                **dj_database_url.parse(
+                    url, conn_max_age=int(os.getenv("POSTGRES_CONN_MAX_AGE", 600))
+                ),
+                "TEST": {"MIRROR": "default"},
+            },
+        )
+        for number, url in enumerate(
+            filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(",")), 1
+        )
+    )
+    FRIENDSHIP_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+    FRIENDSHIP_REPLICA_PIN_SECONDS = int(
+        os.getenv("FRIENDSHIP_REPLICA_PIN_SECONDS", 10)
+    )
+    DATABASE_ROUTERS = ["friendship.routers.ReplicaRouter"]
+    if FRIENDSHIP_REPLICAS:
+        MIDDLEWARE += ("friendship.middleware.replica_pinning_middleware",)
+    # PgBouncer transaction pooling of Production (POSTGRES_PGBOUNCER)
+    POSTGRES_PGBOUNCER = False
+    # PgBouncer admin console database, SHOW POOLS of connection_stats command
+    POSTGRES_PGBOUNCER_ADMIN_DB = os.getenv("POSTGRES_PGBOUNCER_ADMIN_DB", "pgbouncer")
+
+    # Cache
+    # friends lists are cached in "friendship" cache, locmem by default (per process, writes invalidate
+    # only the cache of the worker which made them), set FRIENDSHIP_CACHE_BACKEND and
+    # FRIENDSHIP_CACHE_LOCATION to share it with redis / memcached when there are more workers
+    FRIENDSHIP_CACHE_ALIAS = "friendship"
+    FRIENDSHIP_CACHE_BACKEND = os.getenv(
+        "FRIENDSHIP_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+    )
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        FRIENDSHIP_CACHE_ALIAS: {
+            "BACKEND": FRIENDSHIP_CACHE_BACKEND,
+            "LOCATION": os.getenv("FRIENDSHIP_CACHE_LOCATION", "friendship"),
+            # TTL in seconds
+            "TIMEOUT": int(os.getenv("FRIENDSHIP_CACHE_TIMEOUT", 300)),
+            "KEY_PREFIX": "friendship",
+        },
+    }
+    # eviction of locmem cache, when MAX_ENTRIES is reached, 1 / CULL_FREQUENCY of the least recently
+    # used entries is removed, redis and memcached evict keys according to their own server settings
+    if FRIENDSHIP_CACHE_BACKEND == "django.core.cache.backends.locmem.LocMemCache":
+        CACHES[FRIENDSHIP_CACHE_ALIAS]["OPTIONS"] = {
+            "MAX_ENTRIES": int(os.getenv("FRIENDSHIP_CACHE_MAX_ENTRIES", 10000)),
+            "CULL_FREQUENCY": int(os.getenv("FRIENDSHIP_CACHE_CULL_FREQUENCY", 3)),
+        }
 
     # General
     APPEND_SLASH = False
@@ -165,6 +221,15 @@ class Common(Configuration):
         },
     }
 
+    # Swagger and redoc of the API (networking/urls.py)
+    SWAGGER_ENABLED = strtobool(os.getenv("DJANGO_SWAGGER_ENABLED", "yes"))
+    # Swagger UI and redoc load cached document, not the page itself with ?format=openapi,
+    # API has no authentication, page without login form (and CSRF token) can be cached
+    SWAGGER_SETTINGS = {"SPEC_URL": "/swagger.json", "USE_SESSION_AUTH": False}
+    REDOC_SETTINGS = {"SPEC_URL": "/swagger.json"}
+    # /healthz checks database connection with SELECT 1
+    HEALTHZ_DATABASE = strtobool(os.getenv("DJANGO_HEALTHZ_DATABASE", "yes"))
+
     # Django Rest Framework
     REST_FRAMEWORK = {
         "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -178,3 +243,44 @@ class Common(Configuration):
             "rest_framework.parsers.JSONParser",
         ],
     }
+
+    # Friendship
+    # max number of pairs in one bulk request
+    FRIENDSHIP_BULK_MAX_SIZE = int(os.getenv("FRIENDSHIP_BULK_MAX_SIZE", 10000))
+    # max number of UIDs in one lookup of friends lists
+    FRIENDSHIP_LOOKUP_MAX_SIZE = int(os.getenv("FRIENDSHIP_LOOKUP_MAX_SIZE", 500))
+    # max limit of one page of friends list, default limit is PAGE_SIZE
+    FRIENDSHIP_PAGE_MAX_SIZE = int(os.getenv("FRIENDSHIP_PAGE_MAX_SIZE", 1000))
+    # number of friends fetched from database and written to response at once by export
+    FRIENDSHIP_EXPORT_CHUNK_SIZE = int(os.getenv("FRIENDSHIP_EXPORT_CHUNK_SIZE", 2000))
+    # friend suggestions expand at most this number of friends of the user
+    # and read at most this number of friends of every expanded friend
+    FRIENDSHIP_SUGGESTIONS_DEGREE_CAP = int(
+        os.getenv("FRIENDSHIP_SUGGESTIONS_DEGREE_CAP", 1000)
+    )
+    # path search between two users, max (and default) number of friendships in path,
+    # max number of friends found in one step of search and max time of search in seconds
+    FRIENDSHIP_PATH_MAX_DEPTH = int(os.getenv("FRIENDSHIP_PATH_MAX_DEPTH", 6))
+    FRIENDSHIP_PATH_MAX_FRONTIER = int(
+        os.getenv("FRIENDSHIP_PATH_MAX_FRONTIER", 100000)
+    )
+    FRIENDSHIP_PATH_TIMEOUT = float(os.getenv("FRIENDSHIP_PATH_TIMEOUT", 2))
+    # in-process adjacency index of all friendships (friendship/graph.py), when it's enabled
+    # read paths use it instead of database, it's built on first use and rebuilt in background
+    # every FRIENDSHIP_GRAPH_INDEX_TTL seconds, index is read from database in chunks of
+    # FRIENDSHIP_GRAPH_INDEX_CHUNK_SIZE rows
+    FRIENDSHIP_GRAPH_INDEX_ENABLED = strtobool(
+        os.getenv("FRIENDSHIP_GRAPH_INDEX_ENABLED", "no")
+    )
+    FRIENDSHIP_GRAPH_INDEX_TTL = int(os.getenv("FRIENDSHIP_GRAPH_INDEX_TTL", 600))
+    FRIENDSHIP_GRAPH_INDEX_CHUNK_SIZE = int(
+        os.getenv("FRIENDSHIP_GRAPH_INDEX_CHUNK_SIZE", 100000)
+    )
+    # find, create and delete of friendships are served by plain Django views
+    # (friendship/fast_views.py) instead of DRF views, responses are the same
+    FRIENDSHIP_FAST_VIEWS = strtobool(os.getenv("FRIENDSHIP_FAST_VIEWS", "no"))
+    # ASGI deployment (networking/asgi.py) serves find, create and delete of friendships
+    # with async views (friendship/async_views.py), their database work runs in pool of
+    # FRIENDSHIP_ASYNC_DB_THREADS threads per process, every thread keeps its own connection
+    FRIENDSHIP_ASYNC_VIEWS = strtobool(os.getenv("FRIENDSHIP_ASYNC_VIEWS", "no"))
+    FRIENDSHIP_ASYNC_DB_THREADS = int(os.getenv("FRIENDSHIP_ASYNC_DB_THREADS", 10))
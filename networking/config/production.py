@@ -1,4 +1,5 @@
 import os
+from distutils.util import strtobool
 
 from .common import Common
 
@@ -11,6 +12,17 @@ class Production(Common):
     ALLOWED_HOSTS = ["*"]
     INSTALLED_APPS += ("gunicorn",)
 
+    # Postgres
+    # DATABASE_URL points to PgBouncer in transaction pooling mode, workers share its small pool
+    # of server connections, a server connection belongs to a client only during transaction,
+    # so server-side cursors are used only in transactions (FriendshipManager._stream_rows)
+    POSTGRES_PGBOUNCER = strtobool(os.getenv("POSTGRES_PGBOUNCER", "no"))
+    if POSTGRES_PGBOUNCER:
+        DATABASES = {
+            alias: {**database, "DISABLE_SERVER_SIDE_CURSORS": True}
+            for alias, database in Common.DATABASES.items()
+        }
+
     # Static files (CSS, JavaScript, Images)
     # https://docs.djangoproject.com/en/2.0/howto/static-files/
     # http://django-storages.readthedocs.org/en/latest/index.html
@@ -0,0 +1,17 @@
+"""
+gunicorn settings of ASGI deployment, every worker process runs uvicorn event loop
+
+    gunicorn -c python:networking.gunicorn_asgi networking.asgi:application
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# one worker per CPU is enough, concurrency comes from event loop, not from processes,
+# every worker opens up to FRIENDSHIP_ASYNC_DB_THREADS database connections
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+# pending connections which aren't accepted yet
+backlog = int(os.getenv("GUNICORN_BACKLOG", 2048))
+keepalive = 5
+accesslog = "-"
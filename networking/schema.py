@@ -0,0 +1,78 @@
+"""
+OpenAPI document of the API is generated once per process on first use and then served
+as a cached blob with ETag, Swagger UI and redoc pages are rendered from the same schema,
+so requests don't walk all views to regenerate it
+"""
+
+import hashlib
+from functools import lru_cache
+
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+from rest_framework.response import Response
+
+VALIDATORS = ["ssv"]
+# Swagger UI and redoc pages are cached (cache_page with default cache) for this number of seconds,
+# they load the document from /swagger.json (SWAGGER_SETTINGS and REDOC_SETTINGS)
+PAGE_CACHE_TIMEOUT = 24 * 60 * 60
+CODECS = {
+    "json": (OpenAPICodecJson, "application/json"),
+    "yaml": (OpenAPICodecYaml, "application/yaml"),
+}
+
+info = openapi.Info(
+    title="Friendship API",
+    default_version="v0.1",
+    description="API for manage friendship",
+)
+
+schema_view = get_schema_view(
+    info,
+    public=True,
+    permission_classes=(permissions.AllowAny,),
+    validators=VALIDATORS,
+)
+
+
+@lru_cache(maxsize=None)
+def schema():
+    """
+    returns OpenAPI schema of all views, schema is generated without request, so it's the same
+    for all requests (host and scheme are left out, clients use the ones of the document)
+    """
+    return schema_view.generator_class(info).get_schema(request=None, public=True)
+
+
+@lru_cache(maxsize=None)
+def document(format):
+    """
+    returns (encoded schema, ETag) for format "json" or "yaml"
+    """
+    codec_class, _ = CODECS[format]
+    content = codec_class(VALIDATORS).encode(schema())
+    return content, f'"{hashlib.sha1(content).hexdigest()}"'
+
+
+class CachedSchemaView(schema_view):
+    """
+    drf_yasg schema view (Swagger UI and redoc pages) with schema generated once
+    """
+
+    def get(self, request, version="", format=None):
+        return Response(schema())
+
+
+@require_safe
+@cache_control(public=True, no_cache=True)
+@condition(etag_func=lambda request, format: document(format[1:])[1])
+def schema_document(request, format):
+    """
+    serves swagger.json and swagger.yaml, browsers and proxies revalidate it with ETag
+    """
+    content, _ = document(format[1:])
+    return HttpResponse(content, content_type=CODECS[format[1:]][1])
@@ -2,41 +2,44 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic.base import RedirectView
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
 
-...
+from .views import healthz
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Friendship API",
-        default_version="v0.1",
-        description="API for manage friendship",
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-    validators=["ssv"],
-)
+...
 
+# views of find, create and delete of friendships
+if settings.FRIENDSHIP_ASYNC_VIEWS:
+    friendship_urls = "friendship.async_urls"
+elif settings.FRIENDSHIP_FAST_VIEWS:
+    friendship_urls = "friendship.fast_urls"
+else:
+    friendship_urls = "friendship.urls"
 
 urlpatterns = [
-    # the 'api-root' from django rest-frameworks default router
-    # http://www.django-rest-framework.org/api-guide/routers/#defaultrouter
-    path("", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
-    path("api/", include("friendship.urls", namespace="friendship")),
-    re_path(r"^$", RedirectView.as_view(url=reverse_lazy("api-root"), permanent=False)),
-    re_path(
-        r"^swagger(?P<format>\.json|\.yaml)$",
-        schema_view.without_ui(cache_timeout=0),
-        name="schema-json",
-    ),
-    re_path(
-        r"^swagger/$",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
-    re_path(
-        r"^redoc/$", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"
-    ),
+    path("api/", include(friendship_urls, namespace="friendship")),
+    path("healthz", healthz, name="healthz"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if settings.SWAGGER_ENABLED:
+    # drf_yasg is imported only when documentation is served
+    from .schema import PAGE_CACHE_TIMEOUT, CachedSchemaView, schema_document
+
+    swagger_ui = CachedSchemaView.with_ui("swagger", cache_timeout=PAGE_CACHE_TIMEOUT)
+
+    urlpatterns += [
+        # the 'api-root' from django rest-frameworks default router
+        # http://www.django-rest-framework.org/api-guide/routers/#defaultrouter
+        path("", swagger_ui, name="schema-swagger-ui"),
+        re_path(
+            r"^$", RedirectView.as_view(url=reverse_lazy("api-root"), permanent=False)
+        ),
+        re_path(
+            r"^swagger(?P<format>\.json|\.yaml)$", schema_document, name="schema-json"
+        ),
+        re_path(r"^swagger/$", swagger_ui, name="schema-swagger-ui"),
+        re_path(
+            r"^redoc/$",
+            CachedSchemaView.with_ui("redoc", cache_timeout=PAGE_CACHE_TIMEOUT),
+            name="schema-redoc",
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+from friendship.cache import friends_cache
+
+
+@require_safe
+@never_cache
+def healthz(request):
+    """
+    health check for load balancers, it doesn't touch anything but optional SELECT 1 (HEALTHZ_DATABASE),
+    it reports hit and miss counters of friends cache of the process which served it
+    """
+    if settings.HEALTHZ_DATABASE:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError:
+            return JsonResponse({"status": "database unavailable"}, status=503)
+    return JsonResponse({"status": "ok", "friends_cache": friends_cache.stats()})
@@ -12,3 +12,9 @@ os.environ.setdefault("DJANGO_CONFIGURATION", "Production")
 from configurations.wsgi import get_wsgi_application  # noqa
 
 application = get_wsgi_application()
+
+# graph index is built in background, so the first requests don't wait for it
+from friendship.graph import graph_index  # noqa
+from friendship.models import Friendship  # noqa
+
+graph_index.warm(Friendship.objects.build_graph_index)